@@ -6,13 +6,22 @@ from app.config import config
 from flask_migrate import Migrate
 from flask_marshmallow import Marshmallow
 from flask_caching import Cache
-from redis import Redis
+from redis import ConnectionPool, Redis
+from app.caching import EntityCache, IndicePrefijos
+from app.replicas import ReplicaRouter, RoutingSession
+from app.metrics import Registro, instrumentar_pool
+from app.clients import EspecialidadClient
 import pickle 
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 migrate = Migrate()
 ma = Marshmallow()
 cache = Cache()
+entity_cache = EntityCache()
+autocompletado = IndicePrefijos()
+replicas = ReplicaRouter()
+metricas = Registro()
+especialidad_client = EspecialidadClient()
 
 redis_client = None 
 
@@ -26,27 +35,57 @@ def create_app() -> Flask:
     app = Flask(__name__)
     f = config.factory(app_context if app_context else 'development')
     app.config.from_object(f)
-  
+    # Réplicas de lectura: un bind por URI (replica_0, replica_1, ...)
+    app.config["SQLALCHEMY_BINDS"] = {
+        **app.config.get("SQLALCHEMY_BINDS", {}),
+        **{f"replica_{i}": uri for i, uri in enumerate(app.config.get("READ_REPLICA_URIS", ()))},
+    }
 
-    
     db.init_app(app)
+    with app.app_context():
+        for bind, engine in db.engines.items():
+            instrumentar_pool(engine, bind or "primario", metricas)
     migrate.init_app(app, db)
     ma.init_app(app)
-    cache.init_app(app)
     global redis_client
-    redis_client = Redis(
+    redis_client = Redis(connection_pool=ConnectionPool(
             host=app.config['CACHE_REDIS_HOST'],
             port=app.config['CACHE_REDIS_PORT'],
             db=app.config['CACHE_REDIS_DB'],
             password=app.config['CACHE_REDIS_PASSWORD'],
-            decode_responses=False  
-        )
-    from app.resources import home, universidad_bp, facultad_bp, especialidad_bp
+            max_connections=app.config['REDIS_MAX_CONNECTIONS'],
+            socket_connect_timeout=app.config['REDIS_CONNECT_TIMEOUT'],
+            socket_timeout=app.config['REDIS_SOCKET_TIMEOUT'],
+            health_check_interval=app.config['REDIS_HEALTH_CHECK_INTERVAL'],
+            decode_responses=False
+        ))
+    # Flask-Caching usa el mismo cliente (y pool) en lugar de abrir el suyo.
+    cache.init_app(app, config={"CACHE_REDIS_HOST": redis_client})
+    entity_cache.init_app(app, db, redis_client)
+    if entity_cache.breaker is not None:
+        metricas.gauge("redis_circuit_open", "1 si el circuit breaker de Redis está abierto (cache salteado)",
+                       agregacion="livemax") \
+            .callback(lambda: float(entity_cache.breaker.abierto))
+        aperturas = metricas.contador("redis_circuit_openings_total", "Veces que se abrió el circuit breaker de Redis")
+        entity_cache.breaker.al_abrir.append(aperturas.inc)
+        metricas.gauge("redis_pending_invalidations", "Invalidaciones a reaplicar cuando Redis vuelva") \
+            .callback(lambda: float(entity_cache.backend.pendientes()))
+    from app.utils import retry as reintentos
+    reintentos.init_app(app, metricas)
+    especialidad_client.init_app(app, metricas)
+    metricas.init_app(app)
+    autocompletado.init_app(entity_cache.bus, app.config.get("AUTOCOMPLETE_ENTIDADES", ()))
+    replicas.init_app(app, db, entity_cache.bus)
+    entity_cache.lectura_confiable = replicas.lectura_confiable
+    from app.resources import home, universidad_bp, facultad_bp, especialidad_bp, busqueda_bp, autocompletado_bp, metricas_bp
     
     app.register_blueprint(home, url_prefix="/api/v1")
     app.register_blueprint(universidad_bp, url_prefix="/api/v1")
     app.register_blueprint(facultad_bp, url_prefix="/api/v1")
     app.register_blueprint(especialidad_bp, url_prefix="/api/v1")
+    app.register_blueprint(busqueda_bp, url_prefix="/api/v1")
+    app.register_blueprint(autocompletado_bp, url_prefix="/api/v1")
+    app.register_blueprint(metricas_bp, url_prefix="/api/v1")
 
 
     @app.shell_context_processor    
@@ -0,0 +1,321 @@
+"""
+Modo de servicio ASGI (opcional).
+
+Las lecturas más frecuentes de los tres blueprints (GET /<entidad>/<id> y
+el listado paginado con X-page, X-per-page, X-filters, X-count y fields)
+corren en el event loop con sesiones async de SQLAlchemy y redis.asyncio:
+mientras una request espera a Redis o a la base, el mismo proceso atiende
+otras, en lugar de bloquear un worker sync de gunicorn por request. El
+límite pasa a ser el pool de conexiones (SQLALCHEMY_ENGINE_OPTIONS y
+REDIS_MAX_CONNECTIONS), no la cantidad de workers.
+
+Las consultas, los modos de conteo, las claves del cache de entidades y de
+conteos y la elección de réplica salen de los mismos helpers que el camino
+sync (app/repositories/pagination.py, EntityCache, ReplicaRouter), así el
+JSON de estas lecturas es el mismo en los dos modos y lo que cachea uno lo
+lee el otro. Lo que el camino async no hace: el cache de vistas
+(cached_view), el single-flight ante un miss y el LRU local por worker.
+
+Todo lo demás (escrituras, expand=, ids=, X-cursor, parámetros inválidos,
+exportaciones, búsqueda...) lo atiende la app Flask de siempre a través de
+un adaptador WSGI.
+
+Uso:
+    pip install -e ".[asgi]"
+    uvicorn --factory app.asgi:crear_app_asgi --workers 4 --port 5000
+"""
+import asyncio
+import json
+import logging
+from typing import Dict, Optional
+from urllib.parse import parse_qs
+
+import redis.asyncio as aioredis
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Query
+from werkzeug.http import parse_cookie
+
+from app import create_app, entity_cache, replicas
+from app.caching import EntityCache
+from app.filters import compilar_filtros, FiltroInvalido
+from app.mapping import UniversidadMapping, FacultadMapping, EspecialidadMapping, campos_pedidos, esquema
+from app.models import Universidad, Facultad, Especialidad
+from app.replicas import CONSISTENCIA_HEADER, RYW_COOKIE
+from app.repositories.pagination import (CONTEO_EXACTO, CONTEO_ESTIMADO, CONTEO_NINGUNO, MODOS_CONTEO,
+                                         ESTIMACION_POSTGRESQL, consulta_conteo, consulta_pagina,
+                                         estimacion_aplicable, estimacion_util, filtrar, separar_total)
+from app.utils.pagination import total_paginas
+
+PREFIJO = "/api/v1/"
+DRIVERS_ASYNC = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+# entidad en la URL -> (modelo, schema, mensaje del 404)
+RECURSOS = {
+    "universidad": (Universidad, UniversidadMapping, "Universidad no encontrada"),
+    "facultad": (Facultad, FacultadMapping, "Facultad no encontrada"),
+    "especialidad": (Especialidad, EspecialidadMapping, "Especialidad no encontrada"),
+}
+
+# Lo que el modo async no implementa: esas requests van a la app WSGI.
+PARAMETROS_DELEGADOS = ("expand", "ids")
+HEADERS_DELEGADOS = ("x-cursor",)
+
+
+def url_async(uri: str) -> str:
+    """La URI de SQLALCHEMY_DATABASE_URI con el driver async equivalente (asyncpg, aiosqlite)."""
+    url = make_url(uri)
+    backend = url.get_backend_name()
+    if backend not in DRIVERS_ASYNC:
+        raise ValueError(f"No hay driver async configurado para {backend}")
+    return url.set(drivername=DRIVERS_ASYNC[backend]).render_as_string(hide_password=False)
+
+
+def opciones_engine(opciones: dict) -> dict:
+    # QueuePoolMedido es un pool sync: el engine async usa su AsyncAdaptedQueuePool.
+    return {clave: valor for clave, valor in opciones.items() if clave != "poolclass"}
+
+
+def _entero(valor: Optional[str], default: int) -> int:
+    # Igual que request.headers.get(..., type=int): un valor inválido es el default.
+    try:
+        return int(valor) if valor is not None else default
+    except ValueError:
+        return default
+
+
+class AppAsgi:
+    """Aplicación ASGI: lecturas async y, para el resto, la app Flask envuelta en `wsgi`."""
+
+    def __init__(self, flask_app, motor, redis=None, wsgi=None, motores_replica=None):
+        self.flask_app = flask_app
+        self.motor = motor
+        self.sesiones = async_sessionmaker(motor, expire_on_commit=False)
+        # bind de réplica (replica_<n>) -> engine async; la elige ReplicaRouter.replica_para
+        self.motores_replica = motores_replica or {}
+        self.sesiones_replica = {clave: async_sessionmaker(m, expire_on_commit=False)
+                                 for clave, m in self.motores_replica.items()}
+        self.redis = redis
+        # El mismo circuit breaker que el cache sync: Redis está caído para los dos.
+        self.breaker = entity_cache.breaker if redis is not None else None
+        self.wsgi = wsgi
+        self.estricto = flask_app.config.get("FILTERS_STRICT", False)
+        self.umbral_estimacion = flask_app.config.get("COUNT_ESTIMATE_THRESHOLD", 100_000)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        ruta = self._resolver(scope) if scope["type"] == "http" else None
+        if ruta is None:
+            await self.wsgi(scope, receive, send)
+            return
+        manejador, args = ruta
+        try:
+            status, cuerpo = await manejador(*args)
+        except Exception:
+            logging.exception(f"[ASGI] Error atendiendo {scope['path']}")
+            status, cuerpo = 500, {"error": "Error interno del servidor"}
+        await self._responder(send, status, cuerpo)
+
+    def _resolver(self, scope):
+        if scope["method"] != "GET" or not scope["path"].startswith(PREFIJO):
+            return None
+        partes = scope["path"][len(PREFIJO):].split("/")
+        if partes[0] not in RECURSOS or len(partes) > 2 or (len(partes) == 2 and not partes[1].isdigit()):
+            return None
+        params = {clave: valores[-1] for clave, valores in parse_qs(scope["query_string"].decode("latin-1")).items()}
+        headers = {clave.decode("latin-1").lower(): valor.decode("latin-1") for clave, valor in scope["headers"]}
+        if any(p in params for p in PARAMETROS_DELEGADOS) or any(h in headers for h in HEADERS_DELEGADOS):
+            return None
+        recurso = RECURSOS[partes[0]]
+        if len(partes) == 2:
+            return self._buscar, (recurso, int(partes[1]), params, headers)
+        if headers.get("x-count", CONTEO_EXACTO).strip().lower() not in MODOS_CONTEO:
+            return None
+        if _entero(headers.get("x-page"), 1) < 1 or _entero(headers.get("x-per-page"), 10) < 1:
+            return None
+        return self._listar, (recurso, params, headers)
+
+    async def _buscar(self, recurso, id: int, params: Dict[str, str], headers: Dict[str, str]):
+        model, mapping, no_encontrada = recurso
+        try:
+            campos = campos_pedidos(mapping, params.get("fields") or headers.get("x-fields"))
+        except ValueError as e:
+            return 400, {"error": str(e)}
+        entity = await self._entidad(model, id, self._replica(headers))
+        if entity is None:
+            return 404, {"error": no_encontrada}
+        return 200, esquema(mapping, campos).dump(entity)
+
+    async def _listar(self, recurso, params: Dict[str, str], headers: Dict[str, str]):
+        model, mapping, _ = recurso
+        page = _entero(headers.get("x-page"), 1)
+        per_page = _entero(headers.get("x-per-page"), 10)
+        conteo = headers.get("x-count", CONTEO_EXACTO).strip().lower()
+        try:
+            campos = campos_pedidos(mapping, params.get("fields") or headers.get("x-fields"))
+        except ValueError as e:
+            return 400, {"error": str(e)}
+        filters = []
+        if headers.get("x-filters"):
+            try:
+                filters = compilar_filtros(model, json.loads(headers["x-filters"]), estricto=self.estricto)
+            except json.JSONDecodeError:
+                return 400, {"error": "Formato de filtros inválido en X-filters"}
+            except FiltroInvalido as e:
+                return 400, {"error": str(e)}
+
+        # Misma estrategia que paginar(): estimación, conteo cacheado o total en la misma consulta.
+        # Los helpers arman un Query sin sesión y acá se ejecuta su SELECT.
+        query = filtrar(Query(model), model, filters, campos)
+        replica = self._replica(headers)
+        clave_conteo = None
+        async with self._sesion(replica) as session:
+            total, exacto = None, False
+            if conteo == CONTEO_ESTIMADO:
+                total = await self._estimar(session, model, filters)
+            if conteo != CONTEO_NINGUNO and total is None:
+                clave_conteo = await self._clave_conteo(model, filters)
+                cached = await self._redis("get", clave_conteo)
+                total, exacto = (int(cached) if cached is not None else None), True
+
+            contar_en_consulta = conteo != CONTEO_NINGUNO and total is None
+            resultado = await session.execute(
+                consulta_pagina(query, model, page, per_page, contar_en_consulta=contar_en_consulta).statement)
+            if contar_en_consulta:
+                contenido, total = separar_total(resultado.all(), page)
+                if total is None:
+                    total = (await session.execute(consulta_conteo(model, filters))).scalar() or 0
+                if self._confiable(replica, model):
+                    await self._redis("set", clave_conteo, str(total).encode(), ex=entity_cache.count_ttl)
+            else:
+                contenido = resultado.scalars().all()
+
+        return 200, {
+            "content": esquema(mapping, campos).dump(contenido, many=True),
+            "pageable": {
+                "page": page,
+                "size": per_page,
+                "total_elements": total,
+                "total_pages": total_paginas(total, per_page),
+                "total_elements_exact": exacto,
+            },
+        }
+
+    async def _entidad(self, model, id: int, replica: Optional[str]):
+        # Read-through con la misma clave y serializador que EntityCache.buscar.
+        key = entity_cache.clave(model, id)
+        cached = await self._redis("get", key)
+        if cached is not None:
+            return model(**entity_cache.serializer.loads(cached))
+        async with self._sesion(replica) as session:
+            entity = await session.get(model, id)
+        if entity is not None and self._confiable(replica, model):
+            await self._redis("set", key, entity_cache.serializer.dumps(EntityCache._columnas(entity)),
+                              ex=entity_cache.ttl(model))
+        return entity
+
+    async def _clave_conteo(self, model, filters) -> str:
+        generacion = await self._redis("get", entity_cache.clave_tag(EntityCache.tag_tabla(model)))
+        return entity_cache.clave_conteo(model, filters, int(generacion) if generacion is not None else 0)
+
+    async def _estimar(self, session, model, filters) -> Optional[int]:
+        if not estimacion_aplicable(filters, session.bind.dialect.name):
+            return None
+        estimado = (await session.execute(ESTIMACION_POSTGRESQL, {"tabla": model.__tablename__})).scalar()
+        return estimacion_util(estimado, self.umbral_estimacion)
+
+    def _replica(self, headers: Dict[str, str]) -> Optional[str]:
+        """Como ReplicaRouter._antes_de_request, con los headers de ASGI (None: primario)."""
+        if not self.motores_replica:
+            return None
+        try:
+            primario_hasta = float(parse_cookie(headers.get("cookie", "")).get(RYW_COOKIE, 0))
+        except ValueError:
+            primario_hasta = 0
+        return replicas.replica_para("GET", headers.get(CONSISTENCIA_HEADER.lower()), primario_hasta)
+
+    def _sesion(self, replica: Optional[str]):
+        return self.sesiones_replica[replica]() if replica else self.sesiones()
+
+    @staticmethod
+    def _confiable(replica: Optional[str], model) -> bool:
+        # Igual que EntityCache.lectura_confiable: lo leído de una réplica atrasada no se cachea.
+        return replica is None or replicas.replica_al_dia([EntityCache.entidad(model)])
+
+    async def _redis(self, comando: str, *args, **kwargs):
+        """Un comando de Redis; None si no hay Redis, el circuito está abierto o falla la conexión."""
+        if self.redis is None or self.breaker.abierto:
+            return None
+        try:
+            resultado = await getattr(self.redis, comando)(*args, **kwargs)
+        except self.breaker.errores as e:
+            logging.warning(f"[ASGI] {comando} en Redis falló, se sigue sin cache: {e}")
+            self.breaker.falla(e)
+            return None
+        self.breaker.exito()
+        return resultado
+
+    async def _responder(self, send, status: int, cuerpo) -> None:
+        datos = self.flask_app.json.dumps(cuerpo).encode("utf-8")
+        await send({"type": "http.response.start", "status": status, "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(datos)).encode()),
+        ]})
+        await send({"type": "http.response.body", "body": datos})
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            mensaje = await receive()
+            if mensaje["type"] == "lifespan.startup":
+                if self.motores_replica:
+                    # La primera medición del atraso es síncrona: fuera del event loop.
+                    await asyncio.to_thread(lambda: [replicas.lag(clave) for clave in self.motores_replica])
+                await send({"type": "lifespan.startup.complete"})
+            elif mensaje["type"] == "lifespan.shutdown":
+                await self.cerrar()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def cerrar(self) -> None:
+        await self.motor.dispose()
+        for motor in self.motores_replica.values():
+            await motor.dispose()
+        if self.redis is not None:
+            await self.redis.aclose()
+
+
+def crear_app_asgi(flask_app=None) -> AppAsgi:
+    """
+    Factory para uvicorn (--factory). Requiere las dependencias opcionales
+    del extra `asgi`: el driver async de la base y a2wsgi.
+    """
+    try:
+        from a2wsgi import WSGIMiddleware
+    except ImportError as e:
+        raise ImportError('El modo ASGI requiere las dependencias opcionales: pip install -e ".[asgi]"') from e
+
+    flask_app = flask_app or create_app()
+    config = flask_app.config
+    opciones = opciones_engine(config.get("SQLALCHEMY_ENGINE_OPTIONS", {}))
+    motor = create_async_engine(url_async(config["SQLALCHEMY_DATABASE_URI"]), **opciones)
+    motores_replica = {clave: create_async_engine(url_async(config["SQLALCHEMY_BINDS"][clave]), **opciones)
+                       for clave in replicas.claves}
+    redis = None
+    if entity_cache.breaker is not None:
+        # Bloqueante: con todas las conexiones en uso se espera una libre
+        # (hasta el timeout) en lugar de fallar y abrir el circuito.
+        redis = aioredis.Redis(connection_pool=aioredis.BlockingConnectionPool(
+            host=config["CACHE_REDIS_HOST"],
+            port=config["CACHE_REDIS_PORT"],
+            db=config["CACHE_REDIS_DB"],
+            password=config["CACHE_REDIS_PASSWORD"],
+            max_connections=config["REDIS_MAX_CONNECTIONS"],
+            timeout=config["REDIS_SOCKET_TIMEOUT"],
+            socket_connect_timeout=config["REDIS_CONNECT_TIMEOUT"],
+            socket_timeout=config["REDIS_SOCKET_TIMEOUT"],
+            health_check_interval=config["REDIS_HEALTH_CHECK_INTERVAL"],
+        ))
+    return AppAsgi(flask_app, motor, redis, WSGIMiddleware(flask_app, workers=config.get("ASGI_WSGI_THREADS", 10)),
+                   motores_replica)
@@ -0,0 +1,7 @@
+from .entity_cache import EntityCache
+from .backends import BreakerBackend, MemoryBackend, RedisBackend, TieredBackend
+from .local import LocalLRU
+from .invalidation import LocalInvalidationBus, RedisInvalidationBus
+from .serializers import JsonSerializer, PickleSerializer
+from .views import cached_view, LIST_HEADERS
+from .prefijos import IndicePrefijos
@@ -0,0 +1,316 @@
+import logging
+import threading
+import time
+from typing import Dict, List, Optional
+
+from app.utils.circuit_breaker import CircuitoAbierto
+
+
+class MemoryBackend:
+    """
+    Backend en memoria del proceso. Se usa en tests y como fallback cuando
+    no hay Redis configurado; cada instancia de la app tiene el suyo.
+    """
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expira = item
+            if expira is not None and expira <= time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        expira = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expira)
+
+    def get_many(self, keys) -> List[Optional[bytes]]:
+        return [self.get(key) for key in keys]
+
+    def set_many(self, items: Dict[str, bytes], ttl: Optional[int] = None) -> None:
+        for key, value in items.items():
+            self.set(key, value, ttl)
+
+    def exists(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value, expira = self._data.get(key, (b"0", None))
+            nuevo = int(value) + 1
+            self._data[key] = (str(nuevo).encode(), expira)
+            return nuevo
+
+    def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        """Guarda sólo si la clave no existe (equivalente a SET NX)."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and (item[1] is None or item[1] > time.monotonic()):
+                return False
+            self._data[key] = (value, time.monotonic() + ttl if ttl else None)
+            return True
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def delete_if_equal(self, key: str, value: bytes) -> bool:
+        """Borra la clave sólo si todavía vale `value` (liberar un lock propio)."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[0] != value or (item[1] is not None and item[1] <= time.monotonic()):
+                return False
+            del self._data[key]
+            return True
+
+    def incr_delete(self, incr_keys, delete_keys) -> None:
+        """Incrementa y después borra, en una sola operación (ver RedisBackend)."""
+        for key in incr_keys:
+            self.incr(key)
+        self.delete(*delete_keys)
+
+
+# GET y DEL atómicos: si el lock expiró y lo tomó otro worker, no se borra el ajeno.
+LUA_DELETE_IF_EQUAL = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+
+class RedisBackend:
+    """Backend sobre un cliente redis-py ya configurado."""
+
+    def __init__(self, client):
+        self.client = client
+        self._delete_if_equal = None
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(key)
+
+    def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        self.client.set(key, value, ex=ttl)
+
+    def get_many(self, keys) -> List[Optional[bytes]]:
+        return self.client.mget(keys) if keys else []
+
+    def set_many(self, items: Dict[str, bytes], ttl: Optional[int] = None) -> None:
+        # MSET no acepta TTL: un SET EX por clave, todos en un pipeline.
+        if not items:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for key, value in items.items():
+            pipe.set(key, value, ex=ttl)
+        pipe.execute()
+
+    def exists(self, key: str) -> bool:
+        return bool(self.client.exists(key))
+
+    def incr(self, key: str) -> int:
+        return self.client.incr(key)
+
+    def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        px = int(ttl * 1000) if ttl else None
+        return bool(self.client.set(key, value, nx=True, px=px))
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self.client.delete(*keys)
+
+    def delete_if_equal(self, key: str, value: bytes) -> bool:
+        if self._delete_if_equal is None:
+            # EVALSHA con fallback a EVAL: el script viaja una sola vez por conexión.
+            self._delete_if_equal = self.client.register_script(LUA_DELETE_IF_EQUAL)
+        return bool(self._delete_if_equal(keys=[key], args=[value]))
+
+    def incr_delete(self, incr_keys, delete_keys) -> None:
+        """INCR de cada clave y un DEL de todas las demás en un pipeline: un solo round-trip."""
+        pipe = self.client.pipeline(transaction=False)
+        for key in incr_keys:
+            pipe.incr(key)
+        if delete_keys:
+            pipe.delete(*delete_keys)
+        pipe.execute()
+
+
+class TieredBackend:
+    """
+    Dos niveles: LRU local del worker delante de un backend compartido.
+    Escucha el bus de invalidaciones para descartar la copia local cuando
+    otro worker (o contenedor) modifica la entidad. Un valor leído del
+    remoto sólo se copia al LRU si no llegó ninguna invalidación mientras
+    se leía (ver LocalLRU.generacion).
+    """
+
+    def __init__(self, local, remote, bus):
+        self.local = local
+        self.remote = remote
+        self.bus = bus
+        bus.suscribir(lambda mensaje: local.delete(*mensaje.get("claves", [])))
+        bus.on_reconnect.append(local.clear)
+
+    def get(self, key: str) -> Optional[bytes]:
+        self.bus.asegurar_escucha()
+        value = self.local.get(key)
+        if value is not None:
+            return value
+        generacion = self.local.generacion
+        value = self.remote.get(key)
+        if value is not None:
+            self.local.set(key, value, generacion=generacion)
+        return value
+
+    def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        self.remote.set(key, value, ttl)
+        self.local.set(key, value, ttl)
+
+    def get_many(self, keys) -> List[Optional[bytes]]:
+        self.bus.asegurar_escucha()
+        values = [self.local.get(key) for key in keys]
+        faltantes = [i for i, value in enumerate(values) if value is None]
+        if faltantes:
+            generacion = self.local.generacion
+            for i, value in zip(faltantes, self.remote.get_many([keys[i] for i in faltantes])):
+                if value is not None:
+                    self.local.set(keys[i], value, generacion=generacion)
+                    values[i] = value
+        return values
+
+    def set_many(self, items: Dict[str, bytes], ttl: Optional[int] = None) -> None:
+        self.remote.set_many(items, ttl)
+        for key, value in items.items():
+            self.local.set(key, value, ttl)
+
+    # Los locks tienen que ser visibles para todos los workers: no pasan por el LRU.
+    def exists(self, key: str) -> bool:
+        return self.remote.exists(key)
+
+    def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        return self.remote.add(key, value, ttl)
+
+    def delete_if_equal(self, key: str, value: bytes) -> bool:
+        return self.remote.delete_if_equal(key, value)
+
+    def incr(self, key: str) -> int:
+        value = self.remote.incr(key)
+        self.local.delete(key)
+        return value
+
+    def delete(self, *keys: str) -> None:
+        self.local.delete(*keys)
+        self.remote.delete(*keys)
+
+    def incr_delete(self, incr_keys, delete_keys) -> None:
+        self.remote.incr_delete(incr_keys, delete_keys)
+        self.local.delete(*incr_keys, *delete_keys)
+
+
+class BreakerBackend:
+    """
+    Envuelve al backend compartido con un circuit breaker (app/utils/circuit_breaker.py).
+
+    Las fallas de conexión no salen de acá: una lectura fallida es un miss,
+    una escritura se descarta y un lock se da por tomado (se recalcula sin
+    coordinación). Con el circuito abierto ni se intenta llamar a Redis, así
+    que cada request va directo a la base sin esperar el timeout del socket.
+
+    Las invalidaciones (INCR de tags/generaciones y DEL) que no llegaron
+    quedan pendientes y se reaplican en cuanto el circuito se cierra o la
+    siguiente operación tiene éxito: si no, al volver Redis serviría valores
+    escritos antes del corte.
+    """
+
+    def __init__(self, backend, breaker, max_pendientes: int = 100_000):
+        self.backend = backend
+        self.breaker = breaker
+        self.max_pendientes = max_pendientes
+        self._incr_pendientes = set()
+        self._delete_pendientes = set()
+        self._lock = threading.Lock()
+        breaker.al_cerrar.append(self.reaplicar_pendientes)
+
+    def _llamar(self, metodo: str, default, *args):
+        try:
+            resultado = self.breaker.llamar(getattr(self.backend, metodo), *args)
+        except CircuitoAbierto:
+            return default
+        except self.breaker.errores as e:
+            logging.warning(f"[CACHE] {metodo} falló, se sigue sin cache: {e}")
+            return default
+        if self._incr_pendientes or self._delete_pendientes:
+            self.reaplicar_pendientes()
+        return resultado
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._llamar("get", None, key)
+
+    def set(self, key: str, value: bytes, ttl: Optional[int] = None) -> None:
+        self._llamar("set", None, key, value, ttl)
+
+    def get_many(self, keys) -> List[Optional[bytes]]:
+        return self._llamar("get_many", [None] * len(keys), keys)
+
+    def set_many(self, items: Dict[str, bytes], ttl: Optional[int] = None) -> None:
+        self._llamar("set_many", None, items, ttl)
+
+    def exists(self, key: str) -> bool:
+        return self._llamar("exists", False, key)
+
+    def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        return self._llamar("add", True, key, value, ttl)
+
+    def delete_if_equal(self, key: str, value: bytes) -> bool:
+        # Un lock que no se pudo liberar expira solo: no queda pendiente.
+        return self._llamar("delete_if_equal", False, key, value)
+
+    def incr(self, key: str) -> int:
+        resultado = self._llamar("incr", None, key)
+        if resultado is None:
+            self._pendiente([key], [])
+            return 0
+        return resultado
+
+    def delete(self, *keys: str) -> None:
+        if self._llamar("delete", False, *keys) is False:
+            self._pendiente([], keys)
+
+    def incr_delete(self, incr_keys, delete_keys) -> None:
+        if self._llamar("incr_delete", False, incr_keys, delete_keys) is False:
+            self._pendiente(incr_keys, delete_keys)
+
+    def pendientes(self) -> int:
+        return len(self._incr_pendientes) + len(self._delete_pendientes)
+
+    def _pendiente(self, incr_keys, delete_keys) -> None:
+        with self._lock:
+            if self.pendientes() + len(incr_keys) + len(delete_keys) > self.max_pendientes:
+                logging.error(f"[CACHE] Demasiadas invalidaciones pendientes: se descartan "
+                              f"{len(incr_keys) + len(delete_keys)} (expiran por TTL)")
+                return
+            self._incr_pendientes.update(incr_keys)
+            self._delete_pendientes.update(delete_keys)
+
+    def reaplicar_pendientes(self) -> None:
+        with self._lock:
+            incr_keys, self._incr_pendientes = self._incr_pendientes, set()
+            delete_keys, self._delete_pendientes = self._delete_pendientes, set()
+        if not incr_keys and not delete_keys:
+            return
+        try:
+            # Directo al backend: si falla de nuevo, vuelven a quedar pendientes.
+            self.backend.incr_delete(sorted(incr_keys), sorted(delete_keys))
+        except Exception as e:
+            logging.warning(f"[CACHE] No se pudieron reaplicar {len(incr_keys) + len(delete_keys)} invalidaciones: {e}")
+            self._pendiente(incr_keys, delete_keys)
+            return
+        logging.info(f"[CACHE] Reaplicadas {len(incr_keys) + len(delete_keys)} invalidaciones pendientes")
@@ -0,0 +1,384 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+import uuid
+import weakref
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+
+from app.utils.circuit_breaker import CircuitBreaker
+from .backends import BreakerBackend, MemoryBackend, RedisBackend, TieredBackend
+from .invalidation import LocalInvalidationBus, RedisInvalidationBus
+from .local import LocalLRU
+from .serializers import serializer_factory
+
+
+class EntityCache:
+    """
+    Cache read-through de entidades por id, compartido por los repositorios.
+
+    Centraliza el formato de las claves (`<prefijo>:<entidad>:<id>`), la
+    política de TTL por entidad y el serializador, de modo que el
+    comportamiento del cache se ajusta desde la configuración y no en cada
+    repositorio.
+    """
+
+    def __init__(self):
+        self.db = None
+        self.backend = None
+        self.bus = None
+        self.breaker = None
+        self.serializer = None
+        self.prefix = "gestion"
+        self.default_ttl = None
+        self.ttls = {}
+        self.count_ttl = 300
+        self.document_ttl = 3600
+        self.single_flight = True
+        self.lock_ttl = 5
+        self.lock_wait = 2
+        self.lock_poll = 0.02
+        self._locks = weakref.WeakValueDictionary()
+        self._locks_guard = threading.Lock()
+        # entidades -> si lo leído en esta request puede guardarse (ver ReplicaRouter.lectura_confiable)
+        self.lectura_confiable: Callable[[Iterable[str]], bool] = lambda entidades: True
+
+    def init_app(self, app, db, redis_client=None) -> None:
+        self.db = db
+        self.prefix = app.config.get("ENTITY_CACHE_PREFIX", "gestion")
+        self.default_ttl = app.config.get("ENTITY_CACHE_DEFAULT_TTL", 300)
+        self.ttls = dict(app.config.get("ENTITY_CACHE_TTL", {}))
+        self.count_ttl = app.config.get("COUNT_CACHE_TTL", 300)
+        self.document_ttl = app.config.get("ENTITY_CACHE_DOCUMENT_TTL", 3600)
+        self.serializer = serializer_factory(app.config.get("ENTITY_CACHE_SERIALIZER", "json"))
+        self.single_flight = app.config.get("ENTITY_CACHE_SINGLE_FLIGHT", True)
+        self.lock_ttl = app.config.get("ENTITY_CACHE_LOCK_TTL", 5)
+        self.lock_wait = app.config.get("ENTITY_CACHE_LOCK_WAIT", 2)
+        self.lock_poll = app.config.get("ENTITY_CACHE_LOCK_POLL", 0.02)
+
+        backend = app.config.get("ENTITY_CACHE_BACKEND", "redis")
+        self.breaker = None
+        if backend == "redis" and redis_client is not None:
+            # Con Redis caído se saltea el cache entero (también el LRU local,
+            # que ya no recibe invalidaciones) hasta que el sondeo lo vea sano.
+            self.breaker = CircuitBreaker(
+                "redis", redis_client.ping,
+                umbral=app.config.get("REDIS_BREAKER_FALLAS", 5),
+                intervalo=app.config.get("REDIS_BREAKER_SONDEO", 5.0),
+                errores=(RedisConnectionError, RedisTimeoutError, OSError),
+            )
+            self.backend = RedisBackend(redis_client)
+            self.bus = RedisInvalidationBus(redis_client, app.config["ENTITY_CACHE_INVALIDATION_CHANNEL"], self.breaker)
+            local_maxsize = app.config.get("ENTITY_CACHE_LOCAL_MAXSIZE", 0)
+            if local_maxsize:
+                local = LocalLRU(local_maxsize, app.config.get("ENTITY_CACHE_LOCAL_TTL", 30))
+                self.backend = TieredBackend(local, self.backend, self.bus)
+                self.breaker.al_abrir.append(local.clear)
+            self.backend = BreakerBackend(self.backend, self.breaker)
+        else:
+            self.backend = MemoryBackend()
+            self.bus = LocalInvalidationBus()
+
+    def disponible(self) -> bool:
+        """False con el circuit breaker de Redis abierto: quien cachea por su cuenta (vistas) no debe intentarlo."""
+        return self.breaker is None or not self.breaker.abierto
+
+    @staticmethod
+    def entidad(model) -> str:
+        return model.__name__.lower()
+
+    def clave(self, model, id) -> str:
+        return f"{self.prefix}:{self.entidad(model)}:{id}"
+
+    @staticmethod
+    def tag(model, id) -> str:
+        """Tag (surrogate key) de una entidad; las vistas cacheadas declaran de cuáles dependen."""
+        return f"{EntityCache.entidad(model)}:{id}"
+
+    @staticmethod
+    def tag_tabla(model) -> str:
+        """Tag de generación de la tabla: cambia con cualquier escritura sobre ella."""
+        return f"tabla:{EntityCache.entidad(model)}"
+
+    @staticmethod
+    def entidades_de_tags(tags) -> set:
+        """Entidades a las que se refieren los tags (`universidad:7`, `tabla:facultad`)."""
+        return {tag.split(":")[1] if tag.startswith("tabla:") else tag.split(":")[0] for tag in tags}
+
+    def ttl(self, model) -> Optional[int]:
+        return self.ttls.get(self.entidad(model), self.default_ttl)
+
+    def buscar(self, model, id, cargar: Callable):
+        """
+        Devuelve la entidad `id` desde el cache; ante un miss ejecuta
+        `cargar()` contra la base y guarda el resultado. Con single-flight
+        activo, sólo una request por clave recalcula el valor.
+        """
+        key = self.clave(model, id)
+        cached = self._get(key)
+        if cached is None and self.single_flight and self.disponible():
+            return self._buscar_single_flight(model, key, cargar)
+        if cached is not None:
+            logging.info(f"[CACHE HIT] {key}")
+            return self._reconstruir(model, self.serializer.loads(cached))
+
+        logging.info(f"[CACHE MISS] {key}")
+        return self._cargar_y_guardar(model, key, cargar)
+
+    def buscar_varios(self, model, ids, cargar: Callable[[list], Iterable]) -> list:
+        """
+        Multi-get: las entidades de `ids` en el mismo orden (None las que no
+        existen). Un solo MGET para todas las claves; los misses se cargan
+        juntos con `cargar(ids_faltantes)` (un WHERE id IN) y se guardan en
+        un pipeline. Sin single-flight: el lock es por clave y acá se
+        recalculan muchas a la vez.
+        """
+        ids = list(ids)
+        claves = [self.clave(model, id) for id in ids]
+        try:
+            cached = self.backend.get_many(claves) if claves else []
+        except Exception as e:
+            logging.warning(f"Error leyendo cache de {len(claves)} {self.entidad(model)}: {e}")
+            cached = [None] * len(claves)
+
+        encontradas = {id: self._reconstruir(model, self.serializer.loads(valor))
+                       for id, valor in zip(ids, cached) if valor is not None}
+        faltantes = [id for id in ids if id not in encontradas]
+        logging.info(f"[CACHE MGET] {self.entidad(model)}: {len(encontradas)} hits, {len(faltantes)} misses")
+        if faltantes:
+            cargadas = {entity.id: entity for entity in cargar(faltantes)}
+            if self.lectura_confiable([self.entidad(model)]):
+                try:
+                    self.backend.set_many({self.clave(model, id): self.serializer.dumps(self._columnas(entity))
+                                           for id, entity in cargadas.items()}, self.ttl(model))
+                except Exception as e:
+                    logging.warning(f"Error escribiendo cache de {len(cargadas)} {self.entidad(model)}: {e}")
+            encontradas.update(cargadas)
+        return [encontradas.get(id) for id in ids]
+
+    def _buscar_single_flight(self, model, key: str, cargar: Callable):
+        # 1. Un solo hilo por clave dentro del proceso.
+        with self._lock_local(key):
+            cached = self._get(key)
+            if cached is not None:
+                return self._reconstruir(model, self.serializer.loads(cached))
+
+            # 2. Un solo proceso por clave en todo el cluster (SET NX en Redis).
+            lock_key = f"{key}:lock"
+            token = uuid.uuid4().hex.encode()
+            if self._add(lock_key, token, self.lock_ttl):
+                logging.info(f"[CACHE MISS] {key} (recalculando)")
+                try:
+                    return self._cargar_y_guardar(model, key, cargar)
+                finally:
+                    self._liberar(lock_key, token)
+
+            # 3. Otro proceso está recalculando: esperar a que llene la clave.
+            limite = time.monotonic() + self.lock_wait
+            while time.monotonic() < limite:
+                time.sleep(self.lock_poll)
+                cached = self._get(key)
+                if cached is not None:
+                    logging.info(f"[CACHE HIT] {key} (tras esperar)")
+                    return self._reconstruir(model, self.serializer.loads(cached))
+                if not self._exists(lock_key):
+                    break
+
+            logging.info(f"[CACHE MISS] {key} (sin esperar más al lock)")
+            return self._cargar_y_guardar(model, key, cargar)
+
+    def _cargar_y_guardar(self, model, key: str, cargar: Callable):
+        entity = cargar()
+        if entity is not None and self.lectura_confiable([self.entidad(model)]):
+            self._set(key, self.serializer.dumps(self._columnas(entity)), self.ttl(model))
+        return entity
+
+    def _lock_local(self, key: str) -> threading.Lock:
+        with self._locks_guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = threading.Lock()
+                self._locks[key] = lock
+            return lock
+
+    def invalidar(self, model, id) -> None:
+        """
+        Borra la entidad del cache, invalida las vistas que dependen de su tag
+        y avisa al resto de los workers.
+        """
+        key = self.clave(model, id)
+        try:
+            self.backend.delete(key)
+        except Exception as e:
+            logging.warning(f"Error invalidando cache {key}: {e}")
+        claves_tags = self.invalidar_tags([self.tag(model, id), self.tag_tabla(model)])
+        self.bus.publicar([key, *claves_tags], entidad=self.entidad(model), ids=[id])
+
+    def invalidar_tabla(self, model, ids=()) -> None:
+        """
+        Sube la generación de la tabla (p. ej. tras un alta): los listados viejos
+        quedan inalcanzables. `ids` son las filas afectadas, si se conocen; sin
+        ids los suscriptores del bus asumen que pudo cambiar cualquier fila.
+        """
+        claves_tags = self.invalidar_tags([self.tag_tabla(model)])
+        self.bus.publicar(claves_tags, entidad=self.entidad(model), ids=list(ids))
+
+    def invalidar_lote(self, model, ids, documentos=()) -> None:
+        """
+        Como `invalidar` para varias filas a la vez, más los documentos que
+        las contienen: todos los INCR y DEL van al backend en una sola
+        llamada (un pipeline en Redis) y al bus en un único mensaje.
+        """
+        ids = list(ids)
+        documentos = list(documentos)
+        claves = [self.clave(model, id) for id in ids] + documentos
+        incrementos = ([self.clave_tag(self.tag(model, id)) for id in ids]
+                       + [self.clave_tag(self.tag_tabla(model))]
+                       + [f"{key}:gen" for key in documentos])
+        try:
+            self.backend.incr_delete(incrementos, claves)
+        except Exception as e:
+            logging.warning(f"Error invalidando {len(claves)} claves de {self.entidad(model)}: {e}")
+        self.bus.publicar([*claves, *incrementos], entidad=self.entidad(model), ids=ids)
+
+    def clave_conteo(self, model, filters, generacion: Optional[int] = None) -> str:
+        # La generación de la tabla en la clave hace que cualquier escritura
+        # deje inalcanzables los conteos anteriores (app/asgi.py la lee por su cuenta).
+        if generacion is None:
+            tag = self.tag_tabla(model)
+            generacion = self.versiones([tag])[tag]
+        firma = hashlib.md5(json.dumps(filters or [], sort_keys=True, default=str).encode()).hexdigest()
+        return f"{self.prefix}:conteo:{self.entidad(model)}:g{generacion}:{firma}"
+
+    def conteo(self, model, filters) -> Optional[int]:
+        """Conteo exacto cacheado para la tabla y los filtros dados (None si no está)."""
+        value = self._get(self.clave_conteo(model, filters))
+        return int(value) if value is not None else None
+
+    def guardar_conteo(self, model, filters, total: int) -> None:
+        if not self.lectura_confiable([self.entidad(model)]):
+            return
+        self._set(self.clave_conteo(model, filters), str(total).encode(), self.count_ttl)
+
+    def clave_documento(self, nombre: str, id) -> str:
+        return f"{self.prefix}:doc:{nombre}:{id}"
+
+    def documento(self, clave: str, construir: Callable[[], Optional[bytes]], entidades=()) -> Optional[bytes]:
+        """
+        Documento pre-serializado (bytes JSON listos para responder): un hit
+        es un único GET. Ante un miss `construir()` lo arma, y sólo se guarda
+        si nadie lo invalidó mientras tanto (la generación `<clave>:gen` no
+        cambió), así una construcción lenta no pisa una invalidación concurrente.
+        `entidades` son las tablas de las que se arma (para lectura_confiable).
+        """
+        cached = self._get(clave)
+        if cached is not None:
+            logging.info(f"[CACHE HIT] {clave}")
+            return cached
+
+        logging.info(f"[CACHE MISS] {clave}")
+        clave_generacion = f"{clave}:gen"
+        generacion = self._get(clave_generacion)
+        datos = construir()
+        if datos is not None and self.lectura_confiable(entidades) and self._get(clave_generacion) == generacion:
+            self._set(clave, datos, self.document_ttl)
+        return datos
+
+    def invalidar_documentos(self, claves) -> None:
+        """Borra los documentos y sube su generación (descarta construcciones en curso)."""
+        borradas = []
+        for key in claves:
+            try:
+                self.backend.incr(f"{key}:gen")
+                self.backend.delete(key)
+            except Exception as e:
+                logging.warning(f"Error invalidando documento {key}: {e}")
+            borradas += [key, f"{key}:gen"]
+        if borradas:
+            self.bus.publicar(borradas)
+
+    def clave_tag(self, tag: str) -> str:
+        return f"{self.prefix}:tag:{tag}"
+
+    def versiones(self, tags) -> dict:
+        """Versión actual de cada tag; las claves de las vistas la incluyen."""
+        versiones = {}
+        for tag in tags:
+            value = self._get(self.clave_tag(tag))
+            versiones[tag] = int(value) if value is not None else 0
+        return versiones
+
+    def invalidar_tags(self, tags) -> list:
+        """
+        Incrementa la versión de los tags: toda respuesta cacheada con la
+        versión anterior queda inalcanzable y expira sola, sin escanear claves.
+        """
+        claves = [self.clave_tag(tag) for tag in tags]
+        for key in claves:
+            try:
+                self.backend.incr(key)
+            except Exception as e:
+                logging.warning(f"Error invalidando tag {key}: {e}")
+        return claves
+
+    def _get(self, key: str) -> Optional[bytes]:
+        try:
+            return self.backend.get(key)
+        except Exception as e:
+            logging.warning(f"Error leyendo cache {key}: {e}")
+            return None
+
+    def _set(self, key: str, value: bytes, ttl: Optional[int]) -> None:
+        try:
+            self.backend.set(key, value, ttl)
+        except Exception as e:
+            logging.warning(f"Error escribiendo cache {key}: {e}")
+
+    def _add(self, key: str, value: bytes, ttl: Optional[float]) -> bool:
+        # Si el backend falla, se recalcula sin coordinación antes que bloquear.
+        try:
+            return self.backend.add(key, value, ttl)
+        except Exception as e:
+            logging.warning(f"Error tomando lock {key}: {e}")
+            return True
+
+    def _exists(self, key: str) -> bool:
+        try:
+            return self.backend.exists(key)
+        except Exception as e:
+            logging.warning(f"Error consultando lock {key}: {e}")
+            return False
+
+    def _liberar(self, key: str, token: bytes) -> None:
+        # Sólo si el lock sigue siendo nuestro: si expiró durante una carga
+        # lenta y lo tomó otro worker, borrarlo dejaría pasar a un tercero.
+        try:
+            if not self.backend.delete_if_equal(key, token):
+                logging.info(f"[CACHE] El lock {key} expiró antes de liberarlo")
+        except Exception as e:
+            logging.warning(f"Error liberando lock {key}: {e}")
+
+    @staticmethod
+    def _columnas(entity) -> dict:
+        return {attr.key: getattr(entity, attr.key) for attr in inspect(type(entity)).column_attrs}
+
+    def _reconstruir(self, model, data: dict):
+        # Si la sesión ya tiene esa entidad se devuelve tal cual: merge(load=False)
+        # pisaría su estado (cambios sin flush incluidos) con el del cache.
+        mapper = inspect(model)
+        clave = mapper.identity_key_from_primary_key(
+            [data.get(mapper.get_property_by_column(columna).key) for columna in mapper.primary_key])
+        existente = self.db.session.identity_map.get(clave)
+        if existente is not None:
+            return existente
+        # Identidad nueva: se adjunta sin consultar la base para que las relaciones
+        # (p. ej. universidad.facultades) sigan cargándose de forma perezosa.
+        entity = model(**data)
+        make_transient_to_detached(entity)
+        return self.db.session.merge(entity, load=False)
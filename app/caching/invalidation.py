@@ -0,0 +1,102 @@
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from typing import Callable, Iterable
+
+
+class LocalInvalidationBus:
+    """Bus en proceso: entrega las invalidaciones de forma síncrona (tests)."""
+
+    def __init__(self):
+        self.callbacks = []
+        self.on_reconnect = []
+
+    def suscribir(self, callback: Callable[[dict], None]) -> None:
+        self.callbacks.append(callback)
+
+    def publicar(self, claves: Iterable[str], **extra) -> None:
+        self._entregar({"claves": list(claves), **extra})
+
+    def asegurar_escucha(self) -> None:
+        pass
+
+    def _entregar(self, mensaje: dict) -> None:
+        for callback in self.callbacks:
+            try:
+                callback(mensaje)
+            except Exception as e:
+                logging.warning(f"[INVALIDACION] Error en suscriptor: {e}")
+
+
+class RedisInvalidationBus(LocalInvalidationBus):
+    """
+    Difunde invalidaciones a todos los workers y contenedores por un canal
+    pub/sub de Redis. Cada proceso escucha en un hilo daemon que se arranca
+    de forma perezosa, así sobrevive al fork de los workers de gunicorn.
+    Con el circuit breaker de Redis abierto sólo se entrega en el proceso
+    (los demás vacían su nivel local al reconectarse). El propio proceso
+    recibe sus invalidaciones de forma síncrona en `publicar`; los mensajes
+    llevan su origen y el suscriptor descarta los que publicó él mismo.
+    """
+
+    def __init__(self, client, channel: str, breaker=None):
+        super().__init__()
+        self.client = client
+        self.channel = channel
+        self.breaker = breaker
+        self._pid = None
+        self._lock = threading.Lock()
+        self._instancia = uuid.uuid4().hex
+
+    def _origen(self) -> str:
+        # Con el pid: los workers forkeados heredan la misma instancia.
+        return f"{self._instancia}:{os.getpid()}"
+
+    def publicar(self, claves: Iterable[str], **extra) -> None:
+        mensaje = {"claves": list(claves), **extra}
+        self._entregar(mensaje)
+        payload = json.dumps({**mensaje, "origen": self._origen()})
+        try:
+            if self.breaker is None:
+                self.client.publish(self.channel, payload)
+            elif not self.breaker.abierto:
+                self.breaker.llamar(self.client.publish, self.channel, payload)
+        except Exception as e:
+            logging.warning(f"[INVALIDACION] No se pudo publicar en {self.channel}: {e}")
+
+    def asegurar_escucha(self) -> None:
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            threading.Thread(target=self._escuchar, name="cache-invalidation", daemon=True).start()
+
+    def _escuchar(self) -> None:
+        while True:
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(self.channel)
+                # Mientras no hubo suscripción pudieron perderse mensajes.
+                for callback in self.on_reconnect:
+                    callback()
+                # get_message con timeout en lugar de listen(): el cliente tiene
+                # socket_timeout y una lectura bloqueante sin mensajes lo agotaría.
+                while True:
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "message":
+                        self._recibir(message["data"])
+            except Exception as e:
+                logging.warning(f"[INVALIDACION] Suscripción a {self.channel} caída: {e}")
+                # Devuelve la conexión al pool: si no, cada reconexión la pierde.
+                pubsub.close()
+                time.sleep(1)
+
+    def _recibir(self, data) -> None:
+        mensaje = json.loads(data)
+        if mensaje.pop("origen", None) != self._origen():
+            self._entregar(mensaje)
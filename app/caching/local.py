@@ -0,0 +1,66 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class LocalLRU:
+    """
+    Cache LRU acotado en memoria del worker. El TTL es corto y actúa sólo
+    como red de seguridad: la coherencia entre workers la da el bus de
+    invalidaciones.
+
+    Cada `delete`/`clear` avanza `generacion`: quien lee de un nivel remoto
+    la anota antes de la lectura y rellena con `set(..., generacion=...)`,
+    que no escribe si hubo una invalidación en el medio (si no, el valor
+    leído antes de la invalidación quedaría en el LRU hasta su TTL).
+    """
+
+    def __init__(self, max_items: int = 1024, ttl: Optional[float] = 30):
+        self.max_items = max_items
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._generacion = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expira = item
+            if expira is not None and expira <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    @property
+    def generacion(self) -> int:
+        return self._generacion
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None, generacion: Optional[int] = None) -> bool:
+        ttl = min(filter(None, (ttl, self.ttl)), default=None)
+        expira = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            if generacion is not None and generacion != self._generacion:
+                return False
+            self._data[key] = (value, expira)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_items:
+                self._data.popitem(last=False)
+            return True
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            self._generacion += 1
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generacion += 1
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,153 @@
+import bisect
+import logging
+import re
+import threading
+import unicodedata
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# (id, nombre, sigla)
+Documento = Tuple[int, str, Optional[str]]
+
+
+def normalizar(texto: str) -> str:
+    """Minúsculas, sin acentos y con los espacios colapsados."""
+    sin_acentos = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode()
+    return " ".join(re.findall(r"\w+", sin_acentos.lower()))
+
+
+def claves(nombre: str, sigla: Optional[str]) -> List[str]:
+    """
+    Claves de un documento: la sigla, el nombre completo y el nombre desde
+    cada palabra ("tecnologica nacional", "nacional"), así "nac" encuentra
+    "Universidad Tecnológica Nacional".
+    """
+    palabras = normalizar(nombre).split()
+    resultado = {" ".join(palabras[i:]) for i in range(len(palabras))}
+    if sigla:
+        resultado.add(normalizar(sigla))
+    resultado.discard("")
+    return sorted(resultado)
+
+
+class IndicePrefijos:
+    """
+    Índice de prefijos en memoria, uno por worker, para el autocompletado de
+    nombre y sigla. Por entidad guarda un arreglo ordenado de (clave, id):
+    una consulta es un bisect al primer candidato y un recorrido mientras
+    la clave empiece con el prefijo, sin tocar la base.
+
+    Se mantiene con el bus de invalidaciones del cache de entidades: cada
+    mensaje marca los ids modificados (o la tabla entera si no trae ids) y
+    el próximo pedido recarga sólo esas filas con `cargar(entidad, ids)`.
+    Las notificaciones llegan en el hilo del suscriptor de Redis, sin
+    contexto de aplicación; por eso la recarga es perezosa.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._claves: Dict[str, List[Tuple[str, int]]] = {}
+        self._documentos: Dict[str, Dict[int, Tuple[str, Optional[str], List[str]]]] = {}
+        # entidad -> ids a recargar; None significa reconstruir la entidad
+        self._pendientes: Dict[str, Optional[set]] = {}
+
+    def init_app(self, bus, entidades: Iterable[str]) -> None:
+        with self._lock:
+            self._claves = {entidad: [] for entidad in entidades}
+            self._documentos = {entidad: {} for entidad in entidades}
+            self._pendientes = {entidad: None for entidad in entidades}
+        bus.suscribir(self._notificacion)
+        # Si se cortó la suscripción pudieron perderse cambios: se reconstruye todo.
+        bus.on_reconnect.append(self.invalidar_todo)
+
+    def entidades(self) -> List[str]:
+        return list(self._claves)
+
+    def invalidar_todo(self) -> None:
+        with self._lock:
+            for entidad in self._pendientes:
+                self._pendientes[entidad] = None
+
+    def _notificacion(self, mensaje: dict) -> None:
+        entidad = mensaje.get("entidad")
+        if entidad not in self._pendientes:
+            return
+        ids = mensaje.get("ids")
+        with self._lock:
+            if not ids:
+                self._pendientes[entidad] = None
+            elif self._pendientes[entidad] is not None:
+                self._pendientes[entidad].update(int(id) for id in ids)
+
+    def sincronizar(self, entidad: str, cargar: Callable[[Optional[List[int]]], Iterable[Documento]]) -> None:
+        """Aplica los cambios pendientes de la entidad (recarga sólo las filas marcadas)."""
+        with self._lock:
+            pendientes = self._pendientes[entidad]
+            if pendientes is not None and not pendientes:
+                return
+            self._pendientes[entidad] = set()
+        try:
+            documentos = list(cargar(None if pendientes is None else sorted(pendientes)))
+        except Exception:
+            with self._lock:
+                actuales = self._pendientes[entidad]
+                self._pendientes[entidad] = None if pendientes is None or actuales is None else actuales | pendientes
+            raise
+
+        with self._lock:
+            if pendientes is None:
+                self._claves[entidad] = []
+                self._documentos[entidad] = {}
+            else:
+                # bajas y versiones viejas; las filas que siguen existiendo vuelven a entrar
+                for id in pendientes:
+                    self._quitar(entidad, id)
+            self._insertar_lote(entidad, documentos)
+        logging.debug(f"[AUTOCOMPLETADO] {entidad}: {len(documentos)} filas cargadas")
+
+    def buscar(self, entidad: str, prefijo: str, limite: int = 10) -> List[Documento]:
+        """Documentos con alguna clave que empiece con el prefijo, en orden alfabético de clave."""
+        prefijo = normalizar(prefijo)
+        if not prefijo:
+            return []
+        with self._lock:
+            arreglo = self._claves[entidad]
+            documentos = self._documentos[entidad]
+            resultado, vistos = [], set()
+            i = bisect.bisect_left(arreglo, (prefijo,))
+            while i < len(arreglo) and len(resultado) < limite:
+                clave, id = arreglo[i]
+                if not clave.startswith(prefijo):
+                    break
+                if id not in vistos:
+                    vistos.add(id)
+                    nombre, sigla, _ = documentos[id]
+                    resultado.append((id, nombre, sigla))
+                i += 1
+            return resultado
+
+    def __len__(self) -> int:
+        return sum(len(documentos) for documentos in self._documentos.values())
+
+    def _insertar_lote(self, entidad: str, documentos: List[Documento]) -> None:
+        arreglo = self._claves[entidad]
+        nuevas = []
+        for id, nombre, sigla in documentos:
+            claves_documento = claves(nombre, sigla)
+            self._documentos[entidad][id] = (nombre, sigla, claves_documento)
+            nuevas.extend((clave, id) for clave in claves_documento)
+        if len(nuevas) > 16:
+            arreglo.extend(nuevas)
+            arreglo.sort()
+        else:
+            for item in nuevas:
+                bisect.insort(arreglo, item)
+
+    def _quitar(self, entidad: str, id: int) -> None:
+        documento = self._documentos[entidad].pop(id, None)
+        if documento is None:
+            return
+        arreglo = self._claves[entidad]
+        for clave in documento[2]:
+            i = bisect.bisect_left(arreglo, (clave, id))
+            if i < len(arreglo) and arreglo[i] == (clave, id):
+                del arreglo[i]
@@ -0,0 +1,36 @@
+import json
+import pickle
+
+
+class JsonSerializer:
+    """Serializa diccionarios de columnas como JSON (legible desde redis-cli)."""
+    nombre = "json"
+
+    @staticmethod
+    def dumps(data: dict) -> bytes:
+        return json.dumps(data).encode("utf-8")
+
+    @staticmethod
+    def loads(raw: bytes) -> dict:
+        return json.loads(raw)
+
+
+class PickleSerializer:
+    """Serializa con pickle; conserva tipos (fechas, decimales) a costa de legibilidad."""
+    nombre = "pickle"
+
+    @staticmethod
+    def dumps(data: dict) -> bytes:
+        return pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def loads(raw: bytes) -> dict:
+        return pickle.loads(raw)
+
+
+def serializer_factory(nombre: str):
+    serializers = {
+        JsonSerializer.nombre: JsonSerializer,
+        PickleSerializer.nombre: PickleSerializer,
+    }
+    return serializers[nombre]()
@@ -0,0 +1,76 @@
+import hashlib
+import json
+import logging
+from functools import wraps
+from typing import Callable, Iterable, Optional
+
+from flask import current_app, request
+
+# Headers que definen el contenido de un listado paginado.
+LIST_HEADERS = ("X-page", "X-per-page", "X-filters", "X-cursor", "X-count", "X-fields")
+
+
+def cached_view(tags: Callable[..., Iterable[str]], vary: Iterable[str] = (),
+                solo_si: Optional[Callable[..., bool]] = None):
+    """
+    Cachea la respuesta de una vista en Flask-Caching con una clave que
+    incluye la versión de cada tag del que depende (p. ej. `universidad:7`).
+    Cuando un repositorio escribe la entidad, `entity_cache.invalidar` sube
+    la versión del tag y las respuestas viejas dejan de encontrarse, lo que
+    permite TTLs largos (VIEW_CACHE_TIMEOUT) sin servir datos desactualizados.
+
+    `tags` recibe los argumentos de la vista y devuelve los tags. `vary`
+    lista los headers que cambian la respuesta (paginación, filtros); su
+    valor normalizado forma parte de la clave. Con `solo_si` (recibe los
+    argumentos de la vista) la respuesta se cachea sólo cuando devuelve True;
+    si no, la vista se ejecuta sin tocar el cache de vistas.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            from app import cache, entity_cache
+
+            # Redis caído: sin versiones de tags confiables ni cache de vistas.
+            if not entity_cache.disponible() or (solo_si is not None and not solo_si(*args, **kwargs)):
+                return f(*args, **kwargs)
+            tags_vista = tags(*args, **kwargs)
+            versiones = entity_cache.versiones(tags_vista)
+            key = "view/{}|{}".format(
+                request.full_path,
+                ",".join(f"{tag}={version}" for tag, version in sorted(versiones.items())),
+            )
+            if vary:
+                headers = "|".join(_normalizar(request.headers.get(h)) for h in vary)
+                key += "|" + hashlib.md5(headers.encode()).hexdigest()
+            try:
+                rv = cache.get(key)
+            except Exception as e:
+                logging.warning(f"Error leyendo cache de vista {key}: {e}")
+                rv = None
+            if rv is not None:
+                return rv
+
+            rv = f(*args, **kwargs)
+            if _cacheable(rv) and entity_cache.lectura_confiable(entity_cache.entidades_de_tags(tags_vista)):
+                try:
+                    cache.set(key, rv, timeout=current_app.config.get("VIEW_CACHE_TIMEOUT"))
+                except Exception as e:
+                    logging.warning(f"Error escribiendo cache de vista {key}: {e}")
+            return rv
+        return decorated_function
+    return decorator
+
+
+def _normalizar(valor) -> str:
+    # '{"b": 1, "a": 2}' y '{"a":2,"b":1}' deben compartir entrada.
+    if valor is None:
+        return ""
+    try:
+        return json.dumps(json.loads(valor), sort_keys=True, separators=(",", ":"))
+    except ValueError:
+        return valor.strip()
+
+
+def _cacheable(rv) -> bool:
+    # Sólo respuestas exitosas: un 404 cacheado sobreviviría a la creación.
+    return isinstance(rv, tuple) and len(rv) == 2 and rv[1] == 200 and isinstance(rv[0], (dict, list))
@@ -0,0 +1 @@
+from .especialidad_client import EspecialidadClient
@@ -0,0 +1,164 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.caching import LocalLRU
+from app.utils.circuit_breaker import CircuitBreaker, CircuitoAbierto
+from app.utils.retry import ErrorHTTP, es_transitorio
+
+
+class EspecialidadClient:
+    """
+    Cliente del servicio de especialidades.
+
+    - Una `requests.Session` por worker con un pool de conexiones keep-alive
+      (ESPECIALIDAD_CLIENT_POOL_SIZE) en lugar de una conexión TCP por pedido.
+    - Respuestas cacheadas por id en un LRU local durante
+      ESPECIALIDAD_CLIENT_CACHE_TTL segundos (los 404 no se cachean).
+    - Circuit breaker: tras varias fallas de red o 5xx seguidas, `obtener`
+      responde CircuitoAbierto sin esperar timeouts hasta que un sondeo de
+      fondo vuelve a ver el servicio. El sondeo pide una sola entidad (o
+      ESPECIALIDAD_SERVICE_HEALTH_URL si está configurada), nunca la colección.
+    - `obtener_varios` resuelve muchos ids en paralelo con un thread pool.
+    """
+
+    def __init__(self):
+        self.url = None
+        self.url_salud = None
+        self.timeout = None
+        self.workers = 8
+        self.pool_size = 10
+        self.session = None
+        self.cache = LocalLRU()
+        self.breaker = None
+        self._metricas = {}
+        self._executor = None
+        self._pid = None
+        self._ultimo_id = 1
+        self._lock = threading.Lock()
+
+    def init_app(self, app, registro=None) -> None:
+        self.url = app.config["ESPECIALIDAD_SERVICE_URL"].rstrip("/")
+        self.url_salud = app.config.get("ESPECIALIDAD_SERVICE_HEALTH_URL")
+        self.timeout = (app.config.get("ESPECIALIDAD_CLIENT_CONNECT_TIMEOUT", 1.0),
+                        app.config.get("ESPECIALIDAD_CLIENT_READ_TIMEOUT", 3.0))
+        self.workers = app.config.get("ESPECIALIDAD_CLIENT_WORKERS", 8)
+        self.pool_size = max(app.config.get("ESPECIALIDAD_CLIENT_POOL_SIZE", 10), self.workers)
+        self.cache = LocalLRU(app.config.get("ESPECIALIDAD_CLIENT_CACHE_MAXSIZE", 1024),
+                              app.config.get("ESPECIALIDAD_CLIENT_CACHE_TTL", 60))
+        self.breaker = CircuitBreaker(
+            "especialidad", self._sondeo,
+            umbral=app.config.get("ESPECIALIDAD_CLIENT_BREAKER_FALLAS", 5),
+            intervalo=app.config.get("ESPECIALIDAD_CLIENT_BREAKER_SONDEO", 5.0),
+            errores=(requests.RequestException, ErrorHTTP),
+            es_falla=es_transitorio,
+        )
+        self._cerrar()
+        if registro is not None:
+            self._metricas["pedidos"] = registro.contador(
+                "especialidad_client_requests_total", "Pedidos al servicio de especialidades por resultado")
+            self._metricas["cache"] = registro.contador(
+                "especialidad_client_cache_total", "Consultas al cache del cliente de especialidades (hit/miss)")
+            registro.gauge("especialidad_client_circuit_open", "1 si el circuit breaker del servicio está abierto",
+                           agregacion="livemax") \
+                .callback(lambda: float(self.breaker.abierto))
+
+    def obtener(self, id: int) -> dict:
+        """
+        La especialidad `id` como la devuelve el servicio. Lanza ErrorHTTP
+        (404 si no existe), errores de requests o CircuitoAbierto.
+        """
+        cached = self.cache.get(id)
+        if cached is not None:
+            self._contar("cache", resultado="hit")
+            return cached
+        self._contar("cache", resultado="miss")
+        try:
+            data = self.breaker.llamar(self._pedir, id)
+        except CircuitoAbierto:
+            self._contar("pedidos", resultado="circuito_abierto")
+            raise
+        except Exception as e:
+            self._contar("pedidos", resultado=str(e.status) if isinstance(e, ErrorHTTP) else "error")
+            raise
+        self._contar("pedidos", resultado="200")
+        self.cache.set(id, data)
+        return data
+
+    def obtener_varios(self, ids: Iterable[int]) -> Dict[int, Optional[dict]]:
+        """
+        Varias especialidades a la vez: los hits salen del cache y el resto
+        se pide en paralelo (hasta ESPECIALIDAD_CLIENT_WORKERS pedidos
+        simultáneos). Las que no existen o fallaron quedan en None.
+        """
+        ids = list(dict.fromkeys(ids))
+        resultado = {id: self.cache.get(id) for id in ids}
+        faltantes = [id for id, data in resultado.items() if data is None]
+        self._contar("cache", len(ids) - len(faltantes), resultado="hit")
+        if faltantes:
+            for id, data in zip(faltantes, self._pool().map(self._obtener_o_none, faltantes)):
+                resultado[id] = data
+        return resultado
+
+    def invalidar(self, id: int) -> None:
+        self.cache.delete(id)
+
+    def _obtener_o_none(self, id: int) -> Optional[dict]:
+        try:
+            return self.obtener(id)
+        except (CircuitoAbierto, ErrorHTTP, requests.RequestException, ValueError) as e:
+            logging.warning(f"[ESPECIALIDAD] No se pudo obtener la especialidad {id}: {e}")
+            return None
+
+    def _pedir(self, id: int) -> dict:
+        self._ultimo_id = id
+        response = self._session().get(f"{self.url}/{id}", timeout=self.timeout)
+        if response.status_code != 200:
+            raise ErrorHTTP(response.status_code, f"Error HTTP {response.status_code} en Especialidad")
+        return response.json()
+
+    def _sondeo(self) -> None:
+        # Un 404 también cuenta como servicio sano: sólo importa que responda sin 5xx.
+        url = self.url_salud or f"{self.url}/{self._ultimo_id}"
+        response = self._session().get(url, timeout=self.timeout)
+        if response.status_code >= 500:
+            raise ErrorHTTP(response.status_code)
+
+    def _session(self) -> requests.Session:
+        self._asegurar_proceso()
+        return self.session
+
+    def _pool(self) -> ThreadPoolExecutor:
+        self._asegurar_proceso()
+        return self._executor
+
+    def _asegurar_proceso(self) -> None:
+        # Sockets e hilos no se comparten entre los workers de gunicorn: uno por proceso.
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=0)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self.session = session
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="especialidad-client")
+            self._pid = os.getpid()
+
+    def _cerrar(self) -> None:
+        with self._lock:
+            if self.session is not None and self._pid == os.getpid():
+                self.session.close()
+                self._executor.shutdown(wait=False)
+            self.session, self._executor, self._pid = None, None, None
+
+    def _contar(self, metrica: str, valor: int = 1, **etiquetas) -> None:
+        if metrica in self._metricas and valor:
+            self._metricas[metrica].inc(valor, **etiquetas)
@@ -3,13 +3,37 @@ from dotenv import load_dotenv
 from pathlib import Path
 import os
 
+from app.metrics import QueuePoolMedido
+
 basedir = os.path.abspath(Path(__file__).parents[2])
 load_dotenv(os.path.join(basedir, '.env'))
 
+
+def opciones_pool(pool_size: int, max_overflow: int, pool_timeout: float = 30, pool_recycle: int = 1800) -> dict:
+    """
+    SQLALCHEMY_ENGINE_OPTIONS de un entorno (valen también para las réplicas).
+    Cada valor se puede pisar con DB_POOL_SIZE, DB_MAX_OVERFLOW,
+    DB_POOL_TIMEOUT, DB_POOL_RECYCLE y DB_POOL_PRE_PING.
+
+    Cada worker abre como máximo pool_size + max_overflow conexiones:
+    workers x (pool_size + max_overflow) x instancias tiene que entrar en
+    max_connections de PostgreSQL (ver db_pool_* en /api/v1/metrics).
+    """
+    return {
+        "poolclass": QueuePoolMedido,
+        "pool_size": int(os.getenv("DB_POOL_SIZE", pool_size)),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", max_overflow)),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", pool_timeout)),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", pool_recycle)),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes"),
+    }
+
+
 class Config(object):
     TESTING = False
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_RECORD_QUERIES = True
+    SQLALCHEMY_ENGINE_OPTIONS = opciones_pool(pool_size=5, max_overflow=10)
     SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
     CACHE_TYPE = "RedisCache"
     CACHE_REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
@@ -17,6 +41,97 @@ class Config(object):
     CACHE_REDIS_DB = int(os.getenv("REDIS_DB", 0))
     CACHE_REDIS_PASSWORD = os.getenv("REDIS_PASSWORD", None)
     CACHE_DEFAULT_TIMEOUT = 300
+    # Cliente Redis compartido por el cache de entidades, el bus de
+    # invalidaciones y las vistas: un pool por worker y timeouts cortos, así
+    # un Redis caído o lento no deja requests colgadas.
+    REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", 50))
+    REDIS_CONNECT_TIMEOUT = float(os.getenv("REDIS_CONNECT_TIMEOUT", 0.5))
+    REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", 0.5))
+    REDIS_HEALTH_CHECK_INTERVAL = 30
+    # Cada cuánto refresca cada worker sus gauges con PROMETHEUS_MULTIPROC_DIR (ver app/metrics/registro.py)
+    METRICS_REFRESH_INTERVAL = float(os.getenv("METRICS_REFRESH_INTERVAL", 5.0))
+    # Circuit breaker: tras REDIS_BREAKER_FALLAS errores de conexión seguidos
+    # se saltea el cache y se sirve desde la base; un hilo hace PING cada
+    # REDIS_BREAKER_SONDEO segundos y lo vuelve a habilitar.
+    REDIS_BREAKER_FALLAS = int(os.getenv("REDIS_BREAKER_FALLAS", 5))
+    REDIS_BREAKER_SONDEO = float(os.getenv("REDIS_BREAKER_SONDEO", 5.0))
+    # Reintentos (app/utils/retry.py): sólo errores transitorios, nunca más
+    # allá de REQUEST_DEADLINE segundos desde el inicio de la request y con un
+    # presupuesto por worker de RETRY_BUDGET_CAPACITY reintentos que se
+    # repone a RETRY_BUDGET_PER_SECOND por segundo.
+    REQUEST_DEADLINE = float(os.getenv("REQUEST_DEADLINE", 10.0))
+    RETRY_BUDGET_CAPACITY = int(os.getenv("RETRY_BUDGET_CAPACITY", 20))
+    RETRY_BUDGET_PER_SECOND = float(os.getenv("RETRY_BUDGET_PER_SECOND", 2.0))
+    # Cliente del servicio de especialidades (app/clients): sesión con pool
+    # keep-alive, cache por id y circuit breaker; obtener_varios pide hasta
+    # ESPECIALIDAD_CLIENT_WORKERS especialidades en paralelo.
+    ESPECIALIDAD_SERVICE_URL = os.getenv("ESPECIALIDAD_SERVICE_URL", "http://especialidad:5000/api/especialidades")
+    ESPECIALIDAD_CLIENT_CONNECT_TIMEOUT = 1.0
+    ESPECIALIDAD_CLIENT_READ_TIMEOUT = float(os.getenv("ESPECIALIDAD_CLIENT_READ_TIMEOUT", 3.0))
+    ESPECIALIDAD_CLIENT_POOL_SIZE = 10
+    ESPECIALIDAD_CLIENT_WORKERS = 8
+    ESPECIALIDAD_CLIENT_CACHE_TTL = int(os.getenv("ESPECIALIDAD_CLIENT_CACHE_TTL", 60))
+    ESPECIALIDAD_CLIENT_CACHE_MAXSIZE = 1024
+    ESPECIALIDAD_CLIENT_BREAKER_FALLAS = 5
+    ESPECIALIDAD_CLIENT_BREAKER_SONDEO = 5.0
+    # URL que sondea el breaker abierto; sin ella sondea /<id> del último id pedido.
+    ESPECIALIDAD_SERVICE_HEALTH_URL = os.getenv("ESPECIALIDAD_SERVICE_HEALTH_URL")
+    # Modo ASGI (app/asgi.py): hilos del adaptador WSGI que atiende lo que
+    # no corre en el event loop (escrituras, expand, exportaciones...).
+    ASGI_WSGI_THREADS = int(os.getenv("ASGI_WSGI_THREADS", 10))
+    # Las vistas cacheadas se invalidan por tag en cada escritura, así que
+    # pueden vivir horas.
+    VIEW_CACHE_TIMEOUT = int(os.getenv("VIEW_CACHE_TIMEOUT", 6 * 3600))
+    # Cache de entidades usado por los repositorios (app/caching)
+    ENTITY_CACHE_BACKEND = os.getenv("ENTITY_CACHE_BACKEND", "redis")
+    ENTITY_CACHE_SERIALIZER = os.getenv("ENTITY_CACHE_SERIALIZER", "json")
+    ENTITY_CACHE_PREFIX = "gestion"
+    ENTITY_CACHE_DEFAULT_TTL = 300
+    ENTITY_CACHE_TTL = {
+        "universidad": 600,
+        "facultad": 300,
+        "especialidad": 300,
+    }
+    # Nivel LRU por worker delante de Redis (0 lo desactiva); las entradas se
+    # invalidan en todos los workers vía pub/sub.
+    ENTITY_CACHE_LOCAL_MAXSIZE = int(os.getenv("ENTITY_CACHE_LOCAL_MAXSIZE", 2048))
+    ENTITY_CACHE_LOCAL_TTL = 30
+    ENTITY_CACHE_INVALIDATION_CHANNEL = "gestion:invalidaciones"
+    # Single-flight: una sola request por clave recalcula ante un miss; el
+    # resto espera (sondeando cada LOCK_POLL s, hasta LOCK_WAIT s) a que se llene.
+    ENTITY_CACHE_SINGLE_FLIGHT = True
+    ENTITY_CACHE_LOCK_TTL = 5
+    ENTITY_CACHE_LOCK_WAIT = 2
+    ENTITY_CACHE_LOCK_POLL = 0.02
+    # Conteos de listados: exactos cacheados (se invalidan con la generación
+    # de la tabla) y, con X-count: estimated, estimación del planner por
+    # encima del umbral.
+    COUNT_CACHE_TTL = 300
+    # Documentos pre-serializados (p. ej. el árbol de una universidad); se
+    # invalidan explícitamente cuando cambia alguno de sus miembros.
+    ENTITY_CACHE_DOCUMENT_TTL = 3600
+    COUNT_ESTIMATE_THRESHOLD = 100_000
+    # En modo estricto X-filters sólo acepta filtros que usan un índice
+    # (ver app/filters/compiler.py: FILTROS_INDEXADOS).
+    FILTERS_STRICT = False
+    # Entidades con índice de autocompletado (nombre y sigla) en memoria de cada worker.
+    AUTOCOMPLETE_ENTIDADES = ("universidad", "facultad")
+    # Exportaciones streaming: filas por lote del cursor y por trozo de la respuesta.
+    EXPORT_BATCH_SIZE = 1000
+    # Importaciones masivas: filas validadas e insertadas por lote (un commit
+    # cada uno) y máximo de filas rechazadas detalladas en el resumen.
+    IMPORT_BATCH_SIZE = 1000
+    IMPORT_MAX_ERRORS = 1000
+    # Máximo de elementos por request en los endpoints /_bulk (una transacción).
+    BULK_MAX_ITEMS = 1000
+    # Máximo de ids por multi-get (GET /<entidad>?ids=1,2,3).
+    MULTIGET_MAX_IDS = 100
+    # Réplicas de lectura para las requests GET (URIs separadas por coma). Se
+    # saltea una réplica atrasada más de REPLICA_MAX_LAG segundos; el atraso
+    # se vuelve a medir cada REPLICA_LAG_CHECK_INTERVAL segundos.
+    READ_REPLICA_URIS = [uri.strip() for uri in os.getenv("READ_REPLICA_URIS", "").split(",") if uri.strip()]
+    REPLICA_MAX_LAG = float(os.getenv("REPLICA_MAX_LAG", 2.0))
+    REPLICA_LAG_CHECK_INTERVAL = 5.0
 
     @staticmethod
     def init_app(app) -> None:
@@ -27,18 +142,27 @@ class TestConfig(Config):
     DEBUG = True
     SQLALCHEMY_TRACK_MODIFICATIONS = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    # SQLite en memoria usa un StaticPool (una sola conexión): sin opciones de pool.
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    CACHE_TYPE = "SimpleCache"
+    ENTITY_CACHE_BACKEND = "memory"
+    READ_REPLICA_URIS = []
     
 class DevelopmentConfig(Config):
     TESTING = True
     DEBUG = True
     SQLALCHEMY_TRACK_MODIFICATIONS = True
     SQLALCHEMY_DATABASE_URI = os.environ.get('DEV_DATABASE_URI')
+    SQLALCHEMY_ENGINE_OPTIONS = opciones_pool(pool_size=5, max_overflow=5)
         
 class ProductionConfig(Config):
     DEBUG = False
     TESTING = False
     SQLALCHEMY_RECORD_QUERIES = False
     SQLALCHEMY_DATABASE_URI = os.environ.get('PROD_DATABASE_URI')
+    # Falla rápido ante un pool saturado en lugar de encolar requests 30 s.
+    SQLALCHEMY_ENGINE_OPTIONS = opciones_pool(pool_size=10, max_overflow=10, pool_timeout=10, pool_recycle=1800)
+    FILTERS_STRICT = True
     
     @classmethod
     def init_app(cls, app):
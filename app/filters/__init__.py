@@ -0,0 +1 @@
+from .compiler import compilar_filtros, FiltroInvalido, FILTROS_INDEXADOS, OPERACIONES
@@ -0,0 +1,166 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import String, inspect
+from sqlalchemy_filters.filters import Operator
+
+OPERACIONES = ("eq", "in", "prefix", "range", "ilike")
+MAX_VALORES_IN = 500
+
+# Columnas indexadas de cada entidad y las operaciones que pueden usar ese
+# índice. En modo estricto (producción) sólo se aceptan estos filtros.
+# 'ilike' (contiene) sólo es indexable con un índice trigram.
+FILTROS_INDEXADOS = {
+    "universidad": {
+        "id": {"eq", "in", "range"},
+        # prefix: ix_universidades_{nombre,sigla}_prefijo (varchar_pattern_ops, 0004)
+        "nombre": {"eq", "in", "prefix"},
+        "sigla": {"eq", "in", "prefix"},
+        "tipo": {"eq", "in"},
+    },
+    "facultad": {
+        "id": {"eq", "in", "range"},
+        "universidad_id": {"eq", "in"},
+        "nombre": {"eq", "in", "prefix"},
+        "sigla": {"eq", "in", "prefix"},
+    },
+    "especialidad": {
+        "id": {"eq", "in", "range"},
+        "facultad_id": {"eq", "in"},
+        # ix_especialidades_nombre_trgm (GIN pg_trgm) resuelve el ILIKE
+        "nombre": {"eq", "in", "prefix", "ilike"},
+        "letra": {"eq", "in"},
+    },
+}
+
+# Operación de `{"campo": valor}` (formato histórico de X-filters) sobre
+# columnas de texto; las demás columnas comparan por igualdad.
+OPERACION_POR_DEFECTO = {
+    "universidad": "eq",
+    "facultad": "eq",
+    "especialidad": "ilike",
+}
+
+
+# Los comodines (% y _) del valor se buscan literalmente: se escapan con
+# ESCAPE y se filtra con variantes de like/ilike que declaran ese escape
+# (sqlalchemy-filters no permite pasarlo a sus operadores).
+ESCAPE = "\\"
+Operator.OPERATORS.setdefault("like_escapado", lambda f, a: f.like(a, escape=ESCAPE))
+Operator.OPERATORS.setdefault("ilike_escapado", lambda f, a: f.ilike(a, escape=ESCAPE))
+
+
+class FiltroInvalido(ValueError):
+    pass
+
+
+def compilar_filtros(model, filtros: Dict[str, Any], estricto: bool = False) -> List[dict]:
+    """
+    Compila el JSON de X-filters al formato de sqlalchemy-filters.
+
+    Cada campo acepta un valor (operación por defecto de la entidad) o un
+    objeto con operaciones:
+        {"nombre": {"prefix": "Ing"}, "id": {"in": [1, 2]},
+         "facultad_id": 3, "id": {"range": [10, null]}}
+
+    La validación (columna existente, operación permitida, índice en modo
+    estricto) depende sólo de la forma del filtro (campos y operaciones),
+    así que se resuelve una vez por forma y se cachea.
+    """
+    if not filtros:
+        return []
+    if not isinstance(filtros, dict):
+        raise FiltroInvalido("X-filters debe ser un objeto JSON")
+
+    entidad = model.__name__.lower()
+    condiciones = []
+    for campo, valor in filtros.items():
+        if isinstance(valor, dict):
+            if not valor:
+                raise FiltroInvalido(f"Filtro vacío para '{campo}'")
+            condiciones.extend((campo, op, operando) for op, operando in valor.items())
+        elif campo in _columnas_texto(model):
+            condiciones.append((campo, OPERACION_POR_DEFECTO.get(entidad, "eq"), valor))
+        else:
+            condiciones.append((campo, "eq", valor))
+
+    forma = tuple(sorted((campo, op) for campo, op, _ in condiciones))
+    _plan(model, forma, estricto)
+
+    compilados = []
+    for campo, op, operando in condiciones:
+        compilados.extend(_COMPILADORES[op](campo, operando))
+    return compilados
+
+
+@lru_cache(maxsize=None)
+def _columnas_texto(model) -> frozenset:
+    return frozenset(col.key for col in inspect(model).columns if isinstance(col.type, String))
+
+
+@lru_cache(maxsize=256)
+def _plan(model, forma: Tuple[Tuple[str, str], ...], estricto: bool) -> Tuple[Tuple[str, str], ...]:
+    entidad = model.__name__.lower()
+    columnas = {attr.key for attr in inspect(model).column_attrs}
+    indexados = FILTROS_INDEXADOS.get(entidad, {})
+    for campo, op in forma:
+        if op not in OPERACIONES:
+            raise FiltroInvalido(f"Operación '{op}' no soportada; usar una de {', '.join(OPERACIONES)}")
+        if campo not in columnas:
+            raise FiltroInvalido(f"Campo '{campo}' inexistente en {entidad}")
+        if estricto and op not in indexados.get(campo, ()):
+            raise FiltroInvalido(f"Filtro no indexado: {entidad}.{campo} ({op})")
+    return forma
+
+
+def _escalar(campo: str, valor):
+    if valor is None or isinstance(valor, (dict, list)):
+        raise FiltroInvalido(f"Valor inválido para '{campo}'")
+    return valor
+
+
+def _texto(campo: str, valor) -> str:
+    if not isinstance(valor, str) or not valor:
+        raise FiltroInvalido(f"'{campo}' espera un texto")
+    return valor.replace(ESCAPE, ESCAPE * 2).replace("%", ESCAPE + "%").replace("_", ESCAPE + "_")
+
+
+def _eq(campo, valor):
+    return [{"field": campo, "op": "==", "value": _escalar(campo, valor)}]
+
+
+def _in(campo, valores):
+    if not isinstance(valores, list) or not valores:
+        raise FiltroInvalido(f"'in' de '{campo}' espera una lista no vacía")
+    if len(valores) > MAX_VALORES_IN:
+        raise FiltroInvalido(f"'in' de '{campo}' admite hasta {MAX_VALORES_IN} valores")
+    return [{"field": campo, "op": "in", "value": [_escalar(campo, v) for v in valores]}]
+
+
+def _prefix(campo, valor):
+    return [{"field": campo, "op": "like_escapado", "value": f"{_texto(campo, valor)}%"}]
+
+
+def _range(campo, limites):
+    if not isinstance(limites, list) or len(limites) != 2 or limites == [None, None]:
+        raise FiltroInvalido(f"'range' de '{campo}' espera [desde, hasta] (null para abierto)")
+    desde, hasta = limites
+    filtros = []
+    if desde is not None:
+        filtros.append({"field": campo, "op": ">=", "value": _escalar(campo, desde)})
+    if hasta is not None:
+        filtros.append({"field": campo, "op": "<=", "value": _escalar(campo, hasta)})
+    return filtros
+
+
+def _ilike(campo, valor):
+    return [{"field": campo, "op": "ilike_escapado", "value": f"%{_texto(campo, valor)}%"}]
+
+
+_COMPILADORES = {
+    "eq": _eq,
+    "in": _in,
+    "prefix": _prefix,
+    "range": _range,
+    "ilike": _ilike,
+}
@@ -1,3 +1,4 @@
 from .universidad_mapping import UniversidadMapping
 from .facultad_mapping import FacultadMapping
-from .especialidad_mapping import EspecialidadMapping
\ No newline at end of file
+from .especialidad_mapping import EspecialidadMapping
+from .fieldsets import campos_pedidos, columnas, esquema
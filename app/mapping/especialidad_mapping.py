@@ -1,13 +1,16 @@
-from marshmallow import Schema, fields, post_load, validate
+from marshmallow import fields, post_load, validate
 from markupsafe import escape
 from app.models.especialidad import Especialidad
+from .fieldsets import SchemaConRelaciones
 
-class EspecialidadMapping(Schema):
+class EspecialidadMapping(SchemaConRelaciones):
     id = fields.Int(dump_only=True)
     nombre = fields.Str(required=True, validate=validate.Length(min=1, max=100))
     letra = fields.Str(required=True, validate=validate.Length(min=1, max=100))
     observacion = fields.Str(required=True, validate=validate.Length(min=1, max=100))
     facultad_id = fields.Int(required=True)
+    # Sólo con expand=facultad (y facultad.universidad); sin la referencia de vuelta
+    facultad = fields.Nested("FacultadMapping", dump_only=True, exclude=("especialidades",))
 
     @post_load
     def nueva_especialidad(self, data, **kwargs):
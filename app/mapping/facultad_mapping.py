@@ -1,9 +1,10 @@
-from marshmallow import Schema, fields, post_load, validate 
+from marshmallow import fields, post_load, validate 
 from app.models.facultad import Facultad
 from markupsafe import escape
+from .fieldsets import SchemaConRelaciones
 
 
-class FacultadMapping(Schema):
+class FacultadMapping(SchemaConRelaciones):
     id = fields.Int(dump_only=True)
     nombre = fields.String(required=True, validate = validate.Length(min=1, max=100)) #max de la base de datos
     sigla = fields.String(required=True, validate = validate.Length(min=1, max=10))
@@ -17,6 +18,9 @@ class FacultadMapping(Schema):
     directorio = fields.String(required=True, validate = validate.Length(min=1, max=100)) 
 
     universidad_id = fields.Integer(required=True)
+    # Sólo con expand=universidad / expand=especialidades; sin la referencia de vuelta
+    universidad = fields.Nested("UniversidadMapping", dump_only=True, exclude=("facultades",))
+    especialidades = fields.Nested("EspecialidadMapping", many=True, dump_only=True, exclude=("facultad",))
     
     @post_load
     def nueva_facultad(self, data, **kwargs):
@@ -0,0 +1,74 @@
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from marshmallow import Schema, class_registry, fields
+
+# Siempre se devuelve: identifica el recurso y el modo cursor lo necesita.
+CAMPOS_FIJOS = ("id",)
+
+
+def _anidados(schema_cls) -> dict:
+    return {nombre: campo for nombre, campo in schema_cls._declared_fields.items()
+            if isinstance(campo, fields.Nested)}
+
+
+class SchemaConRelaciones(Schema):
+    """
+    Schema cuyas relaciones (Nested) no se serializan por defecto: sin un
+    `exclude` explícito quedan excluidas y sólo `esquema(..., expand)` las
+    incluye. Así `UniversidadMapping().dump(u)` devuelve sólo columnas, sin
+    lazy loads ni recorrer el grafo de relaciones.
+    """
+
+    def __init__(self, *args, exclude=None, **kwargs):
+        if exclude is None:
+            exclude = tuple(_anidados(type(self)))
+        super().__init__(*args, exclude=exclude, **kwargs)
+
+
+def campos_pedidos(schema_cls, valor: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Interpreta `fields=` / X-fields ("id,nombre,sigla"). Devuelve None si no
+    se pidió un subconjunto, o la tupla ordenada de campos (con `id`).
+    Lanza ValueError ante un campo que el schema no expone como columna
+    (las relaciones se piden con expand=).
+    """
+    if valor is None or not valor.strip():
+        return None
+    pedidos = {campo.strip() for campo in valor.split(",") if campo.strip()}
+    desconocidos = pedidos - (set(schema_cls._declared_fields) - set(_anidados(schema_cls)))
+    if desconocidos:
+        raise ValueError(f"Campos desconocidos en fields: {', '.join(sorted(desconocidos))}")
+    return tuple(sorted(pedidos | set(CAMPOS_FIJOS)))
+
+
+def columnas(schema_cls, campos: Optional[Tuple[str, ...]] = None) -> List[str]:
+    """Campos escalares del schema en orden de declaración, restringidos a `campos` si se pidieron."""
+    anidados = _anidados(schema_cls)
+    return [nombre for nombre in schema_cls._declared_fields
+            if nombre not in anidados and (campos is None or nombre in campos)]
+
+
+def _excluidos(schema_cls, expand: Tuple[str, ...], prefijo: str = "") -> List[str]:
+    # Relaciones no expandidas, en cualquier nivel: no se serializan (ni disparan lazy loads).
+    excluidos = []
+    for nombre, campo in _anidados(schema_cls).items():
+        ruta = prefijo + nombre
+        if ruta not in expand:
+            excluidos.append(ruta)
+            continue
+        hijo = class_registry.get_class(campo.nested) if isinstance(campo.nested, str) else campo.nested
+        excluidos += _excluidos(hijo, expand, ruta + ".")
+    return excluidos
+
+
+@lru_cache(maxsize=128)
+def esquema(schema_cls, campos: Optional[Tuple[str, ...]] = None, expand: Tuple[str, ...] = ()):
+    """
+    Instancia del schema restringida a `campos` y con las relaciones de
+    `expand` anidadas (cacheada: construir un Schema no es gratis).
+    """
+    only = None
+    if campos:
+        only = tuple(campos) + tuple(ruta for ruta in expand if "." not in ruta)
+    return schema_cls(only=only, exclude=_excluidos(schema_cls, expand))
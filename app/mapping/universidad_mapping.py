@@ -1,13 +1,16 @@
-from marshmallow import Schema, fields, post_load, validate 
+from marshmallow import fields, post_load, validate 
 from app.models.universidad import Universidad
 from markupsafe import escape
+from .fieldsets import SchemaConRelaciones
 
 
-class UniversidadMapping(Schema):
+class UniversidadMapping(SchemaConRelaciones):
     id = fields.Int(dump_only=True)
     nombre = fields.String(required=True, validate = validate.Length(min=1, max=100)) #max de la base de datos
     sigla = fields.String(required=True, validate = validate.Length(min=1, max=10))
     tipo = fields.Str(required=True) 
+    # Sólo con expand=facultades (ver app/repositories/expansion.py); sin la referencia de vuelta
+    facultades = fields.Nested("FacultadMapping", many=True, dump_only=True, exclude=("universidad",))
 
     @post_load
     def nueva_universidad(self, data, **kwargs):
@@ -0,0 +1,2 @@
+from .registro import Registro, Contador, Gauge, Histograma, CONTENT_TYPE
+from .pool import QueuePoolMedido, instrumentar_pool
@@ -0,0 +1,96 @@
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+# Espera hasta obtener una conexión: de sub-milisegundo (había una libre) a
+# pool_timeout (pool saturado).
+BUCKETS_ESPERA = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class QueuePoolMedido(QueuePool):
+    """
+    QueuePool que informa cuánto esperó cada pedido de conexión, incluidos
+    los que vencieron por pool_timeout, a `al_esperar(segundos, timeout)`
+    (lo fija `instrumentar_pool`; se conserva al recrear el pool).
+    """
+
+    al_esperar = None
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        timeout = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timeout = True
+            raise
+        finally:
+            if self.al_esperar is not None:
+                self.al_esperar(time.perf_counter() - inicio, timeout)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.al_esperar = self.al_esperar
+        return pool
+
+
+def _pool_stat(engine, metodo: str):
+    # StaticPool / SingletonThreadPool (SQLite en memoria) no llevan estas cuentas.
+    def leer():
+        funcion = getattr(engine.pool, metodo, None)
+        return float(funcion()) if callable(funcion) else None
+    return leer
+
+
+def instrumentar_pool(engine, bind: str, registro) -> None:
+    """
+    Exporta el estado del pool de `engine` con la etiqueta bind=<nombre>:
+    conexiones en uso, libres, overflow y capacidad (gauges leídos al
+    exportar), checkouts y conexiones abiertas/invalidadas (contadores) y la
+    espera por conexión y los timeouts (con QueuePoolMedido). Los listeners
+    van sobre el engine, así sobreviven a `engine.dispose()`.
+    """
+    en_uso = registro.gauge("db_pool_checked_out", "Conexiones prestadas por el pool")
+    libres = registro.gauge("db_pool_checked_in", "Conexiones libres en el pool")
+    overflow = registro.gauge("db_pool_overflow", "Conexiones abiertas por encima de pool_size (negativo: sin abrir)")
+    tamanio = registro.gauge("db_pool_size", "pool_size configurado")
+    capacidad = registro.gauge("db_pool_max_connections", "Conexiones máximas del pool (pool_size + max_overflow)")
+    checkouts = registro.contador("db_pool_checkouts_total", "Conexiones entregadas por el pool")
+    abiertas = registro.contador("db_pool_connections_opened_total", "Conexiones nuevas abiertas contra la base")
+    invalidadas = registro.contador("db_pool_connections_invalidated_total", "Conexiones descartadas (errores, pre-ping)")
+    espera = registro.histograma("db_pool_wait_seconds", "Espera hasta obtener una conexión del pool",
+                                 buckets=BUCKETS_ESPERA)
+    timeouts = registro.contador("db_pool_timeouts_total", "Pedidos de conexión que vencieron por pool_timeout")
+
+    en_uso.callback(_pool_stat(engine, "checkedout"), bind=bind)
+    libres.callback(_pool_stat(engine, "checkedin"), bind=bind)
+    overflow.callback(_pool_stat(engine, "overflow"), bind=bind)
+    tamanio.callback(_pool_stat(engine, "size"), bind=bind)
+
+    def maximo():
+        pool = engine.pool
+        if not isinstance(pool, QueuePool):
+            return None
+        # max_overflow = -1: sin límite
+        return float(pool.size() + pool._max_overflow) if pool._max_overflow >= 0 else float("inf")
+    capacidad.callback(maximo, bind=bind)
+
+    def al_esperar(segundos: float, timeout: bool) -> None:
+        espera.observar(segundos, bind=bind)
+        if timeout:
+            timeouts.inc(bind=bind)
+    if isinstance(engine.pool, QueuePoolMedido):
+        engine.pool.al_esperar = al_esperar
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        checkouts.inc(bind=bind)
+
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        abiertas.inc(bind=bind)
+
+    @event.listens_for(engine, "invalidate")
+    def _invalidate(dbapi_connection, connection_record, exception):
+        invalidadas.inc(bind=bind)
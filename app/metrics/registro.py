@@ -0,0 +1,183 @@
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, generate_latest
+from prometheus_client import Counter as _Counter, Gauge as _Gauge, Histogram as _Histogram
+from prometheus_client.multiprocess import MultiProcessCollector
+
+# Formato de exposición de texto de Prometheus.
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+Etiquetas = Tuple[Tuple[str, str], ...]
+
+
+def _etiquetas(etiquetas: Dict[str, str]) -> Etiquetas:
+    return tuple(sorted((clave, str(valor)) for clave, valor in etiquetas.items()))
+
+
+class _Metrica:
+    """
+    Envuelve una métrica de prometheus_client. Las etiquetas se pasan en cada
+    llamada; los nombres se fijan con la primera (prometheus_client los pide
+    al crear la métrica) y las siguientes tienen que usar los mismos.
+    """
+
+    def __init__(self, nombre: str, ayuda: str, registry: CollectorRegistry, **opciones):
+        self.nombre, self.ayuda = nombre, ayuda
+        self._registry = registry
+        self._opciones = opciones
+        self._metrica = None
+        self._lock = threading.Lock()
+
+    def _serie(self, etiquetas: Dict[str, str]):
+        if self._metrica is None:
+            with self._lock:
+                if self._metrica is None:
+                    self._metrica = self.clase(self.nombre, self.ayuda, sorted(etiquetas),
+                                               registry=self._registry, **self._opciones)
+        return self._metrica.labels(**etiquetas) if etiquetas else self._metrica
+
+    def _muestra(self, sufijo: str, etiquetas: Dict[str, str]) -> Optional[float]:
+        return self._registry.get_sample_value(self.nombre + sufijo, {k: str(v) for k, v in etiquetas.items()})
+
+
+class Contador(_Metrica):
+    clase = _Counter
+
+    def inc(self, valor: float = 1, **etiquetas) -> None:
+        self._serie(etiquetas).inc(valor)
+
+    def valor(self, **etiquetas) -> float:
+        sufijo = "" if self.nombre.endswith("_total") else "_total"
+        return self._muestra(sufijo, etiquetas) or 0
+
+
+class Gauge(_Metrica):
+    """
+    Valor instantáneo: fijado con `set` o calculado con `callback`. Los
+    callbacks se evalúan en `Registro.refrescar` (al exportar y, en modo
+    multiproceso, periódicamente en cada worker), que guarda su valor.
+    """
+    clase = _Gauge
+
+    def __init__(self, nombre: str, ayuda: str, registry: CollectorRegistry, agregacion: str = "livesum"):
+        # multiprocess_mode: cómo se combinan los valores de los workers en un scrape
+        super().__init__(nombre, ayuda, registry, multiprocess_mode=agregacion)
+        self._callbacks: Dict[Etiquetas, Callable[[], Optional[float]]] = {}
+
+    def set(self, valor: float, **etiquetas) -> None:
+        self._serie(etiquetas).set(valor)
+
+    def callback(self, funcion: Callable[[], Optional[float]], **etiquetas) -> None:
+        with self._lock:
+            self._callbacks[_etiquetas(etiquetas)] = funcion
+
+    def valor(self, **etiquetas) -> Optional[float]:
+        funcion = self._callbacks.get(_etiquetas(etiquetas))
+        if funcion is not None:
+            return funcion()
+        return self._muestra("", etiquetas)
+
+    def refrescar(self) -> None:
+        with self._lock:
+            callbacks = dict(self._callbacks)
+        for clave, funcion in callbacks.items():
+            valor = funcion()
+            if valor is not None:
+                self.set(valor, **dict(clave))
+
+
+class Histograma(_Metrica):
+    clase = _Histogram
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, nombre: str, ayuda: str, registry: CollectorRegistry, buckets: Optional[Iterable[float]] = None):
+        super().__init__(nombre, ayuda, registry, buckets=tuple(sorted(buckets or self.BUCKETS)))
+
+    def observar(self, valor: float, **etiquetas) -> None:
+        self._serie(etiquetas).observe(valor)
+
+    def total(self, **etiquetas) -> int:
+        return int(self._muestra("_count", etiquetas) or 0)
+
+
+class Registro:
+    """
+    Métricas de la app (contadores, gauges e histogramas) sobre
+    prometheus_client, exportadas en formato de texto por GET /api/v1/metrics.
+
+    Con la variable de entorno PROMETHEUS_MULTIPROC_DIR (modo multiproceso
+    de prometheus_client; tiene que estar definida antes de arrancar los
+    workers) cada worker de gunicorn escribe sus valores en archivos de ese
+    directorio y `exportar` los combina con MultiProcessCollector: el worker
+    que atiende el scrape devuelve los totales de toda la instancia. Los
+    contadores e histogramas se suman; cada gauge se combina según su
+    `agregacion` (livesum: suma de los workers vivos, livemax: el máximo).
+    gunicorn.conf.py vacía el directorio al arrancar y da de baja los
+    gauges de cada worker que termina.
+    """
+
+    def __init__(self, directorio: Optional[str] = None):
+        self.directorio = directorio if directorio is not None else os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+        self.intervalo = 5.0
+        self.registry = CollectorRegistry()
+        self._metricas: Dict[str, _Metrica] = {}
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def init_app(self, app) -> None:
+        self.intervalo = app.config.get("METRICS_REFRESH_INTERVAL", 5.0)
+        app.before_request(self.asegurar_refresco)
+
+    def _obtener(self, cls, nombre: str, ayuda: str, **kwargs):
+        with self._lock:
+            metrica = self._metricas.get(nombre)
+            if metrica is None:
+                metrica = self._metricas[nombre] = cls(nombre, ayuda, self.registry, **kwargs)
+            elif not isinstance(metrica, cls):
+                raise ValueError(f"La métrica {nombre} ya existe con otro tipo")
+            return metrica
+
+    def contador(self, nombre: str, ayuda: str) -> Contador:
+        return self._obtener(Contador, nombre, ayuda)
+
+    def gauge(self, nombre: str, ayuda: str, agregacion: str = "livesum") -> Gauge:
+        return self._obtener(Gauge, nombre, ayuda, agregacion=agregacion)
+
+    def histograma(self, nombre: str, ayuda: str, buckets: Optional[Iterable[float]] = None) -> Histograma:
+        return self._obtener(Histograma, nombre, ayuda, buckets=buckets)
+
+    def refrescar(self) -> None:
+        """Guarda el valor actual de los gauges con callback."""
+        for metrica in list(self._metricas.values()):
+            if isinstance(metrica, Gauge):
+                metrica.refrescar()
+
+    def asegurar_refresco(self) -> None:
+        """
+        En modo multiproceso, arranca (una vez por proceso) el hilo que
+        refresca los gauges de este worker cada `intervalo` segundos: el
+        scrape lo atiende otro worker, que no puede evaluar estos callbacks.
+        """
+        if not self.directorio or self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+        threading.Thread(target=self._refrescar_siempre, name="metricas", daemon=True).start()
+
+    def _refrescar_siempre(self) -> None:
+        while True:
+            self.refrescar()
+            time.sleep(self.intervalo)
+
+    def exportar(self) -> str:
+        self.refrescar()
+        registry = self.registry
+        if self.directorio:
+            registry = CollectorRegistry()
+            MultiProcessCollector(registry, path=self.directorio)
+        return generate_latest(registry).decode("utf-8")
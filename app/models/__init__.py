@@ -1,4 +1,5 @@
 from .universidad import Universidad
 from .facultad import Facultad
 from .especialidad import Especialidad
-
+from .busqueda import TABLA_BUSQUEDA, ENTIDADES_BUSQUEDA
+from .indices import es_de_otro_motor
@@ -0,0 +1,39 @@
+from sqlalchemy import DDL, event
+from app import db
+
+# Índice de texto compartido por universidades, facultades y especialidades.
+# No es un modelo: en SQLite es una tabla virtual FTS5 y en PostgreSQL una
+# tabla con un tsvector indexado con GIN, así que se crea con DDL propio
+# junto con el resto del esquema (db.create_all) y en la migración 0003.
+TABLA_BUSQUEDA = 'busqueda'
+
+# Orden fijo de las entidades: en SQLite el rowid de un documento es
+# id * len(ENTIDADES_BUSQUEDA) + posición, así altas, bajas y cambios van
+# por la clave primaria de la tabla FTS en lugar de recorrerla.
+ENTIDADES_BUSQUEDA = ('universidad', 'facultad', 'especialidad')
+
+# PostgreSQL: minúsculas y sin acentos antes de armar el tsvector (la
+# configuración 'simple' no quita acentos; FTS5 lo hace con remove_diacritics).
+# Congelado: la migración 0003 arma los documentos con estos valores y las
+# consultas tienen que normalizar igual; cambiarlos exige una migración que
+# reconstruya la tabla de búsqueda.
+ACENTOS = 'áéíóúüàèìòùâêîôûñç'
+SIN_ACENTOS = 'aeiouuaeiouaeiounc'
+
+_DDL_SQLITE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS busqueda USING fts5("
+    "entidad UNINDEXED, entidad_id UNINDEXED, nombre, sigla, detalle, "
+    "tokenize = 'unicode61 remove_diacritics 2')"
+)
+_DDL_POSTGRESQL = (
+    "CREATE TABLE IF NOT EXISTS busqueda ("
+    "entidad varchar(20) NOT NULL, entidad_id integer NOT NULL, "
+    "nombre varchar(100) NOT NULL, sigla varchar(100), documento tsvector NOT NULL, "
+    "PRIMARY KEY (entidad, entidad_id))",
+    "CREATE INDEX IF NOT EXISTS ix_busqueda_documento ON busqueda USING gin (documento)",
+)
+
+event.listen(db.metadata, 'after_create', DDL(_DDL_SQLITE).execute_if(dialect='sqlite'))
+for _sentencia in _DDL_POSTGRESQL:
+    event.listen(db.metadata, 'after_create', DDL(_sentencia).execute_if(dialect='postgresql'))
+event.listen(db.metadata, 'before_drop', DDL('DROP TABLE IF EXISTS busqueda'))
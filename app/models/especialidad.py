@@ -1,13 +1,25 @@
 from dataclasses import dataclass
+from sqlalchemy import DDL, event
 from app import db
 
 @dataclass(init=False, repr=True, eq=True)
 class Especialidad(db.Model): 
     __tablename__ = 'especialidades'
+    __table_args__ = (
+        # varchar_pattern_ops: en PostgreSQL el índice sirve también para LIKE 'prefijo%'
+        db.Index('ix_especialidades_nombre', 'nombre', postgresql_ops={'nombre': 'varchar_pattern_ops'}),
+        # Trigram para el filtro ILIKE '%texto%' (sólo PostgreSQL, requiere pg_trgm)
+        db.Index('ix_especialidades_nombre_trgm', 'nombre', postgresql_using='gin',
+                 postgresql_ops={'nombre': 'gin_trgm_ops'}, info={'motor': 'postgresql'}).ddl_if(dialect='postgresql'),
+    )
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     nombre = db.Column(db.String(100), nullable=False)
-    letra = db.Column(db.String(100), nullable=False)
+    letra = db.Column(db.String(100), nullable=False, index=True)
     observacion = db.Column(db.String(100), nullable=False)
-    facultad_id = db.Column(db.Integer, db.ForeignKey('facultades.id'))
+    facultad_id = db.Column(db.Integer, db.ForeignKey('facultades.id'), index=True)
     facultad = db.relationship('Facultad', back_populates = 'especialidades')
 
+
+# El índice trigram necesita la extensión pg_trgm (en las migraciones la crea 0002)
+event.listen(Especialidad.__table__, 'before_create',
+             DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql'))
@@ -5,6 +5,11 @@ from app import db
 @dataclass(init=False, repr=True, eq=True)
 class Facultad(db.Model):
   __tablename__ = 'facultades'
+  # varchar_pattern_ops: en PostgreSQL el índice sirve también para LIKE 'prefijo%'
+  __table_args__ = (
+      db.Index('ix_facultades_nombre', 'nombre', postgresql_ops={'nombre': 'varchar_pattern_ops'}),
+      db.Index('ix_facultades_sigla', 'sigla', postgresql_ops={'sigla': 'varchar_pattern_ops'}),
+  )
   id : int = db.Column(db.Integer, primary_key=True, autoincrement=True)
   nombre: str = db.Column(db.String(100), nullable=False)
   abreviatura: str = db.Column(db.String(100), nullable=False)
@@ -18,7 +23,7 @@ class Facultad(db.Model):
   email: str = db.Column(db.String(100), nullable=False)
 
  
-  universidad_id = db.Column(db.Integer, db.ForeignKey('universidades.id'))
+  universidad_id = db.Column(db.Integer, db.ForeignKey('universidades.id'), index=True)
   universidad = db.relationship("Universidad", back_populates="facultades") 
 
   especialidades = db.relationship("Especialidad", back_populates="facultad")
\ No newline at end of file
@@ -0,0 +1,9 @@
+def es_de_otro_motor(objeto, dialecto: str) -> bool:
+    """
+    True si `objeto` es un índice propio de otro motor, marcado con
+    info={'motor': ...} distinto de `dialecto`. Esos índices se crean con
+    .ddl_if(dialect=...) y las migraciones no deben compararlos en los
+    demás motores.
+    """
+    motor = getattr(objeto, 'info', {}).get('motor')
+    return motor is not None and motor != dialecto
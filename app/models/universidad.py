@@ -4,9 +4,17 @@ from app import db
 @dataclass(init=False, repr=True, eq=True)
 class Universidad(db.Model):
     __tablename__ = 'universidades'
+    __table_args__ = (
+        # Los índices únicos usan la collation de la base y no sirven para
+        # LIKE 'prefijo%'; en PostgreSQL se agrega uno con varchar_pattern_ops.
+        db.Index('ix_universidades_nombre_prefijo', 'nombre', postgresql_ops={'nombre': 'varchar_pattern_ops'},
+                 info={'motor': 'postgresql'}).ddl_if(dialect='postgresql'),
+        db.Index('ix_universidades_sigla_prefijo', 'sigla', postgresql_ops={'sigla': 'varchar_pattern_ops'},
+                 info={'motor': 'postgresql'}).ddl_if(dialect='postgresql'),
+    )
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     nombre = db.Column(db.String(100), nullable=False, unique=True)
     sigla = db.Column(db.String(100), nullable=False, unique=True)
-    tipo = db.Column(db.String(20), nullable=False)
+    tipo = db.Column(db.String(20), nullable=False, index=True)
     facultades = db.relationship("Facultad", back_populates="universidad")
     
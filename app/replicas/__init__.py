@@ -0,0 +1,2 @@
+from .router import ReplicaRouter, CONSISTENCIA_HEADER, RYW_COOKIE
+from .session import RoutingSession
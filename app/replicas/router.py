@@ -0,0 +1,181 @@
+import itertools
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from flask import g, has_request_context, request
+from sqlalchemy import text
+
+# Fuerza el primario en una lectura (p. ej. justo después de escribir desde otro servicio).
+CONSISTENCIA_HEADER = "X-Consistency"
+# Cookie que deja el router tras una escritura: las lecturas del mismo cliente
+# van al primario hasta el instante que indica (read-your-writes entre requests).
+RYW_COOKIE = "primario_hasta"
+
+METODOS_LECTURA = ("GET", "HEAD", "OPTIONS")
+
+_LAG_POSTGRESQL = text(
+    "SELECT CASE WHEN pg_is_in_recovery() "
+    "THEN COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) ELSE 0 END")
+
+
+class ReplicaRouter:
+    """
+    Reparte las lecturas de las requests GET entre las réplicas
+    configuradas (binds `replica_<n>` de SQLALCHEMY_BINDS, ver
+    READ_REPLICA_URIS) en round-robin, salteando las que están atrasadas
+    más de REPLICA_MAX_LAG segundos o no responden. Sin réplicas sanas,
+    la request lee del primario.
+
+    Una lectura va al primario, aunque haya réplicas, si:
+    - la request escribió algo (RoutingSession lo marca);
+    - trae `X-Consistency: strong` o la cookie de read-your-writes, que
+      deja cada escritura por REPLICA_MAX_LAG segundos: la ventana es por
+      cliente, los demás siguen leyendo de las réplicas.
+
+    Lo leído de una réplica puede ser anterior a una escritura reciente de
+    otro cliente; para no volver a llenar el cache compartido con eso,
+    `lectura_confiable` (ver EntityCache) da False para las tablas escritas
+    en cualquier worker hace menos de REPLICA_MAX_LAG segundos (se entera
+    por el bus de invalidaciones).
+
+    El atraso de cada réplica se mide fuera de las requests: la request usa
+    la última medición y, si venció (REPLICA_LAG_CHECK_INTERVAL), dispara
+    una nueva en un hilo. Sólo la primera del proceso espera la medición.
+    """
+
+    def __init__(self):
+        self.db = None
+        self.claves: List[str] = []
+        self.max_lag = 2.0
+        self.intervalo = 5.0
+        self._engines = {}
+        self._lags: Dict[str, Tuple[Optional[float], float]] = {}
+        # clave -> pid del proceso que la está midiendo (los hilos no sobreviven al fork)
+        self._midiendo: Dict[str, int] = {}
+        self._escrituras: Dict[str, float] = {}
+        self._turno = itertools.count()
+        self._lock = threading.Lock()
+
+    def init_app(self, app, db, bus) -> None:
+        self.db = db
+        self.claves = sorted(clave for clave in app.config.get("SQLALCHEMY_BINDS", {}) if clave.startswith("replica_"))
+        self.max_lag = app.config.get("REPLICA_MAX_LAG", 2.0)
+        self.intervalo = app.config.get("REPLICA_LAG_CHECK_INTERVAL", 5.0)
+        self._lags, self._midiendo, self._escrituras = {}, {}, {}
+        if not self.claves:
+            return
+        # Las mediciones corren en hilos sin contexto de aplicación.
+        with app.app_context():
+            self._engines = {clave: db.engines[clave] for clave in self.claves}
+        # Las réplicas no tienen modelos propios (el esquema llega por la
+        # replicación): que db.create_all()/drop_all() no las toquen.
+        for clave in self.claves:
+            db.metadatas.pop(clave, None)
+        bus.suscribir(self._notificacion)
+        app.before_request(self._antes_de_request)
+        app.after_request(self._despues_de_request)
+        logging.info(f"[REPLICAS] lecturas GET repartidas entre {', '.join(self.claves)}")
+
+    def engine_lectura(self):
+        """Engine de la réplica elegida para la request en curso (None: primario)."""
+        if not has_request_context() or g.get("escribio_primario"):
+            return None
+        clave = g.get("replica")
+        return self.db.engines[clave] if clave else None
+
+    def marcar_escritura(self) -> None:
+        if has_request_context():
+            g.escribio_primario = True
+
+    def elegir(self) -> Optional[str]:
+        """Próxima réplica (round-robin) con lag aceptable, o None."""
+        if not self.claves:
+            return None
+        inicio = next(self._turno)
+        for i in range(len(self.claves)):
+            clave = self.claves[(inicio + i) % len(self.claves)]
+            lag = self.lag(clave)
+            if lag is not None and lag <= self.max_lag:
+                return clave
+        logging.warning("[REPLICAS] ninguna réplica disponible: se lee del primario")
+        return None
+
+    def lag(self, clave: str) -> Optional[float]:
+        """Atraso de la réplica en segundos según la última medición (None si no responde)."""
+        with self._lock:
+            medicion = self._lags.get(clave)
+            vencida = medicion is None or time.monotonic() - medicion[1] >= self.intervalo
+            medir = vencida and self._midiendo.get(clave) != os.getpid()
+            if medir:
+                self._midiendo[clave] = os.getpid()
+        if medir and medicion is None:
+            self._actualizar_lag(clave)
+        elif medir:
+            threading.Thread(target=self._actualizar_lag, args=(clave,), name=f"lag-{clave}", daemon=True).start()
+        with self._lock:
+            medicion = self._lags.get(clave)
+        return medicion[0] if medicion else None
+
+    def _actualizar_lag(self, clave: str) -> None:
+        lag = self.medir_lag(clave)
+        with self._lock:
+            self._lags[clave] = (lag, time.monotonic())
+            self._midiendo.pop(clave, None)
+
+    def medir_lag(self, clave: str) -> Optional[float]:
+        engine = self._engines[clave]
+        try:
+            with engine.connect() as conn:
+                if engine.dialect.name == "postgresql":
+                    return float(conn.execute(_LAG_POSTGRESQL).scalar() or 0)
+                # Sin replicación que medir (p. ej. SQLite en local): sólo se comprueba que responda.
+                conn.execute(text("SELECT 1"))
+                return 0.0
+        except Exception as e:
+            logging.warning(f"[REPLICAS] {clave} no responde: {e}")
+            return None
+
+    def lectura_confiable(self, entidades: Iterable[str]) -> bool:
+        """
+        False si la request lee de una réplica y alguna de `entidades` se
+        escribió hace menos de REPLICA_MAX_LAG segundos: lo leído puede no
+        incluir esa escritura y no debe guardarse en el cache compartido.
+        """
+        return self.engine_lectura() is None or self.replica_al_dia(entidades)
+
+    def replica_al_dia(self, entidades: Iterable[str]) -> bool:
+        """True si ninguna de `entidades` se escribió en los últimos REPLICA_MAX_LAG segundos."""
+        limite = time.monotonic() - self.max_lag
+        return all(self._escrituras.get(entidad, float("-inf")) < limite for entidad in entidades)
+
+    def _notificacion(self, mensaje: dict) -> None:
+        if mensaje.get("entidad"):
+            self._escrituras[mensaje["entidad"]] = time.monotonic()
+
+    def _antes_de_request(self) -> None:
+        # g vive en el contexto de aplicación, que puede ser compartido entre requests (tests, CLI)
+        g.replica, g.escribio_primario = None, False
+        g.replica = self.replica_para(request.method, request.headers.get(CONSISTENCIA_HEADER),
+                                      request.cookies.get(RYW_COOKIE, type=float, default=0))
+
+    def replica_para(self, metodo: str, consistencia: Optional[str], primario_hasta: float) -> Optional[str]:
+        """
+        Réplica para una request con ese método, header X-Consistency y
+        cookie de read-your-writes (None: primario). También la usa app/asgi.py.
+        """
+        if metodo not in METODOS_LECTURA:
+            return None
+        if (consistencia or "").strip().lower() == "strong":
+            return None
+        if primario_hasta > time.time():
+            return None
+        return self.elegir()
+
+    def _despues_de_request(self, response):
+        if request.method not in METODOS_LECTURA and response.status_code < 400:
+            response.set_cookie(RYW_COOKIE, f"{time.time() + self.max_lag:.3f}",
+                                max_age=max(1, round(self.max_lag)), httponly=True)
+        return response
@@ -0,0 +1,28 @@
+from flask_sqlalchemy.session import Session
+from sqlalchemy.sql.elements import TextClause
+
+
+def _es_lectura(clause) -> bool:
+    if isinstance(clause, TextClause):
+        return clause.text.lstrip()[:6].upper() == "SELECT"
+    return bool(getattr(clause, "is_select", False))
+
+
+class RoutingSession(Session):
+    """
+    Sesión que manda las lecturas a una réplica cuando el router eligió una
+    para la request en curso (ver ReplicaRouter). Todo lo demás va al
+    primario: flush, INSERT/UPDATE/DELETE y cualquier lectura posterior a
+    una escritura dentro de la misma request (read-your-writes).
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and (clause is not None or self._flushing):
+            from app import replicas
+            if self._flushing or not _es_lectura(clause):
+                replicas.marcar_escritura()
+            else:
+                engine = replicas.engine_lectura()
+                if engine is not None:
+                    return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
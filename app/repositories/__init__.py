@@ -1,4 +1,9 @@
 from .facultad_repository import FacultadRepository
 from .universidad_repository import UniversidadRepository
 from .especialidad_repository import EspecialidadRepository
-
+from .busqueda_repository import BusquedaRepository
+from .autocompletado_repository import AutocompletadoRepository
+from .arbol_repository import ArbolRepository
+from .exportacion_repository import ExportacionRepository
+from .importacion_repository import ImportacionRepository
+from .lote_repository import LoteRepository, ConflictoLote
@@ -0,0 +1,57 @@
+from typing import Callable, Iterable, List, Optional, Tuple
+from app import db, entity_cache
+from app.models import Universidad, Facultad, Especialidad
+
+Arbol = Tuple[Universidad, List[Facultad], List[Especialidad]]
+
+
+class ArbolRepository:
+    """
+    Árbol universidad -> facultades -> especialidades, guardado en el cache
+    como JSON ya serializado. Lo invalidan las escrituras de cualquiera de
+    sus miembros (ver `invalidar` en los repositorios de cada entidad).
+    """
+
+    @staticmethod
+    def clave(universidad_id: int) -> str:
+        return entity_cache.clave_documento("arbol", universidad_id)
+
+    @staticmethod
+    def arbol(universidad_id: int, serializar: Callable[[Arbol], bytes]) -> Optional[bytes]:
+        return entity_cache.documento(
+            ArbolRepository.clave(universidad_id),
+            lambda: ArbolRepository._construir(universidad_id, serializar),
+            entidades=[entity_cache.entidad(model) for model in (Universidad, Facultad, Especialidad)])
+
+    @staticmethod
+    def _construir(universidad_id: int, serializar: Callable[[Arbol], bytes]) -> Optional[bytes]:
+        # Tres consultas por conjunto, sin importar cuántas facultades o especialidades haya.
+        universidad = db.session.query(Universidad).filter(Universidad.id == universidad_id).one_or_none()
+        if universidad is None:
+            return None
+        facultades = (db.session.query(Facultad)
+                      .filter(Facultad.universidad_id == universidad_id)
+                      .order_by(Facultad.id).all())
+        especialidades = (db.session.query(Especialidad)
+                          .join(Facultad, Especialidad.facultad_id == Facultad.id)
+                          .filter(Facultad.universidad_id == universidad_id)
+                          .order_by(Especialidad.id).all())
+        return serializar((universidad, facultades, especialidades))
+
+    @staticmethod
+    def invalidar(universidad_ids: Iterable[Optional[int]]) -> None:
+        ids = {id for id in universidad_ids if id is not None}
+        entity_cache.invalidar_documentos(ArbolRepository.clave(id) for id in sorted(ids))
+
+    @staticmethod
+    def universidad_de_facultad(facultad_id: Optional[int]) -> Optional[int]:
+        if facultad_id is None:
+            return None
+        return db.session.query(Facultad.universidad_id).filter(Facultad.id == facultad_id).scalar()
+
+    @staticmethod
+    def universidades_de_facultades(facultad_ids: Iterable[Optional[int]]) -> List[int]:
+        ids = {id for id in facultad_ids if id is not None}
+        if not ids:
+            return []
+        return [id for (id,) in db.session.query(Facultad.universidad_id).filter(Facultad.id.in_(ids)).distinct()]
@@ -0,0 +1,14 @@
+from typing import List, Optional, Tuple
+from app import db
+
+
+class AutocompletadoRepository:
+
+    @staticmethod
+    def documentos(model, ids: Optional[List[int]] = None) -> List[Tuple[int, str, Optional[str]]]:
+        """(id, nombre, sigla) de la tabla completa o de los ids dados; sólo esas columnas."""
+        sigla = getattr(model, "sigla", None)
+        query = db.session.query(model.id, model.nombre, sigla if sigla is not None else db.null())
+        if ids is not None:
+            query = query.filter(model.id.in_(ids))
+        return [tuple(fila) for fila in query]
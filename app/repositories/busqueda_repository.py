@@ -0,0 +1,133 @@
+import re
+from typing import List, Optional
+
+from sqlalchemy import text
+
+from app import db
+from app.models import Universidad, Facultad, Especialidad
+from app.models.busqueda import ENTIDADES_BUSQUEDA, ACENTOS, SIN_ACENTOS
+
+# Campos de cada entidad en el índice: nombre y sigla pesan más que el detalle.
+DOCUMENTOS = {
+    Universidad: lambda u: (u.nombre, u.sigla, u.tipo),
+    Facultad: lambda f: (f.nombre, f.sigla, " ".join(filter(None, (f.abreviatura, f.ciudad)))),
+    Especialidad: lambda e: (e.nombre, None, " ".join(filter(None, (e.letra, e.observacion)))),
+}
+MAX_TERMINOS = 8
+
+_SIN_ACENTOS = str.maketrans(ACENTOS, SIN_ACENTOS)
+_NORMALIZAR_PG = "translate(lower({}), '%s', '%s')" % (ACENTOS, SIN_ACENTOS)
+
+
+def _dialecto() -> str:
+    return db.session.get_bind().dialect.name
+
+
+def _rowid(entidad: str, id: int) -> int:
+    return id * len(ENTIDADES_BUSQUEDA) + ENTIDADES_BUSQUEDA.index(entidad)
+
+
+def terminos(q: str) -> List[str]:
+    """Palabras de la consulta, en minúsculas y sin acentos."""
+    return re.findall(r"\w+", q.lower().translate(_SIN_ACENTOS))[:MAX_TERMINOS]
+
+
+class BusquedaRepository:
+    """
+    Mantenimiento y consulta del índice de texto (app/models/busqueda.py).
+    Las escrituras van en la misma transacción que el cambio de la entidad:
+    los repositorios las llaman después del flush y antes del commit.
+    """
+
+    @staticmethod
+    def indexar(entity) -> None:
+        BusquedaRepository.indexar_lote([entity])
+
+    @staticmethod
+    def indexar_lote(entities: List) -> None:
+        """Como `indexar`, con un executemany por sentencia (importaciones masivas)."""
+        if not entities:
+            return
+        params = []
+        for entity in entities:
+            nombre, sigla, detalle = DOCUMENTOS[type(entity)](entity)
+            params.append({"entidad": type(entity).__name__.lower(), "entidad_id": entity.id, "nombre": nombre,
+                           "sigla": sigla, "detalle": detalle or ""})
+        if _dialecto() == "postgresql":
+            documento = ("setweight(to_tsvector('simple', %s), 'A') || setweight(to_tsvector('simple', %s), 'B')"
+                         % (_NORMALIZAR_PG.format("concat_ws(' ', :nombre, :sigla)"),
+                            _NORMALIZAR_PG.format(":detalle")))
+            db.session.execute(text(
+                "INSERT INTO busqueda (entidad, entidad_id, nombre, sigla, documento) "
+                f"VALUES (:entidad, :entidad_id, :nombre, :sigla, {documento}) "
+                "ON CONFLICT (entidad, entidad_id) DO UPDATE SET "
+                "nombre = EXCLUDED.nombre, sigla = EXCLUDED.sigla, documento = EXCLUDED.documento"), params)
+            return
+        for fila in params:
+            fila["rowid"] = _rowid(fila["entidad"], fila["entidad_id"])
+        db.session.execute(text("DELETE FROM busqueda WHERE rowid = :rowid"), params)
+        db.session.execute(text(
+            "INSERT INTO busqueda (rowid, entidad, entidad_id, nombre, sigla, detalle) "
+            "VALUES (:rowid, :entidad, :entidad_id, :nombre, :sigla, :detalle)"), params)
+
+    @staticmethod
+    def quitar(model, id: int) -> None:
+        entidad = model.__name__.lower()
+        if _dialecto() == "postgresql":
+            db.session.execute(text("DELETE FROM busqueda WHERE entidad = :entidad AND entidad_id = :id"),
+                               {"entidad": entidad, "id": id})
+        else:
+            db.session.execute(text("DELETE FROM busqueda WHERE rowid = :rowid"), {"rowid": _rowid(entidad, id)})
+
+    @staticmethod
+    def quitar_lote(model, ids: List[int]) -> None:
+        if not ids:
+            return
+        entidad = model.__name__.lower()
+        if _dialecto() == "postgresql":
+            db.session.execute(text("DELETE FROM busqueda WHERE entidad = :entidad AND entidad_id = :id"),
+                               [{"entidad": entidad, "id": id} for id in ids])
+        else:
+            db.session.execute(text("DELETE FROM busqueda WHERE rowid = :rowid"),
+                               [{"rowid": _rowid(entidad, id)} for id in ids])
+
+    @staticmethod
+    def buscar(q: str, limite: int = 20, entidad: Optional[str] = None) -> List[dict]:
+        """
+        Mejores `limite` coincidencias entre las tres entidades, ordenadas por
+        relevancia. Cada término se busca como prefijo y todos deben aparecer.
+        """
+        palabras = terminos(q)
+        if not palabras:
+            return []
+        params = {"limite": limite, "entidad": entidad}
+        filtro_entidad = "AND entidad = :entidad" if entidad else ""
+        if _dialecto() == "postgresql":
+            params["q"] = " & ".join(f"{p}:*" for p in palabras)
+            sql = ("SELECT entidad, entidad_id, nombre, sigla, ts_rank(documento, consulta) AS score "
+                   "FROM busqueda, to_tsquery('simple', :q) AS consulta "
+                   f"WHERE documento @@ consulta {filtro_entidad} "
+                   "ORDER BY score DESC, entidad_id LIMIT :limite")
+        else:
+            params["q"] = " ".join(f'"{p}"*' for p in palabras)
+            # bm25 es menor cuanto más relevante; pesos: nombre y sigla 10, detalle 1
+            sql = ("SELECT entidad, entidad_id, nombre, sigla, -bm25(busqueda, 0, 0, 10.0, 10.0, 1.0) AS score "
+                   f"FROM busqueda WHERE busqueda MATCH :q {filtro_entidad} "
+                   "ORDER BY score DESC, entidad_id LIMIT :limite")
+        return [
+            {"entidad": fila.entidad, "id": int(fila.entidad_id), "nombre": fila.nombre,
+             "sigla": fila.sigla, "score": round(float(fila.score), 6)}
+            for fila in db.session.execute(text(sql), params)
+        ]
+
+    @staticmethod
+    def reindexar() -> int:
+        """Reconstruye el índice completo a partir de las tablas (bases previas al índice)."""
+        db.session.execute(text("DELETE FROM busqueda"))
+        total = 0
+        for model in DOCUMENTOS:
+            for entity in db.session.query(model).yield_per(1000):
+                BusquedaRepository.indexar(entity)
+                total += 1
+        db.session.commit()
+        return total
@@ -1,25 +1,26 @@
 from app.models import Especialidad
-from app import db, redis_client
+from app import db, entity_cache
 from sqlalchemy_filters import apply_filters
+from app.repositories.arbol_repository import ArbolRepository
+from app.repositories.busqueda_repository import BusquedaRepository
+from app.repositories.expansion import opciones_expansion
+from app.repositories.pagination import paginar, Pagina, CONTEO_EXACTO, CONTEO_NINGUNO
 import logging
-import json
-
-CACHE_TTL = 60 #seg
-CACHE_PREFIX = "especialidad:"
 
 
 class EspecialidadRepository:
 
     @staticmethod
-    def listar_especialidades(page: int, per_page: int, filters: list = None) -> list:
-        logging.info("page: {}, per_page: {}, filters: {}".format(page, per_page, filters))
-
-        query = db.session.query(Especialidad).order_by(Especialidad.id)
-
-        if filters and isinstance(filters, list):
-            query = apply_filters(query, filters)
+    def listar_especialidades(page: int, per_page: int, filters: list = None, after_id: int = None) -> list:
+        logging.info("page: {}, per_page: {}, filters: {}, after_id: {}".format(page, per_page, filters, after_id))
+        return paginar(Especialidad, page, per_page, filters, after_id, conteo=CONTEO_NINGUNO).contenido
 
-        return query.offset((page - 1) * per_page).limit(per_page).all()
+    @staticmethod
+    def listar_especialidades_con_total(page: int, per_page: int, filters: list = None,
+                                        after_id: int = None, conteo: str = CONTEO_EXACTO, campos: tuple = None, expand: tuple = ()) -> Pagina:
+        """Página, total de elementos y si el total es exacto, en un solo round-trip a la base (con `campos`, sólo esas columnas)."""
+        logging.info("page: {}, per_page: {}, filters: {}, after_id: {}, conteo: {}".format(page, per_page, filters, after_id, conteo))
+        return paginar(Especialidad, page, per_page, filters, after_id, conteo, campos, expand)
 
     @staticmethod
     def contar_especialidades(filters: list = None) -> int:
@@ -33,37 +34,35 @@ class EspecialidadRepository:
     @staticmethod
     def crear_especialidad(especialidad: Especialidad) -> Especialidad:
         db.session.add(especialidad)
+        db.session.flush()
+        BusquedaRepository.indexar(especialidad)
         db.session.commit()
+        entity_cache.invalidar_tabla(Especialidad, ids=[especialidad.id])
+        ArbolRepository.invalidar([ArbolRepository.universidad_de_facultad(especialidad.facultad_id)])
         return especialidad
 
     @staticmethod
-    def buscar_especialidad(id: int) -> Especialidad:
-        key = f"especialidad:{id}"
-
-        # 1. Buscar en cache
-        if redis_client is not None:
-            cached = redis_client.get(key)
-            if cached:
-                data = json.loads(cached)
-                # reconstruir modelo
-                return Especialidad(**data)
-
-        # 2. Buscar en DB
-        especialidad = db.session.query(Especialidad).filter_by(id=id).one_or_none()
-        if not especialidad:
-            return None
-        if redis_client is not None:
-            data = {
-                "id": especialidad.id,
-                "nombre": especialidad.nombre,
-                "letra": especialidad.letra,
-                "observacion": especialidad.observacion,
-                "facultad_id": especialidad.facultad_id
-            }
-            redis_client.set(key, json.dumps(data))
-        return especialidad
+    def buscar_especialidad(id: int, expand: tuple = ()) -> Especialidad:
+        if expand:
+            # el cache guarda sólo columnas: con relaciones se va a la base con selectinload
+            return db.session.query(Especialidad).options(*opciones_expansion(Especialidad, expand)).filter(
+                Especialidad.id == id).one_or_none()
+        return entity_cache.buscar(
+            Especialidad, id,
+            lambda: db.session.query(Especialidad).filter_by(id=id).one_or_none())
 
 
+    @staticmethod
+    def buscar_especialidades(ids: list, expand: tuple = ()) -> list:
+        """Multi-get: las especialidades de `ids` en ese orden (None las inexistentes)."""
+        if expand:
+            por_id = {entity.id: entity for entity in db.session.query(Especialidad).options(
+                *opciones_expansion(Especialidad, expand)).filter(Especialidad.id.in_(ids))}
+            return [por_id.get(id) for id in ids]
+        return entity_cache.buscar_varios(
+            Especialidad, ids,
+            lambda faltantes: db.session.query(Especialidad).filter(Especialidad.id.in_(faltantes)).all())
+
     @staticmethod
     def actualizar_especialidad(especialidad: Especialidad, id: int):
         """
@@ -76,15 +75,12 @@ class EspecialidadRepository:
         entity.nombre = especialidad.nombre
         entity.letra = especialidad.letra
         entity.observacion = especialidad.observacion
+        BusquedaRepository.indexar(entity)
 
         db.session.commit()
 
-        # invalidar cache
-        if redis_client:
-            try:
-                redis_client.delete(f"{CACHE_PREFIX}{id}")
-            except Exception as e:
-                logging.warning(f"Error invalidando cache: {e}")
+        entity_cache.invalidar(Especialidad, id)
+        ArbolRepository.invalidar([ArbolRepository.universidad_de_facultad(entity.facultad_id)])
 
         return entity
 
@@ -94,12 +90,10 @@ class EspecialidadRepository:
         if not entity:
             return
 
+        facultad_id = entity.facultad_id
         db.session.delete(entity)
+        BusquedaRepository.quitar(Especialidad, id)
         db.session.commit()
 
-        # invalidar cache
-        if redis_client:
-            try:
-                redis_client.delete(f"{CACHE_PREFIX}{id}")
-            except Exception as e:
-                logging.warning(f"Error invalidando cache: {e}")
+        entity_cache.invalidar(Especialidad, id)
+        ArbolRepository.invalidar([ArbolRepository.universidad_de_facultad(facultad_id)])
@@ -0,0 +1,80 @@
+from typing import List, Optional, Set, Tuple
+
+from sqlalchemy.orm import selectinload
+
+from app.caching import EntityCache
+from app.models import Universidad, Facultad, Especialidad
+
+# Relaciones que cada entidad puede expandir (expand=) en los endpoints de lectura.
+EXPANSIONES = {
+    Universidad: ("facultades", "facultades.especialidades"),
+    Facultad: ("universidad", "especialidades"),
+    Especialidad: ("facultad", "facultad.universidad"),
+}
+
+
+def expansiones_pedidas(model, valor: Optional[str]) -> Tuple[str, ...]:
+    """
+    Interpreta `expand=facultades,facultades.especialidades`. Una ruta
+    anidada implica a sus padres. Lanza ValueError ante una ruta no permitida.
+    """
+    if valor is None or not valor.strip():
+        return ()
+    rutas = set()
+    for ruta in (r.strip() for r in valor.split(",") if r.strip()):
+        if ruta not in EXPANSIONES.get(model, ()):
+            raise ValueError(f"expand no permitido: {ruta}. Opciones: {', '.join(EXPANSIONES.get(model, ()))}")
+        partes = ruta.split(".")
+        rutas.update(".".join(partes[:i + 1]) for i in range(len(partes)))
+    return tuple(sorted(rutas))
+
+
+def _recorrer(model, ruta: str) -> List:
+    """Atributos de relación de cada nivel de la ruta ('facultades.especialidades')."""
+    atributos = []
+    for parte in ruta.split("."):
+        atributo = getattr(model, parte)
+        atributos.append(atributo)
+        model = atributo.property.mapper.class_
+    return atributos
+
+
+def opciones_expansion(model, expand: Tuple[str, ...]) -> list:
+    """
+    Opciones de carga para las rutas pedidas: selectinload por nivel, o sea
+    una consulta `WHERE fk IN (...)` por relación en lugar de una por fila.
+    """
+    opciones = []
+    for ruta in expand:
+        atributos = _recorrer(model, ruta)
+        opcion = selectinload(atributos[0])
+        for atributo in atributos[1:]:
+            opcion = opcion.selectinload(atributo)
+        opciones.append(opcion)
+    return opciones
+
+
+def columnas_expansion(model, expand: Tuple[str, ...]) -> Set[str]:
+    """Columnas propias que necesita cada relación expandida (FK de las many-to-one), para sumarlas a load_only."""
+    columnas = set()
+    for ruta in expand:
+        if "." not in ruta:
+            relacion = getattr(model, ruta).property
+            columnas.update(columna.key for columna in relacion.local_columns)
+    return columnas
+
+
+def modelos_expansion(model, expand: Tuple[str, ...]) -> Set:
+    return {_recorrer(model, ruta)[-1].property.mapper.class_ for ruta in expand}
+
+
+def tags_expansion(model, valor: Optional[str]) -> List[str]:
+    """
+    Tags de tabla de las entidades expandidas: una respuesta con
+    expand=facultades depende también de los cambios en facultades.
+    """
+    try:
+        expand = expansiones_pedidas(model, valor)
+    except ValueError:
+        return []
+    return sorted(EntityCache.tag_tabla(m) for m in modelos_expansion(model, expand))
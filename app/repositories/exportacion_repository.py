@@ -0,0 +1,20 @@
+from typing import Iterator, Optional, Sequence
+from sqlalchemy_filters import apply_filters
+from app import db
+
+
+class ExportacionRepository:
+
+    @staticmethod
+    def filas(model, columnas: Sequence[str], filters: Optional[list] = None, lote: int = 1000) -> Iterator[tuple]:
+        """
+        Recorre la tabla completa ordenada por id, de a `lote` filas: con
+        yield_per el driver usa un cursor del lado del servidor (PostgreSQL)
+        y sólo proyecta las columnas pedidas, sin armar entidades ni llenar
+        el identity map, así la memoria no depende del tamaño de la tabla.
+        """
+        query = db.session.query(*(getattr(model, columna) for columna in columnas)).order_by(model.id)
+        if filters and isinstance(filters, list):
+            query = apply_filters(query, filters)
+        for fila in query.yield_per(lote):
+            yield tuple(fila)
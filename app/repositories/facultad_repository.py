@@ -1,66 +1,61 @@
 from app.models import Facultad
-from app import db
+from app import db, entity_cache
 from sqlalchemy_filters import apply_filters
 from typing import Optional
-import logging
-from app import redis_client
-import json
+from app.repositories.arbol_repository import ArbolRepository
+from app.repositories.busqueda_repository import BusquedaRepository
+from app.repositories.expansion import opciones_expansion
+from app.repositories.pagination import paginar, Pagina, CONTEO_EXACTO, CONTEO_NINGUNO
+from app.repositories.relaciones import hijos, invalidar_hijos
 
 class FacultadRepository:
 
   @staticmethod
   def crear_facultad(facultad: Facultad):
     db.session.add(facultad)
+    db.session.flush()
+    BusquedaRepository.indexar(facultad)
     db.session.commit()
+    entity_cache.invalidar_tabla(Facultad, ids=[facultad.id])
+    ArbolRepository.invalidar([facultad.universidad_id])
     return facultad
   
   @staticmethod
-  def listar_facultades(page: int, per_page: int, filters: Optional[list] = None) -> list[Facultad]:
-    query = db.session.query(Facultad)
-    if filters and isinstance(filters, list):
-        query = apply_filters(query, filters)
-    paginated_query = query.offset((page - 1) * per_page).limit(per_page)
-    return paginated_query.all()
+  def listar_facultades(page: int, per_page: int, filters: Optional[list] = None, after_id: Optional[int] = None) -> list[Facultad]:
+    return paginar(Facultad, page, per_page, filters, after_id, conteo=CONTEO_NINGUNO).contenido
+
+  @staticmethod
+  def listar_facultades_con_total(page: int, per_page: int, filters: Optional[list] = None,
+                                  after_id: Optional[int] = None, conteo: str = CONTEO_EXACTO, campos: Optional[tuple] = None, expand: tuple = ()) -> Pagina:
+    """Página, total de elementos y si el total es exacto, en un solo round-trip a la base (con `campos`, sólo esas columnas)."""
+    return paginar(Facultad, page, per_page, filters, after_id, conteo, campos, expand)
   
   @staticmethod
-  def buscar_facultad(id: int) -> Facultad:
-      key = f"facultad:{id}"
-
-      logging.info(f"[CACHE] Buscando clave en Redis: {key}")
-
-      if redis_client is not None:
-          cached = redis_client.get(key)
-          if cached:
-              data = json.loads(cached)
-              logging.info(f"[CACHE HIT] Facultad {id} encontrada en Redis.")
-              return Facultad(**data)
-
-      logging.info(f"[CACHE MISS] No se encontró la facultad {id} en Redis. Consultando DB...")
-
-      facultad = db.session.query(Facultad).filter(Facultad.id == id).one_or_none()
-      if not facultad:
-          return None
-       
-      if redis_client is not None:
-          data = {
-              "id": facultad.id,
-              "nombre": facultad.nombre,
-              "abreviatura": facultad.abreviatura,
-              "directorio": facultad.directorio,
-              "sigla": facultad.sigla,
-              "codigoPostal": facultad.codigoPostal,
-              "ciudad": facultad.ciudad,
-              "domicilio": facultad.domicilio,
-              "telefono": facultad.telefono,
-              "contacto": facultad.contacto,
-              "email": facultad.email
-          }
-          redis_client.set(key, json.dumps(data)) 
-      return facultad
+  def buscar_facultad(id: int, expand: tuple = ()) -> Facultad:
+    if expand:
+      # el cache guarda sólo columnas: con relaciones se va a la base con selectinload
+      return db.session.query(Facultad).options(*opciones_expansion(Facultad, expand)).filter(
+          Facultad.id == id).one_or_none()
+    return entity_cache.buscar(
+        Facultad, id,
+        lambda: db.session.query(Facultad).filter(Facultad.id == id).one_or_none())
     
+  @staticmethod
+  def buscar_facultades(ids: list, expand: tuple = ()) -> list:
+    """Multi-get: las facultades de `ids` en ese orden (None las inexistentes)."""
+    if expand:
+      por_id = {entity.id: entity for entity in db.session.query(Facultad).options(
+          *opciones_expansion(Facultad, expand)).filter(Facultad.id.in_(ids))}
+      return [por_id.get(id) for id in ids]
+    return entity_cache.buscar_varios(
+        Facultad, ids,
+        lambda faltantes: db.session.query(Facultad).filter(Facultad.id.in_(faltantes)).all())
+
   @staticmethod
   def actualizar_facultad(facultad: Facultad, id: int) -> Facultad:
-    entity = FacultadRepository.buscar_facultad(id)
+    entity = db.session.get(Facultad, id)
+    if entity is None:
+      return None
     entity.nombre = facultad.nombre
     entity.abreviatura = facultad.abreviatura
     entity.directorio = facultad.directorio
@@ -71,14 +66,25 @@ class FacultadRepository:
     entity.telefono = facultad.telefono
     entity.contacto = facultad.contacto
     entity.email = facultad.email
+    BusquedaRepository.indexar(entity)
     db.session.commit()
+    entity_cache.invalidar(Facultad, id)
+    ArbolRepository.invalidar([entity.universidad_id])
     return entity
   
   @staticmethod
   def eliminar_facultad(id: int) -> None:
-    entity = FacultadRepository.buscar_facultad(id)
+    entity = db.session.get(Facultad, id)
+    if entity is None:
+      return
+    universidad_id = entity.universidad_id
+    desvinculadas = hijos([entity])
     db.session.delete(entity)
+    BusquedaRepository.quitar(Facultad, id)
     db.session.commit()
+    entity_cache.invalidar(Facultad, id)
+    invalidar_hijos(desvinculadas)
+    ArbolRepository.invalidar([universidad_id])
 
   @staticmethod
   def contar_facultades(filters: Optional[list] = None) -> int:
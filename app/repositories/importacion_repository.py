@@ -0,0 +1,86 @@
+from typing import Dict, Iterable, List, Set
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from app import db, entity_cache
+from app.models import Universidad, Facultad, Especialidad
+from app.repositories.arbol_repository import ArbolRepository
+from app.repositories.busqueda_repository import BusquedaRepository
+
+# Clave foránea de cada entidad importable y el modelo al que apunta.
+REFERENCIAS = {
+    Facultad: ("universidad_id", Universidad),
+    Especialidad: ("facultad_id", Facultad),
+}
+
+
+class ImportacionRepository:
+    """
+    Altas masivas: un INSERT ... RETURNING por lote (executemany; SQLAlchemy
+    lo agrupa en sentencias multi-VALUES) y el índice de búsqueda en la
+    misma transacción. El commit y las invalidaciones van por lote, en
+    `confirmar`.
+    """
+
+    @staticmethod
+    def existentes(model, ids: Iterable[int]) -> Set[int]:
+        ids = {id for id in ids if id is not None}
+        if not ids:
+            return set()
+        return {id for (id,) in db.session.query(model.id).filter(model.id.in_(ids))}
+
+    @staticmethod
+    def insertar(model, entities: List) -> Dict[int, str]:
+        """
+        Inserta el lote; si alguna fila viola una restricción (p. ej. nombre
+        único) lo reintenta fila por fila. Devuelve {posición: error} de las
+        filas rechazadas.
+        """
+        if not entities:
+            return {}
+        try:
+            ImportacionRepository.insertar_lote(model, entities)
+            return {}
+        except IntegrityError:
+            db.session.rollback()
+        return ImportacionRepository._insertar_de_a_uno(model, entities)
+
+    @staticmethod
+    def insertar_lote(model, entities: List) -> None:
+        columnas = [columna.key for columna in model.__mapper__.column_attrs if columna.key != "id"]
+        filas = [{columna: getattr(entity, columna) for columna in columnas} for entity in entities]
+        ids = db.session.execute(
+            insert(model).returning(model.id, sort_by_parameter_order=True), filas).scalars().all()
+        # Las entidades quedan fuera de la sesión: sólo se les asigna el id para indexarlas.
+        for entity, id in zip(entities, ids):
+            entity.id = id
+        BusquedaRepository.indexar_lote(entities)
+
+    @staticmethod
+    def _insertar_de_a_uno(model, entities: List) -> Dict[int, str]:
+        # Camino lento: cada fila en su savepoint.
+        errores = {}
+        for i, entity in enumerate(entities):
+            try:
+                with db.session.begin_nested():
+                    ImportacionRepository.insertar_lote(model, [entity])
+            except IntegrityError as e:
+                entity.id = None
+                errores[i] = str(e.orig)
+        return errores
+
+    @staticmethod
+    def confirmar(model, entities: List) -> None:
+        db.session.commit()
+        ids = [entity.id for entity in entities]
+        if not ids:
+            return
+        entity_cache.invalidar_tabla(model, ids=ids)
+        if model is Facultad:
+            ArbolRepository.invalidar(entity.universidad_id for entity in entities)
+        elif model is Especialidad:
+            ArbolRepository.invalidar(ArbolRepository.universidades_de_facultades(
+                entity.facultad_id for entity in entities))
+
+    @staticmethod
+    def descartar() -> None:
+        db.session.rollback()
@@ -0,0 +1,104 @@
+from typing import Dict, List
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from app import db, entity_cache
+from app.models import Universidad, Facultad, Especialidad
+from app.repositories.arbol_repository import ArbolRepository
+from app.repositories.busqueda_repository import BusquedaRepository
+from app.repositories.importacion_repository import ImportacionRepository
+from app.repositories.relaciones import hijos, invalidar_hijos
+
+# Campos que reemplaza un PUT (los mismos que actualizar_<entidad>: la clave foránea no cambia).
+ACTUALIZABLES = {
+    Universidad: ("nombre", "sigla", "tipo"),
+    Facultad: ("nombre", "abreviatura", "directorio", "sigla", "codigoPostal", "ciudad",
+               "domicilio", "telefono", "contacto", "email"),
+    Especialidad: ("nombre", "letra", "observacion"),
+}
+
+
+class ConflictoLote(ValueError):
+    """El lote viola una restricción de la base; no se escribió ninguna fila."""
+
+
+class LoteRepository:
+    """
+    Altas, cambios y bajas de varias filas en una sola transacción, con
+    sentencias masivas (executemany) y una sola invalidación del cache.
+    """
+
+    @staticmethod
+    def crear(model, entities: List) -> List[int]:
+        try:
+            ImportacionRepository.insertar_lote(model, entities)
+            ids, arboles = [entity.id for entity in entities], LoteRepository._arboles(model, entities)
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            raise ConflictoLote(str(e.orig)) from e
+        entity_cache.invalidar_lote(model, ids, documentos=arboles)
+        return ids
+
+    @staticmethod
+    def actualizar(model, cambios: Dict[int, object]) -> List[int]:
+        """
+        Aplica `cambios` ({id: entidad con los valores nuevos}) con un UPDATE
+        por clave primaria en executemany. Si falta alguno de los ids no
+        escribe nada y los devuelve.
+        """
+        entities = db.session.query(model).filter(model.id.in_(list(cambios))).all()
+        faltantes = sorted(set(cambios) - {entity.id for entity in entities})
+        if faltantes:
+            return faltantes
+        campos = ACTUALIZABLES[model]
+        filas = [{"id": id, **{campo: getattr(nueva, campo) for campo in campos}} for id, nueva in cambios.items()]
+        try:
+            db.session.execute(update(model), filas)
+            # el UPDATE masivo no toca el identity map: se reflejan los valores para indexar
+            for entity in entities:
+                for campo in campos:
+                    set_committed_value(entity, campo, getattr(cambios[entity.id], campo))
+            BusquedaRepository.indexar_lote(entities)
+            arboles = LoteRepository._arboles(model, entities)
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            raise ConflictoLote(str(e.orig)) from e
+        entity_cache.invalidar_lote(model, list(cambios), documentos=arboles)
+        return []
+
+    @staticmethod
+    def eliminar(model, ids: List[int]) -> List[int]:
+        """Borra las filas existentes de `ids` (las que no existen se ignoran) y devuelve las borradas."""
+        # Las colecciones se cargan en una consulta para que el ORM desvincule
+        # a los hijos (como en eliminar_<entidad>) sin un SELECT por fila.
+        colecciones = [selectinload(relacion) for relacion in model.__mapper__.relationships if relacion.uselist]
+        entities = db.session.query(model).options(*colecciones).filter(model.id.in_(ids)).all()
+        desvinculadas = hijos(entities)
+        for entity in entities:
+            db.session.delete(entity)
+        borrados = [entity.id for entity in entities]
+        arboles = LoteRepository._arboles(model, entities)
+        try:
+            BusquedaRepository.quitar_lote(model, borrados)
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            raise ConflictoLote(str(e.orig)) from e
+        if borrados:
+            entity_cache.invalidar_lote(model, borrados, documentos=arboles)
+            invalidar_hijos(desvinculadas)
+        return borrados
+
+    @staticmethod
+    def _arboles(model, entities: List) -> List[str]:
+        # Claves de los árboles de universidad que contienen a las filas (antes del commit).
+        if model is Universidad:
+            universidades = [entity.id for entity in entities]
+        elif model is Facultad:
+            universidades = [entity.universidad_id for entity in entities]
+        else:
+            universidades = ArbolRepository.universidades_de_facultades(entity.facultad_id for entity in entities)
+        return [ArbolRepository.clave(id) for id in sorted({id for id in universidades if id is not None})]
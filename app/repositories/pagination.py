@@ -0,0 +1,156 @@
+from typing import NamedTuple, Optional, Sequence, Tuple
+
+from flask import current_app
+from sqlalchemy import func, text
+from sqlalchemy.orm import Query, load_only
+from sqlalchemy_filters import apply_filters
+
+from app import db, entity_cache
+from app.repositories.expansion import opciones_expansion, columnas_expansion
+
+# Modos de conteo aceptados en el header X-count
+CONTEO_EXACTO = "exact"
+CONTEO_NINGUNO = "none"
+CONTEO_ESTIMADO = "estimated"
+MODOS_CONTEO = (CONTEO_EXACTO, CONTEO_NINGUNO, CONTEO_ESTIMADO)
+
+
+# Estimación del planner (PostgreSQL): filas de la tabla según el último ANALYZE
+ESTIMACION_POSTGRESQL = text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:tabla AS regclass)")
+
+
+def consulta_filtrada(model, filters: Optional[list] = None, campos: Optional[Sequence[str]] = None,
+                      expand: Sequence[str] = ()):
+    return filtrar(db.session.query(model), model, filters, campos, expand)
+
+
+def filtrar(query, model, filters: Optional[list] = None, campos: Optional[Sequence[str]] = None,
+            expand: Sequence[str] = ()):
+    """
+    Aplica columnas, relaciones y filtros a `query`. No necesita sesión:
+    app/asgi.py la usa sobre `Query(model)` y ejecuta su `.statement`.
+    """
+    if campos:
+        # sparse fieldsets: sólo estas columnas (más la PK y las FK de las relaciones expandidas)
+        columnas = set(campos) | columnas_expansion(model, tuple(expand))
+        query = query.options(load_only(*(getattr(model, campo) for campo in sorted(columnas))))
+    if expand:
+        query = query.options(*opciones_expansion(model, tuple(expand)))
+    if filters and isinstance(filters, list):
+        query = apply_filters(query, filters)
+    return query
+
+
+class Pagina(NamedTuple):
+    contenido: list
+    total: Optional[int]
+    exacto: bool
+
+
+def paginar(model, page: int, per_page: int, filters: Optional[list] = None,
+            after_id: Optional[int] = None, conteo: str = CONTEO_EXACTO,
+            campos: Optional[Sequence[str]] = None, expand: Sequence[str] = ()) -> Pagina:
+    """
+    Devuelve la página y el total en una sola sentencia SQL.
+
+    Estrategia de conteo:
+      - 'none': no se cuenta (total None).
+      - 'estimated': sin filtros y sobre una tabla grande de PostgreSQL se
+        usan las estadísticas del planner (exacto=False); si no aplica, se
+        sigue como 'exact'.
+      - 'exact': primero el conteo cacheado (clave con la generación de la
+        tabla, así cualquier escritura lo invalida); ante un miss el total
+        viaja como subconsulta escalar en cada fila
+        (`SELECT t.*, (SELECT count(id) FROM t WHERE <filtros>) ...`) y se
+        cachea. Sólo si la página pedida está vacía hace falta contar aparte.
+
+    Con `campos` se cargan sólo esas columnas (load_only); el resto queda
+    diferido en las entidades devueltas. Cada relación de `expand` suma una
+    consulta por nivel (selectinload), no una por fila.
+    """
+    query = consulta_filtrada(model, filters, campos, expand)
+
+    total, exacto = None, False
+    if conteo == CONTEO_ESTIMADO:
+        total = estimar_total(model, filters)
+    if conteo != CONTEO_NINGUNO and total is None:
+        total = entity_cache.conteo(model, filters)
+        exacto = True
+
+    contar_en_consulta = conteo != CONTEO_NINGUNO and total is None
+    filas = consulta_pagina(query, model, page, per_page, after_id, contar_en_consulta).all()
+
+    if not contar_en_consulta:
+        return Pagina(filas, total, exacto)
+
+    filas, total = separar_total(filas, page, after_id)
+    if total is None:
+        total = contar(model, filters)
+    entity_cache.guardar_conteo(model, filters, total)
+    return Pagina(filas, total, True)
+
+
+def consulta_pagina(query, model, page: int, per_page: int, after_id: Optional[int] = None,
+                    contar_en_consulta: bool = False):
+    """
+    La página de `query` ordenada por id (keyset con after_id, si no OFFSET).
+    Con contar_en_consulta cada fila trae además el total como subconsulta escalar.
+    """
+    if contar_en_consulta:
+        subconsulta = (query.with_entities(func.count(model.id)).order_by(None)
+                       .scalar_subquery().correlate(None))
+        query = query.add_columns(subconsulta.label("total_elements"))
+
+    query = query.order_by(model.id)
+    if after_id is not None:
+        query = query.filter(model.id > after_id)
+    else:
+        query = query.offset((page - 1) * per_page)
+    return query.limit(per_page)
+
+
+def separar_total(filas, page: int, after_id: Optional[int] = None) -> Tuple[list, Optional[int]]:
+    """
+    Entidades y total de las filas de `consulta_pagina(..., contar_en_consulta=True)`.
+    El total es None si la página vino vacía y hay que contar aparte.
+    """
+    if filas:
+        return [fila[0] for fila in filas], filas[0][1]
+    if after_id is None and page <= 1:
+        return [], 0
+    return [], None
+
+
+def consulta_conteo(model, filters: Optional[list] = None):
+    query = Query(func.count(model.id))
+    if filters and isinstance(filters, list):
+        query = apply_filters(query, filters)
+    return query.statement
+
+
+def contar(model, filters: Optional[list] = None) -> int:
+    return db.session.execute(consulta_conteo(model, filters)).scalar() or 0
+
+
+def estimacion_aplicable(filters: Optional[list], dialecto: str) -> bool:
+    return not filters and dialecto == "postgresql"
+
+
+def estimacion_util(estimado: Optional[int], umbral: int) -> Optional[int]:
+    """La estimación si la tabla es grande (al menos `umbral` filas); si no, None."""
+    if estimado is None or estimado < umbral:
+        return None
+    return int(estimado)
+
+
+def estimar_total(model, filters: Optional[list] = None) -> Optional[int]:
+    """
+    Estimación barata para tablas grandes: en PostgreSQL, sin filtros, usa
+    pg_class.reltuples (actualizado por ANALYZE/autovacuum). Devuelve None
+    si no aplica (filtros, otro motor, tabla nunca analizada) o si la tabla
+    es chica (menos de COUNT_ESTIMATE_THRESHOLD filas), donde contar es barato.
+    """
+    if not estimacion_aplicable(filters, db.session.get_bind().dialect.name):
+        return None
+    estimado = db.session.execute(ESTIMACION_POSTGRESQL, {"tabla": model.__tablename__}).scalar()
+    return estimacion_util(estimado, current_app.config.get("COUNT_ESTIMATE_THRESHOLD", 100_000))
@@ -0,0 +1,25 @@
+from typing import Dict, Iterable, List
+
+from app import entity_cache
+
+
+def hijos(entities: Iterable) -> Dict[type, List[int]]:
+    """
+    Ids de las filas hijas (relaciones one-to-many) de `entities`, por modelo.
+    Se toman antes del flush: al borrar el padre el ORM pone en NULL la FK
+    de los hijos, que cambian sin pasar por su repositorio.
+    """
+    resultado = {}
+    for entity in entities:
+        for relacion in type(entity).__mapper__.relationships:
+            if relacion.uselist:
+                resultado.setdefault(relacion.mapper.class_, []).extend(
+                    hijo.id for hijo in getattr(entity, relacion.key))
+    return resultado
+
+
+def invalidar_hijos(hijos: Dict[type, List[int]]) -> None:
+    """Invalida las entidades, sus tags y la generación de la tabla de cada modelo hijo."""
+    for model, ids in hijos.items():
+        if ids:
+            entity_cache.invalidar_lote(model, ids)
@@ -1,10 +1,13 @@
-import json
-from app import redis_client
 from app.models import Universidad
-from app import db
+from app import db, entity_cache
 from sqlalchemy_filters import apply_filters
 import logging
 from typing import Optional, List
+from app.repositories.arbol_repository import ArbolRepository
+from app.repositories.busqueda_repository import BusquedaRepository
+from app.repositories.expansion import opciones_expansion
+from app.repositories.pagination import paginar, Pagina, CONTEO_EXACTO, CONTEO_NINGUNO
+from app.repositories.relaciones import hijos, invalidar_hijos
 
 
 class UniversidadRepository:
@@ -12,22 +15,24 @@ class UniversidadRepository:
   @staticmethod
   def crear_universidad(universidad: Universidad) -> Universidad:
     db.session.add(universidad)
+    db.session.flush()
+    BusquedaRepository.indexar(universidad)
     db.session.commit()
+    entity_cache.invalidar_tabla(Universidad, ids=[universidad.id])
     return universidad
   
   @staticmethod
-  def listar_universidades(page: int, per_page: int, filters: Optional[list] = None) -> list[Universidad]:
-    logging.info("page: {}, per_page: {}, filters: {}".format(page, per_page, filters))
-    
-    # 1. Asegurar la ordenación. Siempre es buena práctica ordenar para la paginación.
-    query = db.session.query(Universidad).order_by(Universidad.id)
-    
-    if filters and isinstance(filters, list):
-        # Aquí la lista de filtros debe venir formateada correctamente desde el Controlador
-        query = apply_filters(query, filters)
-        
-    paginated_query = query.offset((page - 1) * per_page).limit(per_page)
-    return paginated_query.all()
+  def listar_universidades(page: int, per_page: int, filters: Optional[list] = None, after_id: Optional[int] = None) -> list[Universidad]:
+    logging.info("page: {}, per_page: {}, filters: {}, after_id: {}".format(page, per_page, filters, after_id))
+    # Ordena por id; con after_id (modo cursor) busca por la PK en lugar de usar OFFSET
+    return paginar(Universidad, page, per_page, filters, after_id, conteo=CONTEO_NINGUNO).contenido
+
+  @staticmethod
+  def listar_universidades_con_total(page: int, per_page: int, filters: Optional[list] = None,
+                                     after_id: Optional[int] = None, conteo: str = CONTEO_EXACTO, campos: Optional[tuple] = None, expand: tuple = ()) -> Pagina:
+    """Página, total de elementos y si el total es exacto, en un solo round-trip a la base (con `campos`, sólo esas columnas)."""
+    logging.info("page: {}, per_page: {}, filters: {}, after_id: {}, conteo: {}".format(page, per_page, filters, after_id, conteo))
+    return paginar(Universidad, page, per_page, filters, after_id, conteo, campos, expand)
 
   # 2. FUNCIÓN DE CONTEO AÑADIDA
   @staticmethod
@@ -46,52 +51,50 @@ class UniversidadRepository:
       # Ejecutar la consulta de conteo y devolver el resultado
       return query.scalar() or 0
 
-  
-  
-  
   @staticmethod
-  def listar_universidades(page: int, per_page: int, filters: Optional[list] = None) -> list[Universidad]:
-    logging.info("page: {}, per_page: {}, filters: {}".format(page, per_page, filters))
-    query = db.session.query(Universidad)
-    if filters and isinstance(filters, list):
-        query = apply_filters(query, filters)
-    paginated_query = query.offset((page - 1) * per_page).limit(per_page)
-    return paginated_query.all()
+  def buscar_universidad(universidad_id: int, expand: tuple = ()):
+    if expand:
+      # el cache guarda sólo columnas: con relaciones se va a la base con selectinload
+      return db.session.query(Universidad).options(*opciones_expansion(Universidad, expand)).filter(
+          Universidad.id == universidad_id).one_or_none()
+    return entity_cache.buscar(
+        Universidad, universidad_id,
+        lambda: db.session.get(Universidad, universidad_id))
   
   @staticmethod
-  def buscar_universidad(universidad_id: int):
-        key = f"universidad:{universidad_id}"
-        if redis_client is not None:
-            cached = redis_client.get(key)
-            if cached:
-                data = json.loads(cached)
-                return Universidad(**data)   
-
-        uni = Universidad.query.get(universidad_id)
-        if not uni:
-            return None
-        if redis_client is not None:
+  def buscar_universidades(ids: list, expand: tuple = ()) -> list:
+    """Multi-get: las universidades de `ids` en ese orden (None las inexistentes)."""
+    if expand:
+      por_id = {entity.id: entity for entity in db.session.query(Universidad).options(
+          *opciones_expansion(Universidad, expand)).filter(Universidad.id.in_(ids))}
+      return [por_id.get(id) for id in ids]
+    return entity_cache.buscar_varios(
+        Universidad, ids,
+        lambda faltantes: db.session.query(Universidad).filter(Universidad.id.in_(faltantes)).all())
 
-            data = {
-                "id": uni.id,
-                "nombre": uni.nombre,
-                "sigla": uni.sigla,
-                "tipo": uni.observacion,
-            }
-            redis_client.set(key, json.dumps(data), ex=60)
-        return uni
-  
   @staticmethod
   def actualizar_universidad(universidad: Universidad, id: int) -> Universidad:
-    entity = UniversidadRepository.buscar_universidad(id)
+    entity = db.session.get(Universidad, id)
+    if entity is None:
+      return None
     entity.nombre = universidad.nombre
     entity.sigla = universidad.sigla
     entity.tipo = universidad.tipo
+    BusquedaRepository.indexar(entity)
     db.session.commit()
+    entity_cache.invalidar(Universidad, id)
+    ArbolRepository.invalidar([id])
     return entity
   
   @staticmethod
   def eliminar_universidad(id: int) -> None:
-    entity = UniversidadRepository.buscar_universidad(id)
+    entity = db.session.get(Universidad, id)
+    if entity is None:
+      return
+    desvinculadas = hijos([entity])
     db.session.delete(entity)
-    db.session.commit()
\ No newline at end of file
+    BusquedaRepository.quitar(Universidad, id)
+    db.session.commit()
+    entity_cache.invalidar(Universidad, id)
+    invalidar_hijos(desvinculadas)
+    ArbolRepository.invalidar([id])
@@ -2,4 +2,6 @@ from .home import home
 from .universidad_resource import universidad_bp 
 from .facultad_resource import facultad_bp
 from .especialidad_resource import especialidad_bp
-
+from .busqueda_resource import busqueda_bp
+from .autocompletado_resource import autocompletado_bp
+from .metricas_resource import metricas_bp
@@ -0,0 +1,22 @@
+from flask import jsonify, Blueprint, request
+import logging
+from app.services.autocompletado_service import AutocompletadoService, LIMITE_POR_DEFECTO
+
+
+autocompletado_bp = Blueprint('autocompletado', __name__)
+
+
+# Sin cached_view: el índice ya está en memoria y se mantiene con el bus de invalidaciones.
+@autocompletado_bp.route('/autocomplete', methods=['GET'])
+def sugerir():
+    q: str = request.args.get('q', '', type=str)
+    entidad: str|None = request.args.get('entidad', None, type=str)
+    limite: int = request.args.get('limit', LIMITE_POR_DEFECTO, type=int)
+    if not q.strip():
+        return jsonify({"error": "El parámetro q es obligatorio"}), 400
+    try:
+        resultado = AutocompletadoService.sugerir(q, entidad, limite)
+    except ValueError as e:
+        logging.error(f"Autocompletado rechazado: {e}")
+        return jsonify({"error": str(e)}), 400
+    return resultado, 200
@@ -0,0 +1,25 @@
+from flask import jsonify, Blueprint, request
+import logging
+from app.models import Universidad, Facultad, Especialidad
+from app.services.busqueda_service import BusquedaService, LIMITE_POR_DEFECTO
+from app.caching import EntityCache, cached_view
+
+
+busqueda_bp = Blueprint('busqueda', __name__)
+
+
+# Cualquier escritura de las tres tablas sube su generación e invalida las búsquedas cacheadas.
+@busqueda_bp.route('/search', methods=['GET'])
+@cached_view(lambda: [EntityCache.tag_tabla(model) for model in (Universidad, Facultad, Especialidad)])
+def buscar():
+    q: str = request.args.get('q', '', type=str).strip()
+    limite: int = request.args.get('limit', LIMITE_POR_DEFECTO, type=int)
+    entidad: str|None = request.args.get('entidad', None, type=str)
+    if not q:
+        return jsonify({"error": "El parámetro q es obligatorio"}), 400
+    try:
+        resultado = BusquedaService.buscar(q, limite, entidad)
+    except ValueError as e:
+        logging.error(f"Búsqueda rechazada: {e}")
+        return jsonify({"error": str(e)}), 400
+    return resultado, 200
@@ -4,63 +4,45 @@ from app.services.especilidad_service import EspecialidadService
 from app.models.especialidad import Especialidad
 from markupsafe import escape
 from app.validators import validate_with
-from app import cache
+from app.caching import EntityCache, cached_view, LIST_HEADERS
+from app.mapping import campos_pedidos, esquema
+from app.repositories.expansion import expansiones_pedidas, tags_expansion
+from app.resources.exportacion import respuesta_exportacion
+from app.resources.listado import respuesta_listado
+from app.resources.importacion import respuesta_importacion
+from app.resources.lote import crear_lote, actualizar_lote, eliminar_lote
 
-import json
-import logging
 
 especialidad_bp = Blueprint('especialidad', __name__)
 especialidad_mapping = EspecialidadMapping()
 
-def format_filters_for_sqlalchemy(filters_dict):
-    filters_list = []
-    if filters_dict:
-        for key, value in filters_dict.items():
-            filters_list.append({
-                "field": key,
-                "op": "ilike",
-                "value": f"%{value}%"
-            })
-    return filters_list
-
-
 @especialidad_bp.route('/especialidad', methods=['GET'])
+@cached_view(lambda: [EntityCache.tag_tabla(Especialidad), *tags_expansion(Especialidad, request.args.get('expand'))],
+             vary=LIST_HEADERS)
 def listar_especialidades():
-    page: int = request.headers.get('X-page', 1, type=int)
-    per_page: int = request.headers.get('X-per-page', 10, type=int) 
-    filters_str : str|None = request.headers.get('X-filters', None, type=str) 
-    filters = []
-    if filters_str:
-        try:
-            filters_dict = json.loads(filters_str)
-            filters = format_filters_for_sqlalchemy(filters_dict)
-        except json.JSONDecodeError as e:
-            logging.error(f"Error al decodificar X-filters: {e}")
-            return jsonify({"error": "Formato de filtros inválido en X-filters"}), 400
-
-    logging.info("page: {}, per_page: {}, filters: {}".format(page, per_page, filters))
-
-    pagination_data = EspecialidadService.listar_especialidades(page=page, per_page=per_page, filters=filters)
-    content = especialidad_mapping.dump(pagination_data['content'], many=True)
-    response = {
-        "content": content,
-        "pageable": {
-            "page": pagination_data['page'],
-            "size": pagination_data['size'],
-            "total_elements": pagination_data['total_elements'],
-            "total_pages": pagination_data['total_pages']
-        }
-    }
-    return jsonify(response), 200
+    return respuesta_listado(Especialidad, EspecialidadMapping, EspecialidadService.listar_especialidades, EspecialidadService.buscar_especialidades)
+
+
+@especialidad_bp.route('/especialidad/export', methods=['GET'])
+def exportar():
+    # Sin cached_view: la respuesta es streaming y puede ser de toda la tabla
+    return respuesta_exportacion(Especialidad, EspecialidadMapping)
 
 
 @especialidad_bp.route('/especialidad/<int:id>', methods=['GET'])
-@cache.cached(timeout=60)
+# Sin expand la entidad sale del cache de entidades (LRU local + Redis): sólo se cachea la vista con expand
+@cached_view(lambda id: [EntityCache.tag(Especialidad, id), *tags_expansion(Especialidad, request.args.get('expand'))],
+             vary=("X-fields",), solo_si=lambda id: request.args.get('expand') is not None)
 def buscar_por_id(id):
-    especialidad = EspecialidadService.buscar_especialidad(id)
+    try:
+        campos = campos_pedidos(EspecialidadMapping, request.args.get('fields') or request.headers.get('X-fields'))
+        expand = expansiones_pedidas(Especialidad, request.args.get('expand'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    especialidad = EspecialidadService.buscar_especialidad(id, expand)
     if especialidad is None:
         return jsonify({"error": "Especialidad no encontrada"}), 404
-    return especialidad_mapping.dump(especialidad), 200 
+    return esquema(EspecialidadMapping, campos, expand).dump(especialidad), 200 
 
 
 @especialidad_bp.route('/especialidad', methods=['POST'])
@@ -70,6 +52,26 @@ def crear(especialidad):
     return jsonify("Especialidad creada exitosamente"), 201
 
 
+@especialidad_bp.route('/especialidad/import', methods=['POST'])
+def importar():
+    return respuesta_importacion(Especialidad, EspecialidadMapping)
+
+
+@especialidad_bp.route('/especialidad/_bulk', methods=['POST'])
+def crear_varios():
+    return crear_lote(Especialidad, EspecialidadMapping)
+
+
+@especialidad_bp.route('/especialidad/_bulk', methods=['PUT'])
+def actualizar_varios():
+    return actualizar_lote(Especialidad, EspecialidadMapping)
+
+
+@especialidad_bp.route('/especialidad/_bulk', methods=['DELETE'])
+def borrar_varios():
+    return eliminar_lote(Especialidad)
+
+
 @especialidad_bp.route('/especialidad/<int:id>', methods=['PUT'])
 @validate_with(EspecialidadMapping)
 def actualizar(especialidad, id):
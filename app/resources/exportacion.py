@@ -0,0 +1,33 @@
+from flask import jsonify, request, current_app, Response, stream_with_context
+import json
+import logging
+from app.filters import compilar_filtros, FiltroInvalido
+from app.mapping import campos_pedidos, columnas
+from app.services.exportacion_service import ExportacionService, FORMATOS
+
+
+def respuesta_exportacion(model, schema_cls):
+    """
+    GET /<entidad>/export?format=ndjson|csv: la tabla completa como
+    respuesta streaming. Acepta X-filters y fields= como los listados.
+    """
+    formato: str = request.args.get('format', 'ndjson', type=str).strip().lower()
+    if formato not in FORMATOS:
+        return jsonify({"error": f"format debe ser uno de {', '.join(FORMATOS)}"}), 400
+    try:
+        campos = campos_pedidos(schema_cls, request.args.get('fields') or request.headers.get('X-fields'))
+        filters_str = request.headers.get('X-filters', None, type=str)
+        filters = compilar_filtros(model, json.loads(filters_str), estricto=current_app.config.get('FILTERS_STRICT', False)) if filters_str else []
+    except json.JSONDecodeError as e:
+        logging.error(f"Error al decodificar X-filters: {e}")
+        return jsonify({"error": "Formato de filtros inválido en X-filters"}), 400
+    except (ValueError, FiltroInvalido) as e:
+        logging.error(f"Exportación rechazada: {e}")
+        return jsonify({"error": str(e)}), 400
+
+    lote = current_app.config.get('EXPORT_BATCH_SIZE', 1000)
+    # stream_with_context mantiene la sesión de la request mientras el generador recorre la tabla
+    chunks = ExportacionService.exportar(model, columnas(schema_cls, campos), formato, filters, lote)
+    nombre = f"{model.__tablename__}.{formato}"
+    return Response(stream_with_context(chunks), mimetype=FORMATOS[formato],
+                    headers={"Content-Disposition": f"attachment; filename={nombre}"})
@@ -1,67 +1,47 @@
-from flask import jsonify, Blueprint, request 
+from flask import jsonify, Blueprint, request
 from app.mapping.facultad_mapping import FacultadMapping
 from app.services.facultad_service import FacultadService
 from app.models.facultad import Facultad
 from markupsafe import escape
 from app.validators import validate_with
-import json
-import logging
-from app import cache
+from app.caching import EntityCache, cached_view, LIST_HEADERS
+from app.mapping import campos_pedidos, esquema
+from app.repositories.expansion import expansiones_pedidas, tags_expansion
+from app.resources.exportacion import respuesta_exportacion
+from app.resources.listado import respuesta_listado
+from app.resources.importacion import respuesta_importacion
+from app.resources.lote import crear_lote, actualizar_lote, eliminar_lote
 
-from typing import Dict, Any, List
 
 facultad_bp = Blueprint('facultad', __name__)
 facultad_mapping = FacultadMapping()
 
-def format_filters_for_sqlalchemy(filters_dict: Dict[str, Any]) -> List:
-    filters_list = []
-    if filters_dict:
-        for key, value in filters_dict.items():
-            filters_list.append({
-                "field": key,
-                "op": "==", 
-                "value": value
-            })
-    return filters_list
-
 @facultad_bp.route('/facultad', methods=['GET'])
+@cached_view(lambda: [EntityCache.tag_tabla(Facultad), *tags_expansion(Facultad, request.args.get('expand'))],
+             vary=LIST_HEADERS)
 def listar_facultades():
-    page: int = request.headers.get('X-page', 1, type=int)
-    per_page: int = request.headers.get('X-per-page', 10, type=int) 
-    filters_str : str|None = request.headers.get('X-filters', None, type=str) 
-    
-    filters = [] 
-    if filters_str:
-        try:
-            filters_dict = json.loads(filters_str)
-            filters = format_filters_for_sqlalchemy(filters_dict)
-        
-        except json.JSONDecodeError as e:
-            logging.error(f"Error al decodificar X-filters: {e}")
-            return jsonify({"error": "Formato de filtros inválido en X-filters"}), 400
-    
-    logging.info("page: {}, per_page: {}, filters: {}".format(page, per_page, filters_str))
-    
-    pagination_data = FacultadService.listar_facultades(page=page, per_page=per_page, filters=filters)
-    content = facultad_mapping.dump(pagination_data['content'], many=True)
-    response = {
-        "content": content,
-        "pageable": {
-            "page": pagination_data['page'],
-            "size": pagination_data['size'],
-            "total_elements": pagination_data['total_elements'],
-            "total_pages": pagination_data['total_pages']
-        }
-    }
-    return jsonify(response), 200
+    return respuesta_listado(Facultad, FacultadMapping, FacultadService.listar_facultades, FacultadService.buscar_facultades)
     
+@facultad_bp.route('/facultad/export', methods=['GET'])
+def exportar():
+    # Sin cached_view: la respuesta es streaming y puede ser de toda la tabla
+    return respuesta_exportacion(Facultad, FacultadMapping)
+
+
 @facultad_bp.route('/facultad/<int:id>', methods=['GET'])
-@cache.cached(timeout=60)
+# Sin expand la entidad sale del cache de entidades (LRU local + Redis): sólo se cachea la vista con expand
+@cached_view(lambda id: [EntityCache.tag(Facultad, id), *tags_expansion(Facultad, request.args.get('expand'))],
+             vary=("X-fields",), solo_si=lambda id: request.args.get('expand') is not None)
 def buscar_por_id(id):
-    facultad = FacultadService.buscar_facultad(id)
+    try:
+        campos = campos_pedidos(FacultadMapping, request.args.get('fields') or request.headers.get('X-fields'))
+        expand = expansiones_pedidas(Facultad, request.args.get('expand'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    facultad = FacultadService.buscar_facultad(id, expand)
     if facultad is None:
         return jsonify({"error": "Facultad no encontrada"}), 404
-    return facultad_mapping.dump(facultad), 200
+    return esquema(FacultadMapping, campos, expand).dump(facultad), 200
 
 @facultad_bp.route('/facultad', methods=['POST']) 
 @validate_with(FacultadMapping)
@@ -69,6 +49,26 @@ def crear(facultad):
     FacultadService.crear_facultad(facultad)
     return jsonify("Facultad creada exitosamente"), 201 
 
+@facultad_bp.route('/facultad/import', methods=['POST'])
+def importar():
+    return respuesta_importacion(Facultad, FacultadMapping)
+
+
+@facultad_bp.route('/facultad/_bulk', methods=['POST'])
+def crear_varios():
+    return crear_lote(Facultad, FacultadMapping)
+
+
+@facultad_bp.route('/facultad/_bulk', methods=['PUT'])
+def actualizar_varios():
+    return actualizar_lote(Facultad, FacultadMapping)
+
+
+@facultad_bp.route('/facultad/_bulk', methods=['DELETE'])
+def borrar_varios():
+    return eliminar_lote(Facultad)
+
+
 @facultad_bp.route('/facultad/<int:id>', methods=['PUT'])
 @validate_with(FacultadMapping)
 def actualizar(facultad, id):
@@ -0,0 +1,31 @@
+from flask import jsonify, request, current_app
+import csv
+import io
+import logging
+from app.services.importacion_service import ImportacionService, FORMATOS_IMPORTACION
+
+
+def respuesta_importacion(model, schema_cls):
+    """
+    POST /<entidad>/import: alta masiva desde un archivo NDJSON o CSV (con
+    encabezado) en el cuerpo. El formato sale de ?format= o del
+    Content-Type. El cuerpo se lee como stream, lote a lote.
+    """
+    formato = request.args.get('format', type=str)
+    if formato is None:
+        formato = "csv" if request.mimetype == FORMATOS_IMPORTACION["csv"] else "ndjson"
+    formato = formato.strip().lower()
+    if formato not in FORMATOS_IMPORTACION:
+        return jsonify({"error": f"format debe ser uno de {', '.join(FORMATOS_IMPORTACION)}"}), 400
+
+    stream = io.TextIOWrapper(request.stream, encoding="utf-8-sig", errors="replace", newline="")
+    try:
+        resumen = ImportacionService.importar(
+            model, schema_cls, ImportacionService.leer(stream, formato),
+            lote=current_app.config.get('IMPORT_BATCH_SIZE', 1000),
+            max_errores=current_app.config.get('IMPORT_MAX_ERRORS', 1000))
+    except csv.Error as e:
+        logging.error(f"CSV ilegible: {e}")
+        return jsonify({"error": f"CSV inválido: {e}"}), 400
+    return jsonify(resumen), 201 if resumen["creadas"] else 200
+
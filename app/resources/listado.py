@@ -0,0 +1,87 @@
+from flask import jsonify, request, current_app
+import json
+import logging
+from app.filters import compilar_filtros, FiltroInvalido
+from app.mapping import campos_pedidos, esquema
+from app.repositories.expansion import expansiones_pedidas
+from app.repositories.pagination import CONTEO_EXACTO, MODOS_CONTEO
+from app.utils.pagination import decodificar_cursor, ids_pedidos
+
+
+def respuesta_listado(model, schema_cls, listar, buscar_varios):
+    """
+    GET /<entidad>: listado paginado (X-page/X-per-page o X-cursor) con
+    X-filters, X-count, fields= y expand=, o multi-get con ?ids=1,2,3.
+    `listar` y `buscar_varios` son los métodos del servicio de la entidad
+    (p. ej. UniversidadService.listar_universidades / buscar_universidades).
+    """
+    page: int = request.headers.get('X-page', 1, type=int)
+    per_page: int = request.headers.get('X-per-page', 10, type=int)
+    filters_str: str | None = request.headers.get('X-filters', None, type=str)
+    cursor_str: str | None = request.headers.get('X-cursor', None, type=str)
+    conteo: str = request.headers.get('X-count', CONTEO_EXACTO, type=str).strip().lower()
+    if conteo not in MODOS_CONTEO:
+        return jsonify({"error": f"X-count debe ser uno de {', '.join(MODOS_CONTEO)}"}), 400
+    if page < 1 or per_page < 1:
+        return jsonify({"error": "X-page y X-per-page deben ser mayores o iguales a 1"}), 400
+
+    # Sparse fieldsets: fields=id,nombre (o X-fields) limita columnas del SELECT y del JSON;
+    # expand=<relación> anida relaciones cargadas con una consulta por nivel
+    try:
+        campos = campos_pedidos(schema_cls, request.args.get('fields') or request.headers.get('X-fields'))
+        expand = expansiones_pedidas(model, request.args.get('expand'))
+    except ValueError as e:
+        logging.error(f"fields/expand inválidos: {e}")
+        return jsonify({"error": str(e)}), 400
+    schema = esquema(schema_cls, campos, expand)
+
+    # Multi-get: ?ids=1,2,3 devuelve esas entidades en el orden pedido (sin paginar ni filtrar)
+    if request.args.get('ids') is not None:
+        try:
+            ids = ids_pedidos(request.args['ids'], current_app.config.get('MULTIGET_MAX_IDS', 100))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        encontradas = buscar_varios(ids, expand)
+        return {
+            "content": schema.dump([e for e in encontradas if e is not None], many=True),
+            "not_found": [id for id, e in zip(ids, encontradas) if e is None]
+        }, 200
+
+    # Modo cursor (opt-in): X-cursor: * para la primera página, luego el next_cursor recibido
+    after_id = None
+    if cursor_str is not None:
+        try:
+            after_id = decodificar_cursor(cursor_str)
+        except ValueError as e:
+            logging.error(f"Error al decodificar X-cursor: {e}")
+            return jsonify({"error": "Cursor inválido en X-cursor"}), 400
+
+    filters = []
+    if filters_str:
+        try:
+            filters = compilar_filtros(model, json.loads(filters_str), estricto=current_app.config.get('FILTERS_STRICT', False))
+        except json.JSONDecodeError as e:
+            logging.error(f"Error al decodificar X-filters: {e}")
+            return jsonify({"error": "Formato de filtros inválido en X-filters"}), 400
+        except FiltroInvalido as e:
+            logging.error(f"Filtro rechazado en X-filters: {e}")
+            return jsonify({"error": str(e)}), 400
+
+    logging.info("page: {}, per_page: {}, filters: {}".format(page, per_page, filters))
+
+    # El servicio devuelve un diccionario con 'content' y los datos de la página
+    pagination_data = listar(page=page, per_page=per_page, filters=filters, keyset=cursor_str is not None,
+                             after_id=after_id, conteo=conteo, campos=campos, expand=expand)
+    response = {
+        "content": schema.dump(pagination_data['content'], many=True),
+        "pageable": {
+            "page": pagination_data['page'],
+            "size": pagination_data['size'],
+            "total_elements": pagination_data['total_elements'],
+            "total_pages": pagination_data['total_pages'],
+            "total_elements_exact": pagination_data['total_elements_exact']
+        }
+    }
+    if 'next_cursor' in pagination_data:
+        response['pageable']['next_cursor'] = pagination_data['next_cursor']
+    return response, 200
@@ -0,0 +1,71 @@
+from flask import jsonify, request, current_app
+import logging
+from marshmallow import ValidationError
+from app.repositories.lote_repository import ConflictoLote
+from app.services.lote_service import LoteService
+
+
+def _items():
+    """Cuerpo JSON del lote: un arreglo no vacío de hasta BULK_MAX_ITEMS elementos."""
+    items = request.get_json(silent=True)
+    maximo = current_app.config.get('BULK_MAX_ITEMS', 1000)
+    if not isinstance(items, list) or not items:
+        raise ValueError("Se esperaba un arreglo JSON no vacío")
+    if len(items) > maximo:
+        raise ValueError(f"Como máximo {maximo} elementos por lote")
+    return items
+
+
+def crear_lote(model, schema_cls):
+    """POST /<entidad>/_bulk: arreglo de objetos; se crean todos o ninguno."""
+    try:
+        entities = schema_cls(many=True).load(_items())
+        ids = LoteService.crear(model, entities)
+    except ValidationError as err:
+        return jsonify(err.messages), 400
+    except ConflictoLote as e:
+        logging.error(f"Lote rechazado: {e}")
+        return jsonify({"error": str(e)}), 409
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"ids": ids}), 201
+
+
+def actualizar_lote(model, schema_cls):
+    """PUT /<entidad>/_bulk: arreglo de objetos completos con su `id`."""
+    try:
+        items = _items()
+        ids = [item.get("id") if isinstance(item, dict) else None for item in items]
+        invalidos = {i: {"id": ["Se requiere un id entero"]} for i, id in enumerate(ids)
+                     if not isinstance(id, int) or isinstance(id, bool)}
+        if invalidos:
+            raise ValidationError(invalidos)
+        if len(set(ids)) != len(ids):
+            raise ValueError("Hay ids repetidos en el lote")
+        entities = schema_cls(many=True).load([{k: v for k, v in item.items() if k != "id"} for item in items])
+        faltantes = LoteService.actualizar(model, dict(zip(ids, entities)))
+    except ValidationError as err:
+        return jsonify(err.messages), 400
+    except ConflictoLote as e:
+        logging.error(f"Lote rechazado: {e}")
+        return jsonify({"error": str(e)}), 409
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if faltantes:
+        return jsonify({"error": f"{model.__name__} no encontrada", "ids": faltantes}), 404
+    return jsonify({"ids": ids}), 200
+
+
+def eliminar_lote(model):
+    """DELETE /<entidad>/_bulk: arreglo de ids; los inexistentes se ignoran, como en el DELETE individual."""
+    try:
+        ids = _items()
+        if not all(isinstance(id, int) and not isinstance(id, bool) for id in ids):
+            raise ValueError("Se esperaba un arreglo de ids enteros")
+        borrados = LoteService.eliminar(model, sorted(set(ids)))
+    except ConflictoLote as e:
+        logging.error(f"Lote rechazado: {e}")
+        return jsonify({"error": str(e)}), 409
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"ids": borrados}), 200
@@ -0,0 +1,12 @@
+from flask import Blueprint, Response
+from app.metrics import CONTENT_TYPE
+
+
+metricas_bp = Blueprint('metricas', __name__)
+
+
+# Formato de texto de Prometheus; con PROMETHEUS_MULTIPROC_DIR, las de todos los workers (ver Registro).
+@metricas_bp.route('/metrics', methods=['GET'])
+def exportar_metricas():
+    from app import metricas
+    return Response(metricas.exportar(), content_type=CONTENT_TYPE)
@@ -1,78 +1,70 @@
-from flask import jsonify, Blueprint, request 
-from app.mapping import UniversidadMapping
+from flask import jsonify, Blueprint, request, Response
+from app.mapping import UniversidadMapping, FacultadMapping, EspecialidadMapping
 from app.services.universidad_service import UniversidadService
+from app.models import Universidad
 from markupsafe import escape
 import json
-import logging
 from app.validators import validate_with
-from app import cache
+from app.caching import EntityCache, cached_view, LIST_HEADERS
+from app.mapping import campos_pedidos, esquema
+from app.repositories.expansion import expansiones_pedidas, tags_expansion
+from app.resources.exportacion import respuesta_exportacion
+from app.resources.listado import respuesta_listado
+from app.resources.importacion import respuesta_importacion
+from app.resources.lote import crear_lote, actualizar_lote, eliminar_lote
 
-from typing import Dict, Any, List
 
 universidad_bp = Blueprint('universidad', __name__)
 
 universidad_mapping = UniversidadMapping()
 
-def format_filters_for_sqlalchemy(filters_dict: Dict[str, Any]) -> List:
-    """
-    Convierte un diccionario simple (desde el header X-filters) 
-    al formato de lista de diccionarios que espera sqlalchemy-filters.
-    Por defecto, usa la operación de igualdad '=='.
-    """
-    filters_list = []
-    if filters_dict:
-        for key, value in filters_dict.items():
-            filters_list.append({
-                "field": key,
-                "op": "==", 
-                "value": value
-            })
-    return filters_list
+@universidad_bp.route('/universidad/export', methods=['GET'])
+def exportar():
+    # Sin cached_view: la respuesta es streaming y puede ser de toda la tabla
+    return respuesta_exportacion(Universidad, UniversidadMapping)
+
 
 @universidad_bp.route('/universidad/<int:id>', methods=['GET'])
-@cache.cached(timeout=60)
+# Sin expand la entidad sale del cache de entidades (LRU local + Redis): sólo se cachea la vista con expand
+@cached_view(lambda id: [EntityCache.tag(Universidad, id), *tags_expansion(Universidad, request.args.get('expand'))],
+             vary=("X-fields",), solo_si=lambda id: request.args.get('expand') is not None)
 def buscar_por_id(id):
-    universidad = UniversidadService.buscar_universidad(id)
+    try:
+        campos = campos_pedidos(UniversidadMapping, request.args.get('fields') or request.headers.get('X-fields'))
+        expand = expansiones_pedidas(Universidad, request.args.get('expand'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    universidad = UniversidadService.buscar_universidad(id, expand)
     if universidad is None:
         return jsonify({"error": "Universidad no encontrada"}), 404
-    return universidad_mapping.dump(universidad), 200
+    return esquema(UniversidadMapping, campos, expand).dump(universidad), 200
 
 
 @universidad_bp.route('/universidad', methods=['GET'])
+@cached_view(lambda: [EntityCache.tag_tabla(Universidad), *tags_expansion(Universidad, request.args.get('expand'))],
+             vary=LIST_HEADERS)
 def listar_universidades():
-    page: int = request.headers.get('X-page', 1, type=int)
-    per_page: int = request.headers.get('X-per-page', 10, type=int) 
-    filters_str : str|None = request.headers.get('X-filters', None, type=str) 
-    
-    filters = []
-    if filters_str:
-        try:
-            filters_dict = json.loads(filters_str)
-            # 1. Aplicamos el formateo antes de pasar el filtro al servicio/repositorio
-            filters = format_filters_for_sqlalchemy(filters_dict)
-        except json.JSONDecodeError as e:
-            logging.error(f"Error al decodificar X-filters: {e}")
-            return jsonify({"error": "Formato de filtros inválido en X-filters"}), 400
-    
-    logging.info("page: {}, per_page: {}, filters: {}".format(page, per_page, filters))
-
-    # 2. El servicio ahora devuelve un diccionario con 'content' y 'pageable'
-    pagination_data = UniversidadService.listar_universidades(page=page, per_page=per_page, filters=filters)
-    
-    # 3. Serializar solo el contenido y construir la respuesta completa
-    content = universidad_mapping.dump(pagination_data['content'], many=True)
-    
-    response = {
-        "content": content,
-        "pageable": {
-            "page": pagination_data['page'],
-            "size": pagination_data['size'],
-            "total_elements": pagination_data['total_elements'],
-            "total_pages": pagination_data['total_pages']
-        }
-    }
-    
-    return jsonify(response), 200
+    return respuesta_listado(Universidad, UniversidadMapping, UniversidadService.listar_universidades, UniversidadService.buscar_universidades)
+
+@universidad_bp.route('/universidad/<int:id>/arbol', methods=['GET'])
+def arbol(id):
+    # Sin cached_view: el JSON ya serializado vive en el cache de entidades (un solo GET por hit)
+    datos = UniversidadService.obtener_arbol(id, serializar_arbol)
+    if datos is None:
+        return jsonify({"error": "Universidad no encontrada"}), 404
+    return Response(datos, status=200, mimetype='application/json')
+
+
+def serializar_arbol(arbol) -> bytes:
+    universidad, facultades, especialidades = arbol
+    por_facultad = {}
+    for especialidad in esquema(EspecialidadMapping).dump(especialidades, many=True):
+        por_facultad.setdefault(especialidad["facultad_id"], []).append(especialidad)
+    data = esquema(UniversidadMapping).dump(universidad)
+    data["facultades"] = esquema(FacultadMapping).dump(facultades, many=True)
+    for facultad in data["facultades"]:
+        facultad["especialidades"] = por_facultad.get(facultad["id"], [])
+    return json.dumps(data, separators=(",", ":")).encode()
 
 @universidad_bp.route('/universidad', methods=['POST']) 
 @validate_with(UniversidadMapping)
@@ -80,6 +72,26 @@ def crear(universidad):
     UniversidadService.crear_universidad(universidad)
     return jsonify("Universidad creada exitosamente"), 201 
 
+@universidad_bp.route('/universidad/import', methods=['POST'])
+def importar():
+    return respuesta_importacion(Universidad, UniversidadMapping)
+
+
+@universidad_bp.route('/universidad/_bulk', methods=['POST'])
+def crear_varios():
+    return crear_lote(Universidad, UniversidadMapping)
+
+
+@universidad_bp.route('/universidad/_bulk', methods=['PUT'])
+def actualizar_varios():
+    return actualizar_lote(Universidad, UniversidadMapping)
+
+
+@universidad_bp.route('/universidad/_bulk', methods=['DELETE'])
+def borrar_varios():
+    return eliminar_lote(Universidad)
+
+
 @universidad_bp.route('/universidad/<int:id>', methods=['PUT'])
 @validate_with(UniversidadMapping)
 def actualizar(universidad, id):
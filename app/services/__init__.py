@@ -3,4 +3,8 @@ from .facultad_service import FacultadService
 from .universidad_service import UniversidadService
 from .universidad_service import UniversidadService 
 from .especilidad_service import EspecialidadService
-
+from .busqueda_service import BusquedaService
+from .autocompletado_service import AutocompletadoService
+from .exportacion_service import ExportacionService
+from .importacion_service import ImportacionService
+from .lote_service import LoteService
@@ -0,0 +1,34 @@
+from typing import Any, Dict, Optional
+from app import autocompletado, entity_cache
+from app.models import Universidad, Facultad, Especialidad
+from app.repositories.autocompletado_repository import AutocompletadoRepository
+
+MODELOS = {"universidad": Universidad, "facultad": Facultad, "especialidad": Especialidad}
+LIMITE_POR_DEFECTO = 10
+LIMITE_MAXIMO = 25
+
+
+class AutocompletadoService:
+
+    @staticmethod
+    def sugerir(q: str, entidad: Optional[str] = None, limite: int = LIMITE_POR_DEFECTO) -> Dict[str, Any]:
+        """
+        Sugerencias por prefijo de nombre o sigla desde el índice en memoria.
+        Sin `entidad` se consultan todas las indexadas, en ese orden.
+        """
+        entidades = autocompletado.entidades()
+        if entidad is not None and entidad not in entidades:
+            raise ValueError(f"entidad debe ser una de {', '.join(entidades)}")
+        limite = max(1, min(limite, LIMITE_MAXIMO))
+
+        # arranca (una vez por worker) la escucha de cambios de otros procesos
+        entity_cache.bus.asegurar_escucha()
+        content = []
+        for nombre in ([entidad] if entidad else entidades):
+            model = MODELOS[nombre]
+            autocompletado.sincronizar(nombre, lambda ids: AutocompletadoRepository.documentos(model, ids))
+            for id, nombre_doc, sigla in autocompletado.buscar(nombre, q, limite - len(content)):
+                content.append({"entidad": nombre, "id": id, "nombre": nombre_doc, "sigla": sigla})
+            if len(content) >= limite:
+                break
+        return {"q": q, "size": limite, "content": content}
@@ -0,0 +1,23 @@
+from typing import Any, Dict, Optional
+import logging
+from app.models import ENTIDADES_BUSQUEDA
+from app.repositories.busqueda_repository import BusquedaRepository
+
+LIMITE_POR_DEFECTO = 20
+LIMITE_MAXIMO = 50
+
+
+class BusquedaService:
+
+    @staticmethod
+    def buscar(q: str, limite: int = LIMITE_POR_DEFECTO, entidad: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Búsqueda de texto sobre universidades, facultades y especialidades.
+        El límite se acota a LIMITE_MAXIMO; `entidad` restringe a un tipo.
+        """
+        if entidad is not None and entidad not in ENTIDADES_BUSQUEDA:
+            raise ValueError(f"entidad debe ser una de {', '.join(ENTIDADES_BUSQUEDA)}")
+        limite = max(1, min(limite, LIMITE_MAXIMO))
+        logging.info(f"Buscando '{q}' (limite: {limite}, entidad: {entidad})")
+        resultados = BusquedaRepository.buscar(q, limite, entidad)
+        return {"q": q, "size": limite, "content": resultados}
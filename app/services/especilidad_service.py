@@ -1,30 +1,47 @@
 from app.repositories.especialidad_repository import EspecialidadRepository
+from app.repositories.pagination import CONTEO_EXACTO
 from app.models import Especialidad
 import logging
-import math
 from app.utils.retry import retry
+from app.utils.pagination import codificar_cursor, total_paginas
 
 
 class EspecialidadService:
+    # Sólo las lecturas se reintentan: si la conexión se corta después del
+    # COMMIT, reintentar un alta la insertaría dos veces.
 
     @staticmethod
     @retry(max_attempts=3, delay=1.0)
-    def listar_especialidades(page: int = 1, per_page: int = 10, filters: list = None):
-        especialidades = EspecialidadRepository.listar_especialidades(page, per_page, filters)
-        total_elements = EspecialidadRepository.contar_especialidades(filters)
+    def listar_especialidades(page: int = 1, per_page: int = 10, filters: list = None,
+                              keyset: bool = False, after_id: int = None, conteo: str = CONTEO_EXACTO, campos: tuple = None, expand: tuple = ()):
+        next_cursor = None
+        if keyset:
+            especialidades, total_elements, total_exacto = EspecialidadRepository.listar_especialidades_con_total(
+                1, per_page + 1, filters, after_id=after_id, conteo=conteo, campos=campos, expand=expand)
+            if len(especialidades) > per_page:
+                especialidades = especialidades[:per_page]
+                if especialidades:
+                    next_cursor = codificar_cursor(especialidades[-1].id)
+            page = None
+        else:
+            especialidades, total_elements, total_exacto = EspecialidadRepository.listar_especialidades_con_total(
+                page, per_page, filters, conteo=conteo, campos=campos, expand=expand)
 
-        total_pages = math.ceil(total_elements / per_page) if per_page > 0 else 0
+        total_pages = total_paginas(total_elements, per_page)
 
-        return {
+        resultado = {
             "content": especialidades,
             "page": page,
             "size": per_page,
             "total_elements": total_elements,
-            "total_pages": total_pages
+            "total_pages": total_pages,
+            "total_elements_exact": total_exacto
         }
+        if keyset:
+            resultado["next_cursor"] = next_cursor
+        return resultado
 
     @staticmethod
-    @retry(max_attempts=3, delay=1.0)
     def crear_especialidad(especialidad: Especialidad):
         creada = EspecialidadRepository.crear_especialidad(especialidad)
         logging.info(f"Especialidad creada con id {creada.id}")
@@ -32,11 +49,15 @@ class EspecialidadService:
 
     @staticmethod
     @retry(max_attempts=3, delay=1.0)
-    def buscar_especialidad(id: int):
-        return EspecialidadRepository.buscar_especialidad(id)
+    def buscar_especialidad(id: int, expand: tuple = ()):
+        return EspecialidadRepository.buscar_especialidad(id, expand)
 
     @staticmethod
     @retry(max_attempts=3, delay=1.0)
+    def buscar_especialidades(ids: list, expand: tuple = ()):
+        return EspecialidadRepository.buscar_especialidades(ids, expand)
+
+    @staticmethod
     def actualizar_especialidad(especialidad: Especialidad, id: int):
         actualizada = EspecialidadRepository.actualizar_especialidad(especialidad, id)
         if actualizada:
@@ -46,7 +67,6 @@ class EspecialidadService:
         return actualizada
 
     @staticmethod
-    @retry(max_attempts=3, delay=1.0)
     def eliminar_especialidad(id: int):
         EspecialidadRepository.eliminar_especialidad(id)
         logging.info(f"Especialidad {id} eliminada (si existía)")
@@ -0,0 +1,60 @@
+import csv
+import io
+import json
+import logging
+from typing import Iterator, Optional, Sequence
+from app.repositories.exportacion_repository import ExportacionRepository
+
+FORMATOS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+# json.dumps con argumentos arma un encoder por llamada; se reutiliza uno.
+_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+class ExportacionService:
+
+    @staticmethod
+    def exportar(model, columnas: Sequence[str], formato: str = "ndjson", filters: Optional[list] = None,
+                 lote: int = 1000) -> Iterator[str]:
+        """
+        Genera la exportación en trozos de a `lote` filas (NDJSON: un objeto
+        JSON por línea; CSV: encabezado y una fila por línea). Pensado para
+        una respuesta streaming: nunca hay más de un lote en memoria.
+        """
+        if formato not in FORMATOS:
+            raise ValueError(f"format debe ser uno de {', '.join(FORMATOS)}")
+        filas = ExportacionRepository.filas(model, columnas, filters, lote)
+        escribir = ExportacionService._ndjson if formato == "ndjson" else ExportacionService._csv
+        return escribir(filas, list(columnas), lote)
+
+    @staticmethod
+    def _ndjson(filas, columnas, lote) -> Iterator[str]:
+        trozo, total = [], 0
+        for fila in filas:
+            trozo.append(_ENCODER.encode(dict(zip(columnas, fila))))
+            if len(trozo) >= lote:
+                total += len(trozo)
+                yield "\n".join(trozo) + "\n"
+                trozo = []
+        if trozo:
+            total += len(trozo)
+            yield "\n".join(trozo) + "\n"
+        logging.info(f"Exportación NDJSON: {total} filas")
+
+    @staticmethod
+    def _csv(filas, columnas, lote) -> Iterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(columnas)
+        pendientes, total = 0, 0
+        for fila in filas:
+            writer.writerow(fila)
+            pendientes += 1
+            if pendientes >= lote:
+                total += pendientes
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                pendientes = 0
+        total += pendientes
+        yield buffer.getvalue()
+        logging.info(f"Exportación CSV: {total} filas")
@@ -1,22 +1,20 @@
 from app.models import Facultad
 from app.repositories import FacultadRepository
+from app.repositories.pagination import CONTEO_EXACTO
 from typing import Optional, List, Dict, Any
-import requests
+from app import especialidad_client
 from app.utils.retry import retry
 import logging
-import math
+from app.utils.pagination import codificar_cursor, total_paginas
 
 class FacultadService:
   @retry(max_attempts=3, delay=1)
   def obtener_especialidad(self, id):
-        url = f"http://especialidad:5000/api/especialidades/{id}"
+        return especialidad_client.obtener(id)
 
-        response = requests.get(url, timeout=5)
-
-        if response.status_code != 200:
-            raise Exception(f"Error HTTP {response.status_code} en Especialidad")
-
-        return response.json()
+  def obtener_especialidades(self, ids):
+        """Varias especialidades del servicio en paralelo: {id: datos o None}."""
+        return especialidad_client.obtener_varios(ids)
 
   @staticmethod
   def crear_facultad(facultad: Facultad):
@@ -24,44 +22,66 @@ class FacultadService:
     return facultad
   
   @staticmethod
-  def listar_facultades(page: int = 1, per_page: int = 10, filters: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+  def listar_facultades(page: int = 1, per_page: int = 10, filters: Optional[List[Dict[str, Any]]] = None,
+                        keyset: bool = False, after_id: Optional[int] = None,
+                        conteo: str = CONTEO_EXACTO, campos: Optional[tuple] = None, expand: tuple = ()) -> Dict[str, Any]:
     """
     Lista facultades, aplica paginación, y devuelve los metadatos asociados.
+    La página y el total se obtienen en una sola consulta.
 
     Args:
         page: Número de página (base 1).
         per_page: Cantidad de elementos por página.
         filters: Lista de diccionarios en formato sqlalchemy-filters.
+        keyset: Si es True pagina por cursor (ignora page).
+        after_id: En modo cursor, id del último elemento de la página anterior.
+        conteo: 'exact', 'none' (sin total) o 'estimated'.
+        campos: Si se indica, sólo se cargan esas columnas (sparse fieldsets).
+        expand: Relaciones a cargar con una consulta por nivel (p. ej. 'especialidades').
 
     Returns:
-        Un diccionario con la lista de facultades en 'content' y los metadatos de paginación.
+        Un diccionario con la lista de facultades en 'content' y los metadatos de paginación
+        (en modo cursor, 'next_cursor' con el cursor de la página siguiente o None).
     """
     logging.info("page: {}, per_page: {}, filters: {}".format(page, per_page, filters))
-    facultades: List[Facultad] = FacultadRepository.listar_facultades(page, per_page, filters)
-    total_elements: int = FacultadRepository.contar_facultades(filters)
-
-    if per_page > 0:
-        total_pages = math.ceil(total_elements / per_page)
+    next_cursor = None
+    if keyset:
+      facultades, total_elements, total_exacto = FacultadRepository.listar_facultades_con_total(
+          1, per_page + 1, filters, after_id=after_id, conteo=conteo, campos=campos, expand=expand)
+      if len(facultades) > per_page:
+        facultades = facultades[:per_page]
+        if facultades:
+          next_cursor = codificar_cursor(facultades[-1].id)
+      page = None
     else:
-        total_pages = 0
+      facultades, total_elements, total_exacto = FacultadRepository.listar_facultades_con_total(page, per_page, filters, conteo=conteo, campos=campos, expand=expand)
+
+    total_pages = total_paginas(total_elements, per_page)
 
-    return {
+    resultado = {
         'content': facultades,
         'page': page,
         'size': per_page,
         'total_elements': total_elements,
-        'total_pages': total_pages
+        'total_pages': total_pages,
+        'total_elements_exact': total_exacto
     }
+    if keyset:
+      resultado['next_cursor'] = next_cursor
+    return resultado
 
   @staticmethod
-  def buscar_facultad(id: int):
-    facultad = FacultadRepository.buscar_facultad(id)
+  def buscar_facultad(id: int, expand: tuple = ()):
+    facultad = FacultadRepository.buscar_facultad(id, expand)
     return facultad
+
+  @staticmethod
+  def buscar_facultades(ids: list, expand: tuple = ()):
+    return FacultadRepository.buscar_facultades(ids, expand)
     
   @staticmethod
-  def actualizar_facultad(facultad: Facultad, id: int):
-    FacultadRepository.actualizar_facultad(facultad, id)
-    return facultad
+  def actualizar_facultad(facultad: Facultad, id: int) -> Optional[Facultad]:
+    return FacultadRepository.actualizar_facultad(facultad, id)
   
   @staticmethod
   def eliminar_facultad(id: int):
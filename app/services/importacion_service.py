@@ -0,0 +1,106 @@
+import csv
+import json
+import logging
+from itertools import islice
+from typing import IO, Iterable, Iterator, Optional, Tuple
+from marshmallow import ValidationError
+from app.repositories.importacion_repository import ImportacionRepository, REFERENCIAS
+
+FORMATOS_IMPORTACION = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+# (número de fila en el archivo, registro; None si la línea no se pudo leer)
+Registro = Tuple[int, Optional[dict]]
+
+
+class ImportacionService:
+
+    @staticmethod
+    def leer(stream: IO[str], formato: str) -> Iterator[Registro]:
+        if formato not in FORMATOS_IMPORTACION:
+            raise ValueError(f"format debe ser uno de {', '.join(FORMATOS_IMPORTACION)}")
+        return ImportacionService._ndjson(stream) if formato == "ndjson" else ImportacionService._csv(stream)
+
+    @staticmethod
+    def _ndjson(stream: IO[str]) -> Iterator[Registro]:
+        for numero, linea in enumerate(stream, start=1):
+            if not linea.strip():
+                continue
+            try:
+                registro = json.loads(linea)
+            except json.JSONDecodeError:
+                registro = None
+            yield numero, registro if isinstance(registro, dict) else None
+
+    @staticmethod
+    def _csv(stream: IO[str]) -> Iterator[Registro]:
+        # Filas numeradas desde 1 sin contar el encabezado.
+        for numero, fila in enumerate(csv.DictReader(stream), start=1):
+            # columnas de más quedan bajo None, de menos con valor None
+            yield numero, None if None in fila or None in fila.values() else fila
+
+    @staticmethod
+    def importar(model, schema_cls, registros: Iterable[Registro], lote: int = 1000,
+                 max_errores: int = 1000) -> dict:
+        """
+        Valida e inserta los registros de a `lote`, con un commit por lote:
+        un error en una fila no descarta el resto del archivo. Devuelve el
+        resumen con las filas rechazadas y el motivo (hasta `max_errores`).
+        """
+        schema = schema_cls(many=True)
+        resumen = {"procesadas": 0, "creadas": 0, "rechazadas": 0, "lotes": 0, "errores": [], "errores_omitidos": 0}
+        registros = iter(registros)
+        while True:
+            bloque = list(islice(registros, lote))
+            if not bloque:
+                break
+            resumen["lotes"] += 1
+            resumen["procesadas"] += len(bloque)
+            errores, numeros, entities = ImportacionService._validar(model, schema, bloque)
+            try:
+                rechazadas = ImportacionRepository.insertar(model, entities)
+            except Exception:
+                ImportacionRepository.descartar()
+                logging.exception(f"Importación de {model.__name__} abortada en el lote {resumen['lotes']}")
+                raise
+            for i, error in rechazadas.items():
+                errores[numeros[i]] = {"_base": [error]}
+            creadas = [entity for i, entity in enumerate(entities) if i not in rechazadas]
+            ImportacionRepository.confirmar(model, creadas)
+
+            resumen["creadas"] += len(creadas)
+            resumen["rechazadas"] += len(errores)
+            for numero in sorted(errores):
+                if len(resumen["errores"]) < max_errores:
+                    resumen["errores"].append({"fila": numero, "errores": errores[numero]})
+                else:
+                    resumen["errores_omitidos"] += 1
+        logging.info(f"Importación de {model.__name__}: {resumen['creadas']} creadas, "
+                     f"{resumen['rechazadas']} rechazadas en {resumen['lotes']} lotes")
+        return resumen
+
+    @staticmethod
+    def _validar(model, schema, bloque):
+        """Valida el lote con el schema (many=True) y las claves foráneas con una sola consulta."""
+        errores = {numero: {"_base": ["Registro ilegible"]} for numero, registro in bloque if registro is None}
+        legibles = [(numero, registro) for numero, registro in bloque if registro is not None]
+        try:
+            entities = schema.load([registro for _, registro in legibles])
+        except ValidationError as e:
+            for i, mensajes in e.messages.items():
+                errores[legibles[i][0]] = mensajes
+            legibles = [legible for i, legible in enumerate(legibles) if i not in e.messages]
+            entities = schema.load([registro for _, registro in legibles])
+        numeros = [numero for numero, _ in legibles]
+
+        if model in REFERENCIAS:
+            campo, referido = REFERENCIAS[model]
+            existentes = ImportacionRepository.existentes(referido, (getattr(e, campo) for e in entities))
+            validas = []
+            for numero, entity in zip(numeros, entities):
+                if getattr(entity, campo) in existentes:
+                    validas.append((numero, entity))
+                else:
+                    errores[numero] = {campo: [f"No existe {referido.__name__.lower()} con id {getattr(entity, campo)}"]}
+            numeros = [numero for numero, _ in validas]
+            entities = [entity for _, entity in validas]
+        return errores, numeros, entities
@@ -0,0 +1,26 @@
+import logging
+from typing import Dict, List
+from app.repositories.lote_repository import LoteRepository
+
+
+class LoteService:
+
+    @staticmethod
+    def crear(model, entities: List) -> List[int]:
+        ids = LoteRepository.crear(model, entities)
+        logging.info(f"{len(ids)} {model.__name__} creadas en lote")
+        return ids
+
+    @staticmethod
+    def actualizar(model, cambios: Dict[int, object]) -> List[int]:
+        """Devuelve los ids inexistentes (si hay alguno no se actualiza nada)."""
+        faltantes = LoteRepository.actualizar(model, cambios)
+        if not faltantes:
+            logging.info(f"{len(cambios)} {model.__name__} actualizadas en lote")
+        return faltantes
+
+    @staticmethod
+    def eliminar(model, ids: List[int]) -> List[int]:
+        borrados = LoteRepository.eliminar(model, ids)
+        logging.info(f"{len(borrados)} {model.__name__} borradas en lote")
+        return borrados
@@ -1,8 +1,9 @@
 from app.models import Universidad
-from app.repositories import UniversidadRepository
-from typing import Optional, List, Dict, Any   
-import math
+from app.repositories import UniversidadRepository, ArbolRepository
+from app.repositories.pagination import CONTEO_EXACTO
+from typing import Optional, List, Dict, Any, Callable
 import logging
+from app.utils.pagination import codificar_cursor, total_paginas
 
 class UniversidadService:
 
@@ -12,33 +13,66 @@ class UniversidadService:
         return universidad
 
     @staticmethod
-    def listar_universidades(page: int = 1, per_page: int = 10, filters: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
-        
-        universidades: List[Universidad] = UniversidadRepository.listar_universidades(page, per_page, filters)
-        total_elements: int = UniversidadRepository.contar_universidades(filters)
-
-        if per_page > 0:
-            total_pages = math.ceil(total_elements / per_page)
+    def listar_universidades(page: int = 1, per_page: int = 10, filters: Optional[List[Dict[str, Any]]] = None,
+                             keyset: bool = False, after_id: Optional[int] = None,
+                             conteo: str = CONTEO_EXACTO, campos: Optional[tuple] = None, expand: tuple = ()) -> Dict[str, Any]:
+        """
+        Con keyset=True pagina por cursor: devuelve los per_page elementos con
+        id mayor a after_id y el cursor de la página siguiente ('next_cursor').
+        conteo ('exact', 'none' o 'estimated') define cómo se calcula el total;
+        con 'none' total_elements y total_pages son None. Con campos sólo se
+        cargan esas columnas; expand carga esas relaciones con una consulta por nivel.
+        """
+        next_cursor = None
+        if keyset:
+            # se pide uno de más para saber si hay página siguiente
+            universidades, total_elements, total_exacto = UniversidadRepository.listar_universidades_con_total(
+                1, per_page + 1, filters, after_id=after_id, conteo=conteo, campos=campos, expand=expand)
+            if len(universidades) > per_page:
+                universidades = universidades[:per_page]
+                if universidades:
+                    next_cursor = codificar_cursor(universidades[-1].id)
+            page = None
         else:
-            total_pages = 0
+            universidades, total_elements, total_exacto = UniversidadRepository.listar_universidades_con_total(
+                page, per_page, filters, conteo=conteo, campos=campos, expand=expand)
+
+        total_pages = total_paginas(total_elements, per_page)
 
-        return {
+        resultado = {
             'content': universidades,
             'page': page,
             'size': per_page,
             'total_elements': total_elements,
-            'total_pages': total_pages
+            'total_pages': total_pages,
+            'total_elements_exact': total_exacto
         }
+        if keyset:
+            resultado['next_cursor'] = next_cursor
+        return resultado
 
     @staticmethod
-    def buscar_universidad(universidad_id: int) -> Optional[Universidad]:
+    def buscar_universidad(universidad_id: int, expand: tuple = ()) -> Optional[Universidad]:
         logging.info(f"Buscando universidad con id {universidad_id}")
-        return UniversidadRepository.buscar_universidad(universidad_id)
+        return UniversidadRepository.buscar_universidad(universidad_id, expand)
+
+    @staticmethod
+    def buscar_universidades(ids: list, expand: tuple = ()) -> list:
+        logging.info(f"Buscando {len(ids)} universidades por id")
+        return UniversidadRepository.buscar_universidades(ids, expand)
+
+    @staticmethod
+    def obtener_arbol(universidad_id: int, serializar: Callable[[tuple], bytes]) -> Optional[bytes]:
+        """
+        JSON del árbol universidad -> facultades -> especialidades. `serializar`
+        recibe (universidad, facultades, especialidades) y devuelve los bytes
+        que se cachean y se responden tal cual. None si la universidad no existe.
+        """
+        return ArbolRepository.arbol(universidad_id, serializar)
 
     @staticmethod
     def actualizar_universidad(universidad: Universidad, universidad_id: int) -> Optional[Universidad]:
-        UniversidadRepository.actualizar_universidad(universidad, universidad_id)
-        return universidad
+        return UniversidadRepository.actualizar_universidad(universidad, universidad_id)
 
     @staticmethod
     def eliminar_universidad(universidad_id: int) -> Optional[Universidad]:
@@ -0,0 +1,116 @@
+import logging
+import os
+import threading
+import time
+from typing import Callable, List, Optional, Tuple, Type
+
+
+class CircuitoAbierto(Exception):
+    """El circuito está abierto: la dependencia se da por caída y no se la llama."""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker para una dependencia externa (Redis, otro servicio).
+
+    Cerrado, las llamadas pasan; tras `umbral` fallas seguidas (sólo cuentan
+    las excepciones de `errores` para las que `es_falla` da True, p. ej.
+    conexión, timeout o un 5xx pero no un 404) se abre y `llamar` responde
+    CircuitoAbierto al instante, sin esperar timeouts.
+    Mientras está abierto, un hilo daemon ejecuta `sondeo()` cada
+    `intervalo` segundos y cierra el circuito en cuanto responde; no se
+    dejan pasar requests de prueba. `al_abrir` y `al_cerrar` son callbacks
+    de las transiciones (p. ej. reaplicar invalidaciones pendientes).
+    """
+
+    CERRADO = "cerrado"
+    ABIERTO = "abierto"
+
+    def __init__(self, nombre: str, sondeo: Callable[[], object], umbral: int = 5, intervalo: float = 5.0,
+                 errores: Tuple[Type[BaseException], ...] = (Exception,),
+                 es_falla: Optional[Callable[[BaseException], bool]] = None):
+        self.nombre = nombre
+        self.sondeo = sondeo
+        self.umbral = umbral
+        self.intervalo = intervalo
+        self.errores = errores
+        self.es_falla = es_falla
+        self.estado = self.CERRADO
+        self.fallas = 0
+        self.aperturas = 0
+        self.al_abrir: List[Callable[[], None]] = []
+        self.al_cerrar: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+        self._sondeo_pid = None
+
+    @property
+    def abierto(self) -> bool:
+        if self.estado == self.ABIERTO:
+            # El hilo de sondeo no sobrevive al fork de los workers de gunicorn.
+            self._asegurar_sondeo()
+            return True
+        return False
+
+    def llamar(self, funcion: Callable, *args, **kwargs):
+        if self.abierto:
+            raise CircuitoAbierto(self.nombre)
+        try:
+            resultado = funcion(*args, **kwargs)
+        except self.errores as e:
+            if self.es_falla is None or self.es_falla(e):
+                self.falla(e)
+            else:
+                self.exito()
+            raise
+        self.exito()
+        return resultado
+
+    def exito(self) -> None:
+        self.fallas = 0
+
+    def falla(self, error: BaseException) -> None:
+        with self._lock:
+            self.fallas += 1
+            if self.estado == self.ABIERTO or self.fallas < self.umbral:
+                return
+            self.estado = self.ABIERTO
+            self.aperturas += 1
+        logging.error(f"[BREAKER] {self.nombre}: abierto tras {self.umbral} fallas seguidas ({error})")
+        self._notificar(self.al_abrir)
+        self._asegurar_sondeo()
+
+    def cerrar(self) -> None:
+        with self._lock:
+            if self.estado == self.CERRADO:
+                return
+            self.estado = self.CERRADO
+            self.fallas = 0
+        logging.warning(f"[BREAKER] {self.nombre}: cerrado, la dependencia volvió a responder")
+        self._notificar(self.al_cerrar)
+
+    def _asegurar_sondeo(self) -> None:
+        if self._sondeo_pid == os.getpid():
+            return
+        with self._lock:
+            if self._sondeo_pid == os.getpid():
+                return
+            self._sondeo_pid = os.getpid()
+        threading.Thread(target=self._sondear, name=f"breaker-{self.nombre}", daemon=True).start()
+
+    def _sondear(self) -> None:
+        while self.estado == self.ABIERTO:
+            time.sleep(self.intervalo)
+            try:
+                self.sondeo()
+            except Exception as e:
+                logging.debug(f"[BREAKER] {self.nombre}: sondeo fallido ({e})")
+                continue
+            self.cerrar()
+        self._sondeo_pid = None
+
+    def _notificar(self, callbacks) -> None:
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logging.warning(f"[BREAKER] {self.nombre}: error en callback: {e}")
@@ -0,0 +1,61 @@
+import base64
+import json
+import math
+from typing import List, Optional
+
+# Valor de X-cursor que pide la primera página en modo cursor.
+CURSOR_INICIO = "*"
+
+
+def codificar_cursor(ultimo_id: int) -> str:
+    """Cursor opaco para el cliente: posición (id) del último elemento devuelto."""
+    raw = json.dumps({"id": ultimo_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def total_paginas(total_elements: Optional[int], per_page: int) -> Optional[int]:
+    """Páginas de per_page elementos para total_elements (None si no se contó)."""
+    if total_elements is None:
+        return None
+    return math.ceil(total_elements / per_page) if per_page > 0 else 0
+
+
+def decodificar_cursor(cursor: str) -> Optional[int]:
+    """
+    Devuelve el id a partir del cual seguir (None para la primera página).
+    Lanza ValueError si el cursor no es válido.
+    """
+    cursor = cursor.strip()
+    if cursor in ("", CURSOR_INICIO):
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        ultimo_id = json.loads(raw)["id"]
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f"Cursor inválido: {cursor}") from e
+    if not isinstance(ultimo_id, int):
+        raise ValueError(f"Cursor inválido: {cursor}")
+    return ultimo_id
+
+
+def ids_pedidos(valor: str, maximo: int) -> List[int]:
+    """
+    Interpreta `ids=1,2,3` (multi-get): enteros en el orden pedido, sin
+    repetidos. Lanza ValueError si hay valores no enteros o más de `maximo`.
+    """
+    ids = []
+    for parte in valor.split(","):
+        parte = parte.strip()
+        if not parte:
+            continue
+        try:
+            id = int(parte)
+        except ValueError as e:
+            raise ValueError(f"Id inválido en ids: {parte}") from e
+        if id not in ids:
+            ids.append(id)
+    if not ids:
+        raise ValueError("ids no puede estar vacío")
+    if len(ids) > maximo:
+        raise ValueError(f"Como máximo {maximo} ids por request")
+    return ids
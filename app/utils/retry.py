@@ -1,27 +1,173 @@
 import time
+import random
 import logging
+import threading
 from functools import wraps
+from typing import Callable, Optional
 
-def retry(max_attempts: int = 3, delay: float = 1.0):
-    """Retry con delay exponencial para operaciones externas."""
+from flask import g, has_app_context, has_request_context
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+from requests import exceptions as http
+from sqlalchemy.exc import DBAPIError, DisconnectionError, OperationalError, SQLAlchemyError
+
+
+class ErrorHTTP(Exception):
+    """Respuesta HTTP no exitosa de otro servicio; sólo 5xx y 429 son transitorias."""
+
+    def __init__(self, status: int, mensaje: Optional[str] = None):
+        super().__init__(mensaje or f"Error HTTP {status}")
+        self.status = status
+
+
+class ErrorTransitorio(Exception):
+    """Para marcar explícitamente un error como reintentable."""
+
+
+def es_transitorio(error: BaseException) -> bool:
+    """
+    Errores que pueden no repetirse si se vuelve a intentar: caídas de
+    conexión con la base, timeouts de Redis y fallas de red o 5xx de otros
+    servicios. Todo lo demás (no encontrado, validación, integridad) falla
+    igual en cada intento y se propaga sin reintentar.
+    """
+    if isinstance(error, ErrorTransitorio):
+        return True
+    if isinstance(error, ErrorHTTP):
+        return error.status >= 500 or error.status == 429
+    if isinstance(error, (OperationalError, DisconnectionError)):
+        return True
+    if isinstance(error, DBAPIError):
+        return error.connection_invalidated
+    if isinstance(error, (RedisConnectionError, RedisTimeoutError)):
+        return True
+    if isinstance(error, (http.ConnectionError, http.Timeout)):
+        return True
+    if isinstance(error, http.HTTPError) and error.response is not None:
+        return error.response.status_code >= 500 or error.response.status_code == 429
+    return False
+
+
+class PresupuestoReintentos:
+    """
+    Token bucket compartido por todos los reintentos del proceso: cada
+    reintento consume un token y se reponen `por_segundo`, hasta
+    `capacidad`. Durante un incidente el balde se vacía y se deja de
+    reintentar, en lugar de multiplicar la carga sobre lo que ya está caído
+    (Traefik también reintenta con acad-retry).
+    """
+
+    def __init__(self, capacidad: float = 20, por_segundo: float = 2.0):
+        self.configurar(capacidad, por_segundo)
+
+    def configurar(self, capacidad: float, por_segundo: float) -> None:
+        self.capacidad = capacidad
+        self.por_segundo = por_segundo
+        self._tokens = float(capacidad)
+        self._actualizado = time.monotonic()
+        self._lock = threading.Lock()
+
+    def tokens(self) -> float:
+        with self._lock:
+            self._reponer()
+            return self._tokens
+
+    def tomar(self) -> bool:
+        with self._lock:
+            self._reponer()
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    def _reponer(self) -> None:
+        ahora = time.monotonic()
+        self._tokens = min(self.capacidad, self._tokens + (ahora - self._actualizado) * self.por_segundo)
+        self._actualizado = ahora
+
+
+presupuesto = PresupuestoReintentos()
+_metricas = {}
+
+
+def init_app(app, registro=None) -> None:
+    """
+    Lee RETRY_BUDGET_CAPACITY / RETRY_BUDGET_PER_SECOND, fija el deadline de
+    cada request (REQUEST_DEADLINE segundos desde que empieza) y publica
+    los contadores de reintentos en `registro` (app.metrics).
+    """
+    presupuesto.configurar(app.config.get("RETRY_BUDGET_CAPACITY", 20), app.config.get("RETRY_BUDGET_PER_SECOND", 2.0))
+    deadline = app.config.get("REQUEST_DEADLINE")
+
+    @app.before_request
+    def _fijar_deadline():
+        g.retry_deadline = time.monotonic() + deadline if deadline else None
+
+    if registro is not None:
+        _metricas["reintentos"] = registro.contador("retry_attempts_total", "Reintentos realizados por función")
+        _metricas["abandonos"] = registro.contador(
+            "retry_giveups_total", "Errores transitorios que se propagaron sin más reintentos, por motivo")
+        registro.gauge("retry_budget_tokens", "Tokens disponibles en el presupuesto de reintentos") \
+            .callback(presupuesto.tokens)
+
+
+def _contar(metrica: str, **etiquetas) -> None:
+    if metrica in _metricas:
+        _metricas[metrica].inc(**etiquetas)
+
+
+def _deadline() -> Optional[float]:
+    return g.get("retry_deadline") if has_request_context() else None
+
+
+def _preparar_reintento(error: BaseException) -> None:
+    # La sesión queda inutilizable tras un error de la base hasta el rollback.
+    if isinstance(error, SQLAlchemyError) and has_app_context():
+        from app import db
+        db.session.rollback()
+
+
+def retry(max_attempts: int = 3, delay: float = 1.0, max_delay: float = 2.0,
+          transitorio: Callable[[BaseException], bool] = es_transitorio):
+    """
+    Reintenta sólo los errores transitorios (`transitorio`), con backoff
+    exponencial con full jitter: espera al azar entre 0 y
+    min(max_delay, delay * 2^(intento - 1)). No reintenta si la espera
+    pasaría el deadline de la request ni si el presupuesto global está vacío.
+    Sólo para operaciones idempotentes (lecturas): un error después del
+    COMMIT no dice si la escritura se aplicó.
+    """
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
             attempt = 1
-            while attempt <= max_attempts:
+            while True:
                 try:
                     return func(*args, **kwargs)
                 except Exception as e:
-                    if attempt == max_attempts:
+                    if not transitorio(e):
+                        raise
+                    motivo = None
+                    wait = random.uniform(0, min(max_delay, delay * (2 ** (attempt - 1))))
+                    limite = _deadline()
+                    if attempt >= max_attempts:
+                        motivo = "intentos"
+                    elif limite is not None and time.monotonic() + wait >= limite:
+                        motivo = "deadline"
+                    elif not presupuesto.tomar():
+                        motivo = "presupuesto"
+                    if motivo:
+                        _contar("abandonos", funcion=func.__qualname__, motivo=motivo)
                         logging.error(
-                            f"[RETRY] Falló definitivamente después de {max_attempts} intentos en {func.__name__}: {e}"
+                            f"[RETRY] Falló definitivamente en {func.__qualname__} tras {attempt} intentos "
+                            f"({motivo}): {e}"
                         )
                         raise
-                    wait = delay * (2 ** (attempt - 1))
                     logging.warning(
-                        f"[RETRY] Intento {attempt} falló en {func.__name__}. "
-                        f"Reintentando en {wait}s. Error: {e}"
+                        f"[RETRY] Intento {attempt} falló en {func.__qualname__}. "
+                        f"Reintentando en {wait:.3f}s. Error: {e}"
                     )
+                    _contar("reintentos", funcion=func.__qualname__)
+                    _preparar_reintento(e)
                     time.sleep(wait)
                     attempt += 1
         return wrapper
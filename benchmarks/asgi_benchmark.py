@@ -0,0 +1,152 @@
+"""
+Benchmark WSGI vs ASGI: la misma base y los mismos endpoints de lectura
+servidos por gunicorn (workers sync, app.wsgi:app, como en el Dockerfile)
+y por uvicorn (app.asgi:crear_app_asgi), con la misma cantidad de
+procesos. N clientes concurrentes (hilos con una sesión keep-alive cada
+uno) piden GET /api/v1/facultad/<id> y el listado filtrado; se informa
+requests/segundo y latencias p50/p99 de cada modo.
+
+Por defecto siembra un SQLite temporal y usa el cache en memoria; con
+--uri y --redis se mide contra PostgreSQL y Redis reales, donde cada
+request espera I/O y se nota la diferencia entre bloquear un worker y
+ceder el event loop. Requiere gunicorn y el extra asgi (pip install -e ".[asgi]").
+
+Uso:
+    python -m benchmarks.asgi_benchmark [--clientes 200] [--requests 20] [--workers 2] [--uri postgresql://...] [--redis]
+"""
+import argparse
+import logging
+import os
+import shutil
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+from sqlalchemy import insert
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument("--clientes", type=int, default=200, help="clientes concurrentes")
+parser.add_argument("--requests", type=int, default=20, help="requests por cliente")
+parser.add_argument("--workers", type=int, default=2, help="procesos de cada servidor")
+parser.add_argument("--facultades", type=int, default=1000)
+parser.add_argument("--uri", help="base vacía a usar en lugar del SQLite temporal")
+parser.add_argument("--redis", action="store_true", help="cache de entidades en Redis (REDIS_HOST/REDIS_PORT)")
+args = parser.parse_args()
+
+DB_DIR = tempfile.mkdtemp()
+os.environ["FLASK_CONTEXT"] = "development"
+os.environ["ENTITY_CACHE_BACKEND"] = "redis" if args.redis else "memory"
+os.environ["DEV_DATABASE_URI"] = args.uri or f"sqlite:///{os.path.join(DB_DIR, 'bench.db')}"
+
+from app import create_app, db  # noqa: E402
+from app.models import Universidad, Facultad  # noqa: E402
+
+CIUDADES = ["Mendoza", "Córdoba", "Rosario", "La Plata", "Tucumán"]
+SERVIDORES = {
+    "wsgi (gunicorn sync)": ["-m", "gunicorn", "-w", "{workers}", "-b", "127.0.0.1:{puerto}", "app.wsgi:app"],
+    "asgi (uvicorn)": ["-m", "uvicorn", "--factory", "app.asgi:crear_app_asgi", "--workers", "{workers}",
+                       "--port", "{puerto}", "--log-level", "warning"],
+}
+
+
+def sembrar(facultades: int):
+    db.session.execute(insert(Universidad), [{"nombre": "Universidad", "sigla": "U", "tipo": "publica"}])
+    db.session.execute(insert(Facultad), [
+        {"nombre": f"Facultad {i:06d}", "abreviatura": "F", "directorio": "d", "sigla": f"F{i:06d}",
+         "codigoPostal": "5500", "ciudad": CIUDADES[i % len(CIUDADES)], "domicilio": "x", "telefono": "1",
+         "contacto": "c", "email": "f@u.edu.ar", "universidad_id": 1}
+        for i in range(1, facultades + 1)])
+    db.session.commit()
+
+
+def levantar(comando, puerto: int) -> subprocess.Popen:
+    proceso = subprocess.Popen([sys.executable, *(parte.format(workers=args.workers, puerto=puerto) for parte in comando)],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+    limite = time.monotonic() + 30
+    while time.monotonic() < limite:
+        try:
+            requests.get(f"http://127.0.0.1:{puerto}/api/v1/facultad/1", timeout=5)
+            return proceso
+        except requests.RequestException:
+            time.sleep(0.2)
+    detener(proceso)
+    raise RuntimeError(f"El servidor no respondió en el puerto {puerto}")
+
+
+def detener(proceso: subprocess.Popen):
+    os.killpg(proceso.pid, signal.SIGTERM)
+    proceso.wait(timeout=30)
+
+
+def medir(puerto: int) -> dict:
+    latencias, errores, lock = [], [0], threading.Lock()
+    base = f"http://127.0.0.1:{puerto}/api/v1"
+
+    def cliente(n: int):
+        session = requests.Session()
+        propias, fallidas = [], 0
+        for i in range(args.requests):
+            if i % 4 == 3:
+                url, headers = f"{base}/facultad", {"X-filters": '{"ciudad": "%s"}' % CIUDADES[i % len(CIUDADES)]}
+            else:
+                url, headers = f"{base}/facultad/{(n * args.requests + i) % args.facultades + 1}", {}
+            inicio = time.perf_counter()
+            try:
+                ok = session.get(url, headers=headers, timeout=30).status_code == 200
+            except requests.RequestException:
+                ok = False
+            propias.append(time.perf_counter() - inicio)
+            fallidas += not ok
+        with lock:
+            latencias.extend(propias)
+            errores[0] += fallidas
+
+    hilos = [threading.Thread(target=cliente, args=(n,)) for n in range(args.clientes)]
+    inicio = time.perf_counter()
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    duracion = time.perf_counter() - inicio
+    latencias.sort()
+    return {
+        "rps": len(latencias) / duracion,
+        "p50": statistics.median(latencias) * 1000,
+        "p99": latencias[int(len(latencias) * 0.99) - 1] * 1000,
+        "errores": errores[0],
+    }
+
+
+if __name__ == "__main__":
+    logging.disable(logging.INFO)
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        sembrar(args.facultades)
+        motor = db.engine.dialect.name
+
+    resultados = {}
+    try:
+        for puerto, (nombre, comando) in enumerate(SERVIDORES.items(), start=18080):
+            proceso = levantar(comando, puerto)
+            try:
+                medir(puerto)  # calentamiento: conexiones y cache
+                resultados[nombre] = medir(puerto)
+            finally:
+                detener(proceso)
+    finally:
+        if args.uri:
+            with app.app_context():
+                db.drop_all()
+        shutil.rmtree(DB_DIR, ignore_errors=True)
+
+    print(f"\n{args.clientes} clientes x {args.requests} requests, {args.workers} workers, "
+          f"{'Redis' if args.redis else 'cache en memoria'}, {motor}")
+    print(f"{'modo':24} {'req/s':>10} {'p50':>10} {'p99':>10} {'errores':>8}")
+    for nombre, r in resultados.items():
+        print(f"{nombre:24} {r['rps']:10.1f} {r['p50']:8.1f}ms {r['p99']:8.1f}ms {r['errores']:8d}")
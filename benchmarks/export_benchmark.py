@@ -0,0 +1,120 @@
+"""
+Benchmark de exportación: filas/segundo y memoria pico de GET
+/api/v1/especialidad/export (NDJSON y CSV, cursor con yield_per) frente a
+recorrer la misma tabla con el listado paginado por OFFSET que usaría un
+cliente sin exportación.
+
+La memoria se mide con tracemalloc dentro del proceso: con la exportación
+streaming el pico depende del lote (EXPORT_BATCH_SIZE), no de las filas.
+
+Uso:
+    python -m benchmarks.export_benchmark [--filas 200000] [--lote 1000] [--uri postgresql://...]
+"""
+import argparse
+import logging
+import os
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from sqlalchemy import insert
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument("--filas", type=int, default=200_000, help="especialidades a sembrar")
+parser.add_argument("--lote", type=int, default=1000, help="EXPORT_BATCH_SIZE")
+parser.add_argument("--por-pagina", type=int, default=100, help="tamaño de página del recorrido con OFFSET")
+parser.add_argument("--uri", help="base vacía a usar en lugar del SQLite temporal")
+args = parser.parse_args()
+
+DB_DIR = tempfile.mkdtemp()
+os.environ["FLASK_CONTEXT"] = "development"
+os.environ["ENTITY_CACHE_BACKEND"] = "memory"
+os.environ["DEV_DATABASE_URI"] = args.uri or f"sqlite:///{os.path.join(DB_DIR, 'bench.db')}"
+
+from app import create_app, db  # noqa: E402
+from app.models import Universidad, Facultad, Especialidad  # noqa: E402
+from app.repositories.pagination import paginar  # noqa: E402
+from app.mapping import EspecialidadMapping  # noqa: E402
+
+LOTE_SIEMBRA = 50_000
+
+
+def sembrar(filas: int):
+    rnd = random.Random(0)
+    facultades = max(filas // 100, 1)
+    db.session.execute(insert(Universidad), [{"nombre": "Universidad", "sigla": "U", "tipo": "publica"}])
+    db.session.execute(insert(Facultad), [
+        {"nombre": f"Facultad {i:06d}", "abreviatura": "F", "directorio": "d", "sigla": f"F{i:06d}",
+         "codigoPostal": "5500", "ciudad": "Mendoza", "domicilio": "x", "telefono": "1", "contacto": "c",
+         "email": "f@u.edu.ar", "universidad_id": 1}
+        for i in range(1, facultades + 1)])
+    for inicio in range(1, filas + 1, LOTE_SIEMBRA):
+        db.session.execute(insert(Especialidad), [
+            {"nombre": f"Especialidad {i:07d}", "letra": chr(65 + i % 26), "observacion": "-",
+             "facultad_id": rnd.randint(1, facultades)}
+            for i in range(inicio, min(inicio + LOTE_SIEMBRA, filas + 1))])
+        db.session.commit()
+
+
+def medir(nombre: str, recorrer) -> None:
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    filas, bytes_ = recorrer()
+    segundos = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{nombre:28} {filas:>9} filas {segundos:8.2f}s {filas / segundos:>10,.0f} filas/s "
+          f"{bytes_ / 2**20:8.1f} MiB {pico / 2**20:8.1f} MiB pico")
+
+
+def exportar(client, formato: str):
+    def recorrer():
+        respuesta = client.get(f"/api/v1/especialidad/export?format={formato}")
+        filas = bytes_ = 0
+        for trozo in respuesta.response:
+            filas += trozo.count(b"\n") if isinstance(trozo, bytes) else trozo.count("\n")
+            bytes_ += len(trozo)
+        respuesta.close()
+        return filas - (formato == "csv"), bytes_
+    return recorrer
+
+
+def offset(app):
+    def recorrer():
+        schema = EspecialidadMapping(exclude=("facultad",))
+        filas = bytes_ = pagina = 0
+        with app.app_context():
+            while True:
+                pagina += 1
+                contenido = paginar(Especialidad, pagina, args.por_pagina, []).contenido
+                if not contenido:
+                    break
+                filas += len(contenido)
+                bytes_ += len(schema.dumps(contenido, many=True))
+                db.session.remove()
+        return filas, bytes_
+    return recorrer
+
+
+if __name__ == "__main__":
+    logging.disable(logging.INFO)
+    app = create_app()
+    app.config["EXPORT_BATCH_SIZE"] = args.lote
+    with app.app_context():
+        db.create_all()
+        inicio = time.perf_counter()
+        sembrar(args.filas)
+        print(f"sembradas {args.filas} especialidades en {time.perf_counter() - inicio:.1f}s "
+              f"({db.engine.dialect.name}), lote {args.lote}\n")
+
+    client = app.test_client()
+    medir("export ndjson", exportar(client, "ndjson"))
+    medir("export csv", exportar(client, "csv"))
+    medir(f"listado OFFSET ({args.por_pagina}/página)", offset(app))
+
+    if args.uri:
+        with app.app_context():
+            db.drop_all()
+    shutil.rmtree(DB_DIR, ignore_errors=True)
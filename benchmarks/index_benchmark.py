@@ -0,0 +1,134 @@
+"""
+Benchmark de índices: latencia de los listados filtrados (página + total,
+el mismo camino que GET /api/v1/<entidad> con X-filters) sin los índices
+secundarios y después de crearlos, sobre un dataset sembrado.
+
+Por defecto siembra 1.000.000 de especialidades (10.000 facultades, 100
+universidades) en un SQLite temporal; con --uri se puede apuntar a una
+base PostgreSQL vacía, donde además se miden varchar_pattern_ops (prefix)
+y el índice trigram (ilike).
+
+Uso:
+    python -m benchmarks.index_benchmark [--filas 1000000] [--repeticiones 5] [--uri postgresql://...]
+"""
+import argparse
+import logging
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+
+from flask import current_app
+from sqlalchemy import insert, text
+
+parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+parser.add_argument("--filas", type=int, default=1_000_000, help="especialidades a sembrar")
+parser.add_argument("--repeticiones", type=int, default=5)
+parser.add_argument("--uri", help="base vacía a usar en lugar del SQLite temporal")
+args = parser.parse_args()
+
+# La URI de desarrollo se lee al importar la configuración.
+DB_DIR = tempfile.mkdtemp()
+os.environ["FLASK_CONTEXT"] = "development"
+os.environ["ENTITY_CACHE_BACKEND"] = "memory"
+os.environ["DEV_DATABASE_URI"] = args.uri or f"sqlite:///{os.path.join(DB_DIR, 'bench.db')}"
+
+from app import create_app, db, entity_cache  # noqa: E402
+from app.filters import compilar_filtros  # noqa: E402
+from app.models import Universidad, Facultad, Especialidad  # noqa: E402
+from app.repositories.pagination import paginar  # noqa: E402
+
+PALABRAS = ["Sistemas", "Civil", "Electrica", "Electronica", "Mecanica", "Quimica", "Industrial",
+            "Metalurgica", "Naval", "Textil", "Agronomia", "Arquitectura", "Medicina", "Derecho",
+            "Economia", "Contabilidad", "Letras", "Historia", "Fisica", "Matematica"]
+LOTE = 50_000
+
+# (descripción, modelo, X-filters)
+CASOS = [
+    ("universidad tipo = privada", Universidad, {"tipo": "privada"}),
+    ("facultad universidad_id = 42", Facultad, {"universidad_id": 42}),
+    ("facultad sigla prefix 'F0012'", Facultad, {"sigla": {"prefix": "F0012"}}),
+    ("especialidad facultad_id = 4242", Especialidad, {"facultad_id": 4242}),
+    ("especialidad letra = Q", Especialidad, {"letra": "Q"}),
+    ("especialidad nombre prefix 'Naval 00012'", Especialidad, {"nombre": {"prefix": "Naval 00012"}}),
+    ("especialidad nombre ilike '12345'", Especialidad, {"nombre": "12345"}),
+]
+
+
+def indices():
+    return [indice for tabla in db.metadata.sorted_tables for indice in tabla.indexes]
+
+
+def sembrar(filas: int):
+    rnd = random.Random(0)
+    facultades = max(filas // 100, 1)
+    universidades = max(facultades // 100, 1)
+    db.session.execute(insert(Universidad), [
+        {"nombre": f"Universidad {i:05d}", "sigla": f"U{i:05d}", "tipo": "privada" if i % 5 == 0 else "publica"}
+        for i in range(1, universidades + 1)])
+    db.session.execute(insert(Facultad), [
+        {"nombre": f"Facultad {i:06d}", "abreviatura": "F", "directorio": "d", "sigla": f"F{i:06d}",
+         "codigoPostal": "5500", "ciudad": "Mendoza", "domicilio": "x", "telefono": "1", "contacto": "c",
+         "email": "f@u.edu.ar", "universidad_id": rnd.randint(1, universidades)}
+        for i in range(1, facultades + 1)])
+    for inicio in range(1, filas + 1, LOTE):
+        db.session.execute(insert(Especialidad), [
+            {"nombre": f"{rnd.choice(PALABRAS)} {i:07d}", "letra": chr(65 + i % 26), "observacion": "-",
+             "facultad_id": rnd.randint(1, facultades)}
+            for i in range(inicio, min(inicio + LOTE, filas + 1))])
+        db.session.commit()
+    db.session.commit()
+
+
+def medir(repeticiones: int) -> dict:
+    resultados = {}
+    for descripcion, model, filtros in CASOS:
+        compilados = compilar_filtros(model, filtros)
+        tiempos = []
+        for _ in range(repeticiones):
+            entity_cache.init_app(current_app, db)  # sin conteos cacheados: se mide la consulta
+            inicio = time.perf_counter()
+            paginar(model, 1, 10, compilados)
+            tiempos.append(time.perf_counter() - inicio)
+            db.session.remove()
+        resultados[descripcion] = statistics.median(tiempos) * 1000
+    return resultados
+
+
+def analizar():
+    with db.engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+
+
+if __name__ == "__main__":
+    logging.disable(logging.INFO)
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        for indice in indices():
+            indice.drop(db.engine, checkfirst=True)
+
+        inicio = time.perf_counter()
+        sembrar(args.filas)
+        print(f"sembradas {args.filas} especialidades en {time.perf_counter() - inicio:.1f}s "
+              f"({db.engine.dialect.name})")
+        analizar()
+        sin_indices = medir(args.repeticiones)
+
+        inicio = time.perf_counter()
+        for indice in indices():
+            indice.create(db.engine, checkfirst=True)
+        analizar()
+        print(f"índices creados en {time.perf_counter() - inicio:.1f}s")
+        con_indices = medir(args.repeticiones)
+
+        print(f"\n{'caso':45} {'sin índices':>12} {'con índices':>12} {'mejora':>8}")
+        for descripcion, _, _ in CASOS:
+            antes, despues = sin_indices[descripcion], con_indices[descripcion]
+            print(f"{descripcion:45} {antes:10.2f}ms {despues:10.2f}ms {antes / despues:7.1f}x")
+
+        if args.uri:
+            db.drop_all()
+    shutil.rmtree(DB_DIR, ignore_errors=True)
@@ -0,0 +1,91 @@
+"""
+Benchmark de cache stampede: N requests concurrentes piden la misma
+especialidad recién expirada y se cuentan los SELECT que llegan a la base,
+con y sin single-flight.
+
+Uso:
+    python -m benchmarks.stampede_benchmark [--hilos 50] [--latencia 0.05]
+"""
+import argparse
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from sqlalchemy import event
+
+# Base SQLite en archivo (compartida entre hilos) y cache en memoria del proceso.
+DB_DIR = tempfile.mkdtemp()
+os.environ["FLASK_CONTEXT"] = "development"
+os.environ["DEV_DATABASE_URI"] = f"sqlite:///{os.path.join(DB_DIR, 'bench.db')}"
+os.environ["ENTITY_CACHE_BACKEND"] = "memory"
+
+from app import create_app, db, entity_cache  # noqa: E402
+from app.models import Especialidad, Facultad  # noqa: E402
+from app.repositories import EspecialidadRepository  # noqa: E402
+
+
+def preparar_app():
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        facultad = Facultad(nombre="Ingeniería", abreviatura="FI", directorio="d", sigla="FI",
+                            codigoPostal="5500", ciudad="Mendoza", domicilio="x", telefono="1",
+                            contacto="c", email="e@utn.edu.ar")
+        db.session.add(facultad)
+        db.session.commit()
+        especialidad = Especialidad(nombre="Sistemas", letra="S", observacion="-", facultad_id=facultad.id)
+        db.session.add(especialidad)
+        db.session.commit()
+        return app, especialidad.id
+
+
+def correr(app, especialidad_id: int, single_flight: bool, hilos: int, latencia: float) -> dict:
+    # cache vacío: todas las requests llegan con la clave expirada
+    app.config["ENTITY_CACHE_SINGLE_FLIGHT"] = single_flight
+    entity_cache.init_app(app, db)
+    consultas = []
+
+    def contar(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "especialidades" in statement:
+            consultas.append(statement)
+            time.sleep(latencia)  # simula una consulta costosa
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", contar)
+
+    barrera = threading.Barrier(hilos)
+
+    def request():
+        with app.app_context():
+            barrera.wait()
+            EspecialidadRepository.buscar_especialidad(especialidad_id)
+            db.session.remove()
+
+    inicio = time.perf_counter()
+    workers = [threading.Thread(target=request) for _ in range(hilos)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    duracion = time.perf_counter() - inicio
+    event.remove(engine, "before_cursor_execute", contar)
+
+    return {"single_flight": single_flight, "requests": hilos, "consultas_db": len(consultas),
+            "segundos": round(duracion, 3)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hilos", type=int, default=50)
+    parser.add_argument("--latencia", type=float, default=0.05, help="segundos agregados a cada SELECT")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    app, especialidad_id = preparar_app()
+    for single_flight in (False, True):
+        print(correr(app, especialidad_id, single_flight, args.hilos, args.latencia))
+    shutil.rmtree(DB_DIR, ignore_errors=True)
@@ -0,0 +1,23 @@
+"""
+Configuración de gunicorn (se carga sola desde el directorio de trabajo).
+
+Con PROMETHEUS_MULTIPROC_DIR las métricas de los workers se comparten por
+archivos en ese directorio (ver app/metrics/registro.py): se vacía al
+arrancar, así no se suman valores de una ejecución anterior, y al terminar
+un worker se descartan sus gauges.
+"""
+import os
+import shutil
+
+
+def on_starting(server):
+    directorio = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if directorio:
+        shutil.rmtree(directorio, ignore_errors=True)
+        os.makedirs(directorio, exist_ok=True)
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,62 @@
+"""esquema inicial: universidades, facultades y especialidades
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'universidades',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('nombre', sa.String(length=100), nullable=False),
+        sa.Column('sigla', sa.String(length=100), nullable=False),
+        sa.Column('tipo', sa.String(length=20), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('nombre'),
+        sa.UniqueConstraint('sigla'),
+    )
+    op.create_table(
+        'facultades',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('nombre', sa.String(length=100), nullable=False),
+        sa.Column('abreviatura', sa.String(length=100), nullable=False),
+        sa.Column('directorio', sa.String(length=100), nullable=False),
+        sa.Column('sigla', sa.String(length=100), nullable=False),
+        sa.Column('codigoPostal', sa.String(length=100), nullable=False),
+        sa.Column('ciudad', sa.String(length=100), nullable=False),
+        sa.Column('domicilio', sa.String(length=100), nullable=False),
+        sa.Column('telefono', sa.String(length=100), nullable=False),
+        sa.Column('contacto', sa.String(length=100), nullable=False),
+        sa.Column('email', sa.String(length=100), nullable=False),
+        sa.Column('universidad_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['universidad_id'], ['universidades.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_table(
+        'especialidades',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('nombre', sa.String(length=100), nullable=False),
+        sa.Column('letra', sa.String(length=100), nullable=False),
+        sa.Column('observacion', sa.String(length=100), nullable=False),
+        sa.Column('facultad_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['facultad_id'], ['facultades.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+
+def downgrade():
+    op.drop_table('especialidades')
+    op.drop_table('facultades')
+    op.drop_table('universidades')
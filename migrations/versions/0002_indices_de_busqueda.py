@@ -0,0 +1,64 @@
+"""índices de claves foráneas y de filtros
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 10:30:00.000000
+
+En PostgreSQL los índices se crean con CREATE INDEX CONCURRENTLY (fuera de
+la transacción de la migración) para no bloquear escrituras sobre tablas
+grandes. Las columnas de texto usan varchar_pattern_ops para que el mismo
+índice resuelva igualdad y LIKE 'prefijo%' con cualquier collation, y el
+ILIKE '%texto%' de especialidades usa un índice GIN trigram (pg_trgm).
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+# (nombre, tabla, columna, operador de PostgreSQL)
+INDICES = [
+    ('ix_universidades_tipo', 'universidades', 'tipo', None),
+    ('ix_facultades_universidad_id', 'facultades', 'universidad_id', None),
+    ('ix_facultades_nombre', 'facultades', 'nombre', 'varchar_pattern_ops'),
+    ('ix_facultades_sigla', 'facultades', 'sigla', 'varchar_pattern_ops'),
+    ('ix_especialidades_facultad_id', 'especialidades', 'facultad_id', None),
+    ('ix_especialidades_nombre', 'especialidades', 'nombre', 'varchar_pattern_ops'),
+    ('ix_especialidades_letra', 'especialidades', 'letra', None),
+]
+
+
+def _es_postgres():
+    return op.get_bind().dialect.name == 'postgresql'
+
+
+def upgrade():
+    if not _es_postgres():
+        for nombre, tabla, columna, _ in INDICES:
+            op.create_index(nombre, tabla, [columna])
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    with op.get_context().autocommit_block():
+        for nombre, tabla, columna, ops in INDICES:
+            op.create_index(nombre, tabla, [columna], postgresql_concurrently=True,
+                            postgresql_ops={columna: ops} if ops else {}, if_not_exists=True)
+        op.create_index('ix_especialidades_nombre_trgm', 'especialidades', ['nombre'],
+                        postgresql_using='gin', postgresql_ops={'nombre': 'gin_trgm_ops'},
+                        postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade():
+    if not _es_postgres():
+        for nombre, tabla, _, _ in reversed(INDICES):
+            op.drop_index(nombre, table_name=tabla)
+        return
+
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_especialidades_nombre_trgm', table_name='especialidades',
+                      postgresql_concurrently=True, if_exists=True)
+        for nombre, tabla, _, _ in reversed(INDICES):
+            op.drop_index(nombre, table_name=tabla, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,64 @@
+"""índice de texto para /search
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 12:00:00.000000
+
+SQLite usa una tabla virtual FTS5 (rowid = id * 3 + posición de la entidad)
+y PostgreSQL una tabla con un tsvector indexado con GIN. Se carga con los
+datos existentes; después la mantienen los repositorios.
+"""
+from alembic import op
+
+from app.models.busqueda import ACENTOS, SIN_ACENTOS
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+# (entidad, tabla, columna sigla, columnas del detalle)
+DOCUMENTOS = [
+    ('universidad', 'universidades', 'sigla', ['tipo']),
+    ('facultad', 'facultades', 'sigla', ['abreviatura', 'ciudad']),
+    ('especialidad', 'especialidades', None, ['letra', 'observacion']),
+]
+
+
+def _normalizar(expresion):
+    return f"translate(lower({expresion}), '{ACENTOS}', '{SIN_ACENTOS}')"
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(
+            "CREATE TABLE busqueda ("
+            "entidad varchar(20) NOT NULL, entidad_id integer NOT NULL, "
+            "nombre varchar(100) NOT NULL, sigla varchar(100), documento tsvector NOT NULL, "
+            "PRIMARY KEY (entidad, entidad_id))")
+        for entidad, tabla, sigla, detalle in DOCUMENTOS:
+            titulo = "concat_ws(' ', nombre, %s)" % (sigla or 'NULL')
+            texto = "concat_ws(' ', %s)" % ', '.join(detalle)
+            documento = (f"setweight(to_tsvector('simple', {_normalizar(titulo)}), 'A') || "
+                         f"setweight(to_tsvector('simple', {_normalizar(texto)}), 'B')")
+            op.execute(
+                f"INSERT INTO busqueda (entidad, entidad_id, nombre, sigla, documento) "
+                f"SELECT '{entidad}', id, nombre, {sigla or 'NULL'}, {documento} FROM {tabla}")
+        op.execute("CREATE INDEX ix_busqueda_documento ON busqueda USING gin (documento)")
+        return
+
+    op.execute(
+        "CREATE VIRTUAL TABLE busqueda USING fts5("
+        "entidad UNINDEXED, entidad_id UNINDEXED, nombre, sigla, detalle, "
+        "tokenize = 'unicode61 remove_diacritics 2')")
+    for posicion, (entidad, tabla, sigla, detalle) in enumerate(DOCUMENTOS):
+        texto = " || ' ' || ".join(detalle)
+        op.execute(
+            f"INSERT INTO busqueda (rowid, entidad, entidad_id, nombre, sigla, detalle) "
+            f"SELECT id * {len(DOCUMENTOS)} + {posicion}, '{entidad}', id, nombre, {sigla or 'NULL'}, {texto} "
+            f"FROM {tabla}")
+
+def downgrade():
+    op.execute("DROP TABLE busqueda")
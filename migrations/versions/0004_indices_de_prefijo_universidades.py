@@ -0,0 +1,48 @@
+"""índices de prefijo para universidades.nombre y universidades.sigla
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 14:00:00.000000
+
+Los índices únicos de nombre y sigla usan la collation de la base y en
+PostgreSQL no resuelven LIKE 'prefijo%' (el filtro `prefix` de X-filters).
+Sólo PostgreSQL: se crean con varchar_pattern_ops y CONCURRENTLY.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+# (nombre, columna)
+INDICES = [
+    ('ix_universidades_nombre_prefijo', 'nombre'),
+    ('ix_universidades_sigla_prefijo', 'sigla'),
+]
+
+
+def _es_postgres():
+    return op.get_bind().dialect.name == 'postgresql'
+
+
+def upgrade():
+    if not _es_postgres():
+        return
+
+    with op.get_context().autocommit_block():
+        for nombre, columna in INDICES:
+            op.create_index(nombre, 'universidades', [columna],
+                            postgresql_ops={columna: 'varchar_pattern_ops'},
+                            postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade():
+    if not _es_postgres():
+        return
+
+    with op.get_context().autocommit_block():
+        for nombre, _ in reversed(INDICES):
+            op.drop_index(nombre, table_name='universidades', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,110 @@
+import unittest
+import os
+from sqlalchemy import event
+from app import create_app, db, entity_cache
+from app.models import Universidad, Facultad, Especialidad
+from app.repositories import ArbolRepository
+from app.services import FacultadService, EspecialidadService
+
+
+class ArbolTestCase(unittest.TestCase):
+
+    def setUp(self):
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        for sigla in ("UTN", "UBA"):
+            db.session.add(Universidad(nombre=sigla, sigla=sigla, tipo="publica"))
+        for i, universidad_id in enumerate((1, 1, 2)):
+            db.session.add(self._facultad(f"F{i}", universidad_id))
+        for i, facultad_id in enumerate((1, 1, 2, 3)):
+            db.session.add(Especialidad(nombre=f"Especialidad {i}", letra="E", observacion="-", facultad_id=facultad_id))
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _facultad(self, sigla, universidad_id):
+        return Facultad(nombre=f"Facultad {sigla}", sigla=sigla, abreviatura=sigla, directorio="Dir",
+                        codigoPostal="5500", ciudad="Mendoza", domicilio="Calle 1", telefono="1",
+                        contacto="c", email="f@utn.edu.ar", universidad_id=universidad_id)
+
+    def _arbol(self, id=1):
+        consultas = []
+        listener = lambda *args: consultas.append(args[2])
+        event.listen(db.engine, "before_cursor_execute", listener)
+        try:
+            response = self.client.get(f'/api/v1/universidad/{id}/arbol')
+        finally:
+            event.remove(db.engine, "before_cursor_execute", listener)
+        return response, len(consultas)
+
+    def _especialidades(self, data):
+        return {f["sigla"]: [e["nombre"] for e in f["especialidades"]] for f in data["facultades"]}
+
+    def test_arbol_completo_en_tres_consultas(self):
+        response, consultas = self._arbol()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/json")
+        data = response.get_json()
+        self.assertEqual(data["sigla"], "UTN")
+        self.assertEqual(self._especialidades(data),
+                         {"F0": ["Especialidad 0", "Especialidad 1"], "F1": ["Especialidad 2"]})
+        self.assertEqual(consultas, 3)
+
+    def test_hit_es_una_lectura_del_cache_sin_base(self):
+        primero, _ = self._arbol()
+        segundo, consultas = self._arbol()
+
+        self.assertEqual(consultas, 0)
+        self.assertEqual(segundo.data, primero.data)
+        self.assertEqual(entity_cache._get(ArbolRepository.clave(1)), primero.data)
+
+    def test_alta_de_especialidad_invalida_el_arbol(self):
+        self._arbol()
+        EspecialidadService.crear_especialidad(Especialidad(nombre="Nueva", letra="N", observacion="-", facultad_id=2))
+
+        data = self._arbol()[0].get_json()
+        self.assertEqual(self._especialidades(data)["F1"], ["Especialidad 2", "Nueva"])
+
+    def test_cambios_de_facultad_invalidan_el_arbol(self):
+        self._arbol()
+        self.client.put('/api/v1/facultad/1', json={
+            "nombre": "Regional Mendoza", "sigla": "F0", "abreviatura": "FRM", "directorio": "Dir",
+            "codigoPostal": "5500", "ciudad": "Mendoza", "domicilio": "Calle 1", "telefono": "1",
+            "contacto": "c", "email": "frm@utn.edu.ar", "universidad_id": 1})
+        self.assertEqual(self._arbol()[0].get_json()["facultades"][0]["nombre"], "Regional Mendoza")
+
+        FacultadService.eliminar_facultad(2)
+        self.assertEqual(list(self._especialidades(self._arbol()[0].get_json())), ["F0"])
+
+    def test_cambios_en_otra_universidad_no_invalidan(self):
+        self._arbol()
+        EspecialidadService.eliminar_especialidad(4)
+
+        self.assertEqual(self._arbol()[1], 0)
+
+    def test_universidad_inexistente(self):
+        response, _ = self._arbol(99)
+        self.assertEqual(response.status_code, 404)
+
+    def test_invalidacion_durante_la_construccion_no_se_guarda(self):
+        clave = ArbolRepository.clave(1)
+
+        def construir():
+            ArbolRepository.invalidar([1])
+            return b"{}"
+
+        self.assertEqual(entity_cache.documento(clave, construir), b"{}")
+        self.assertIsNone(entity_cache._get(clave))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,207 @@
+import asyncio
+import importlib.util
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+from app import create_app, db, replicas
+from app.asgi import AppAsgi, crear_app_asgi, opciones_engine, url_async
+from app.config.config import TestConfig
+from app.models import Universidad, Facultad
+from app.replicas import RYW_COOKIE
+
+DEPENDENCIAS_ASGI = all(importlib.util.find_spec(m) for m in ("aiosqlite", "a2wsgi"))
+
+
+def scope(path, query="", headers=(), method="GET"):
+    return {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "scheme": "http",
+            "method": method, "path": path, "raw_path": path.encode(), "root_path": "",
+            "query_string": query.encode(), "server": ("testserver", 80), "client": ("127.0.0.1", 50000),
+            "headers": [(b"host", b"testserver"), *((k.lower().encode(), v.encode()) for k, v in headers)]}
+
+
+async def pedir(app, path, query="", headers=(), method="GET", cuerpo=b""):
+    enviados = []
+
+    async def receive():
+        return {"type": "http.request", "body": cuerpo, "more_body": False}
+
+    async def send(mensaje):
+        enviados.append(mensaje)
+
+    if cuerpo:
+        headers = [*headers, ("Content-Length", str(len(cuerpo)))]
+    await app(scope(path, query, headers, method), receive, send)
+    status = next(m["status"] for m in enviados if m["type"] == "http.response.start")
+    datos = b"".join(m.get("body", b"") for m in enviados if m["type"] == "http.response.body")
+    return status, json.loads(datos) if datos else None
+
+
+class RutasAsgiTestCase(unittest.TestCase):
+    """Qué atiende el event loop y qué se delega a la app WSGI (no necesita las dependencias opcionales)."""
+
+    def setUp(self):
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = AppAsgi(create_app(), motor=None, wsgi=None)
+
+    def _ruta(self, path, query="", headers=(), method="GET"):
+        ruta = self.app._resolver(scope(path, query, headers, method))
+        return ruta[0].__name__ if ruta else "wsgi"
+
+    def test_url_async(self):
+        self.assertEqual(url_async("postgresql://u:p@db:5432/academica"), "postgresql+asyncpg://u:p@db:5432/academica")
+        self.assertEqual(url_async("postgresql+psycopg2://u@db/x"), "postgresql+asyncpg://u@db/x")
+        self.assertEqual(url_async("sqlite:////tmp/x.db"), "sqlite+aiosqlite:////tmp/x.db")
+        with self.assertRaises(ValueError):
+            url_async("mysql://u@db/x")
+
+    def test_opciones_engine_sin_pool_sync(self):
+        self.assertEqual(opciones_engine({"poolclass": object, "pool_size": 5}), {"pool_size": 5})
+
+    def test_lecturas_en_el_event_loop(self):
+        self.assertEqual(self._ruta("/api/v1/universidad/7"), "_buscar")
+        self.assertEqual(self._ruta("/api/v1/facultad", headers=[("X-filters", '{"ciudad": "Mendoza"}')]), "_listar")
+        self.assertEqual(self._ruta("/api/v1/especialidad", query="fields=id,nombre"), "_listar")
+        self.assertEqual(self._ruta("/api/v1/universidad", headers=[("X-count", "none")]), "_listar")
+
+    def test_resto_delegado_a_wsgi(self):
+        self.assertEqual(self._ruta("/api/v1/universidad", method="POST"), "wsgi")
+        self.assertEqual(self._ruta("/api/v1/universidad/7", query="expand=facultades"), "wsgi")
+        self.assertEqual(self._ruta("/api/v1/universidad", query="ids=1,2"), "wsgi")
+        self.assertEqual(self._ruta("/api/v1/universidad", headers=[("X-cursor", "*")]), "wsgi")
+        self.assertEqual(self._ruta("/api/v1/universidad", headers=[("X-count", "aproximado")]), "wsgi")
+        self.assertEqual(self._ruta("/api/v1/universidad/7/arbol"), "wsgi")
+        self.assertEqual(self._ruta("/api/v1/universidad/export"), "wsgi")
+        self.assertEqual(self._ruta("/api/v1/busqueda"), "wsgi")
+
+
+@unittest.skipUnless(DEPENDENCIAS_ASGI, 'requiere las dependencias opcionales: pip install -e ".[asgi]"')
+class AppAsgiTestCase(unittest.TestCase):
+    """La misma base SQLite en archivo para la app Flask y el engine async."""
+
+    def setUp(self):
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.directorio = tempfile.mkdtemp()
+        uri = f"sqlite:///{os.path.join(self.directorio, 'asgi.db')}"
+        with patch.object(TestConfig, "SQLALCHEMY_DATABASE_URI", uri):
+            self.flask_app = create_app()
+        self.app_context = self.flask_app.app_context()
+        self.app_context.push()
+        db.create_all()
+        universidad = Universidad(nombre="Universidad Tecnológica Nacional", sigla="UTN", tipo="publica")
+        db.session.add(universidad)
+        for i, ciudad in enumerate(["Mendoza", "Córdoba", "Mendoza"]):
+            db.session.add(Facultad(nombre=f"Facultad {i}", abreviatura="F", directorio="d", sigla=f"F{i}",
+                                    codigoPostal="5500", ciudad=ciudad, domicilio="x", telefono="1", contacto="c",
+                                    email="f@utn.edu.ar", universidad=universidad))
+        db.session.commit()
+        self.client = self.flask_app.test_client()
+        self.app = crear_app_asgi(self.flask_app)
+
+    def tearDown(self):
+        asyncio.run(self.app.cerrar())
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+        shutil.rmtree(self.directorio, ignore_errors=True)
+
+    def test_buscar_igual_que_wsgi(self):
+        status, datos = asyncio.run(pedir(self.app, "/api/v1/universidad/1"))
+        self.assertEqual(status, 200)
+        self.assertEqual(datos, self.client.get("/api/v1/universidad/1").get_json())
+
+        status, datos = asyncio.run(pedir(self.app, "/api/v1/universidad/99"))
+        self.assertEqual((status, datos), (404, {"error": "Universidad no encontrada"}))
+
+    def test_listar_con_filtros_igual_que_wsgi(self):
+        headers = [("X-filters", '{"ciudad": "Mendoza"}'), ("X-per-page", "1")]
+        status, datos = asyncio.run(pedir(self.app, "/api/v1/facultad", query="fields=id,nombre", headers=headers))
+        self.assertEqual(status, 200)
+        esperado = self.client.get("/api/v1/facultad?fields=id,nombre", headers=dict(headers)).get_json()
+        self.assertEqual(datos, esperado)
+        self.assertEqual(datos["pageable"]["total_elements"], 2)
+
+    def test_modos_de_conteo_igual_que_wsgi(self):
+        for conteo in ("none", "estimated", "exact"):
+            headers = [("X-count", conteo), ("X-page", "2"), ("X-per-page", "2")]
+            status, datos = asyncio.run(pedir(self.app, "/api/v1/facultad", headers=headers))
+            self.assertEqual(status, 200)
+            self.assertEqual(datos, self.client.get("/api/v1/facultad", headers=dict(headers)).get_json(), conteo)
+
+    def test_pagina_vacia_cuenta_aparte(self):
+        headers = [("X-page", "5"), ("X-per-page", "2")]
+        status, datos = asyncio.run(pedir(self.app, "/api/v1/facultad", headers=headers))
+        self.assertEqual((datos["content"], datos["pageable"]["total_elements"]), ([], 3))
+
+    def test_filtro_invalido(self):
+        status, datos = asyncio.run(pedir(self.app, "/api/v1/facultad", headers=[("X-filters", "{")]))
+        self.assertEqual((status, datos), (400, {"error": "Formato de filtros inválido en X-filters"}))
+
+    def test_escrituras_pasan_por_flask(self):
+        cuerpo = json.dumps({"nombre": "Universidad Nacional de Cuyo", "sigla": "UNCuyo", "tipo": "publica"}).encode()
+        status, _ = asyncio.run(pedir(self.app, "/api/v1/universidad", method="POST", cuerpo=cuerpo,
+                                      headers=[("Content-Type", "application/json")]))
+        self.assertEqual(status, 201)
+        status, datos = asyncio.run(pedir(self.app, "/api/v1/universidad"))
+        self.assertEqual([u["sigla"] for u in datos["content"]], ["UTN", "UNCuyo"])
+
+    def test_requests_concurrentes(self):
+        async def muchas():
+            return await asyncio.gather(*(pedir(self.app, "/api/v1/facultad/1") for _ in range(200)))
+
+        respuestas = asyncio.run(muchas())
+        self.assertTrue(all(status == 200 and datos["id"] == 1 for status, datos in respuestas))
+
+
+@unittest.skipUnless(DEPENDENCIAS_ASGI, 'requiere las dependencias opcionales: pip install -e ".[asgi]"')
+class ReplicasAsgiTestCase(unittest.TestCase):
+    """Primario y "réplica" en archivos SQLite con datos distintos: las lecturas async eligen igual que las sync."""
+
+    def setUp(self):
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.directorio = tempfile.mkdtemp()
+        primario = f"sqlite:///{os.path.join(self.directorio, 'primario.db')}"
+        replica = f"sqlite:///{os.path.join(self.directorio, 'replica.db')}"
+        with patch.object(TestConfig, "SQLALCHEMY_DATABASE_URI", primario), \
+                patch.object(TestConfig, "READ_REPLICA_URIS", [replica]):
+            self.flask_app = create_app()
+        self.app_context = self.flask_app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.replica = db.engines["replica_0"]
+        db.metadata.create_all(self.replica)
+        db.session.add(Universidad(nombre="Primario", sigla="P", tipo="publica"))
+        db.session.commit()
+        with self.replica.begin() as conn:
+            conn.execute(Universidad.__table__.insert(), {"nombre": "Replica", "sigla": "R", "tipo": "publica"})
+        replicas._escrituras.clear()
+        self.app = crear_app_asgi(self.flask_app)
+
+    def tearDown(self):
+        asyncio.run(self.app.cerrar())
+        db.session.remove()
+        db.drop_all()
+        db.metadata.drop_all(self.replica)
+        self.app_context.pop()
+        shutil.rmtree(self.directorio, ignore_errors=True)
+
+    def _nombre(self, path="/api/v1/universidad/1", headers=()):
+        status, datos = asyncio.run(pedir(self.app, path, headers=headers))
+        self.assertEqual(status, 200)
+        return datos["nombre"] if "nombre" in datos else datos["content"][0]["nombre"]
+
+    def test_lee_de_la_replica(self):
+        self.assertEqual(self._nombre(), "Replica")
+        self.assertEqual(self._nombre("/api/v1/universidad"), "Replica")
+
+    def test_consistencia_fuerte_y_read_your_writes_leen_del_primario(self):
+        self.assertEqual(self._nombre(headers=[("X-Consistency", "strong")]), "Primario")
+        cookie = f"{RYW_COOKIE}={time.time() + 60:.3f}"
+        self.assertEqual(self._nombre("/api/v1/universidad", headers=[("Cookie", cookie)]), "Primario")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import unittest
+import os
+from sqlalchemy import event
+from app import create_app, db, autocompletado
+from app.caching import IndicePrefijos, LocalInvalidationBus
+from app.models import Universidad, Facultad
+from app.services import UniversidadService, FacultadService
+
+
+class IndicePrefijosTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.bus = LocalInvalidationBus()
+        self.indice = IndicePrefijos()
+        self.indice.init_app(self.bus, ["universidad"])
+        self.filas = {1: (1, "Universidad Tecnológica Nacional", "UTN"), 2: (2, "Universidad de Buenos Aires", "UBA")}
+        self.cargas = []
+
+    def _cargar(self, ids):
+        self.cargas.append(ids)
+        return [self.filas[i] for i in (ids if ids is not None else self.filas) if i in self.filas]
+
+    def _buscar(self, prefijo):
+        self.indice.sincronizar("universidad", self._cargar)
+        return [id for id, _, _ in self.indice.buscar("universidad", prefijo)]
+
+    def test_prefijo_de_nombre_palabra_y_sigla(self):
+        self.assertEqual(self._buscar("Univ"), [2, 1])
+        self.assertEqual(self._buscar("tecnologica"), [1])
+        self.assertEqual(self._buscar("nac"), [1])
+        self.assertEqual(self._buscar("ub"), [2])
+        self.assertEqual(self._buscar("x"), [])
+
+    def test_carga_inicial_una_sola_vez(self):
+        self._buscar("u")
+        self._buscar("t")
+        self.assertEqual(self.cargas, [None])
+
+    def test_notificacion_recarga_solo_los_ids(self):
+        self._buscar("u")
+        self.filas[1] = (1, "Universidad Nacional de Cuyo", "UNCUYO")
+        del self.filas[2]
+        self.bus.publicar([], entidad="universidad", ids=[1, 2])
+
+        self.assertEqual(self._buscar("cuyo"), [1])
+        self.assertEqual(self._buscar("tecno"), [])
+        self.assertEqual(self._buscar("uba"), [])
+        self.assertEqual(self.cargas, [None, [1, 2]])
+
+    def test_reconexion_reconstruye(self):
+        self._buscar("u")
+        self.filas[3] = (3, "Universidad Austral", "UA")
+        for callback in self.bus.on_reconnect:
+            callback()
+
+        self.assertEqual(self._buscar("austral"), [3])
+        self.assertEqual(self.cargas, [None, None])
+
+
+class AutocompletadoEndpointTestCase(unittest.TestCase):
+
+    def setUp(self):
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        self.uni = UniversidadService.crear_universidad(
+            Universidad(nombre="Universidad Tecnológica Nacional", sigla="UTN", tipo="publica"))
+        self.fac = FacultadService.crear_facultad(Facultad(
+            nombre="Facultad Regional Mendoza", sigla="FRM", abreviatura="FRM", directorio="Dir",
+            codigoPostal="5500", ciudad="Mendoza", domicilio="Calle 1", telefono="1",
+            contacto="c", email="frm@utn.edu.ar", universidad_id=self.uni.id))
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _sugerir(self, q, **params):
+        response = self.client.get('/api/v1/autocomplete', query_string={"q": q, **params})
+        self.assertEqual(response.status_code, 200)
+        return [(s["entidad"], s["sigla"]) for s in response.get_json()["content"]]
+
+    def test_sugiere_universidades_y_facultades(self):
+        self.assertEqual(self._sugerir("utn"), [("universidad", "UTN")])
+        self.assertEqual(self._sugerir("mend"), [("facultad", "FRM")])
+        self.assertEqual(self._sugerir("reg", entidad="universidad"), [])
+
+    def test_sin_consultas_a_la_base_en_caliente(self):
+        self._sugerir("u")
+        consultas = []
+        listener = lambda *args: consultas.append(args[2])
+        event.listen(db.engine, "before_cursor_execute", listener)
+        try:
+            self._sugerir("tecno")
+            self._sugerir("f")
+        finally:
+            event.remove(db.engine, "before_cursor_execute", listener)
+        self.assertEqual(consultas, [])
+
+    def test_escrituras_actualizan_el_indice(self):
+        self._sugerir("u")
+        UniversidadService.crear_universidad(Universidad(nombre="Universidad de Buenos Aires", sigla="UBA", tipo="publica"))
+        self.client.put(f'/api/v1/universidad/{self.uni.id}',
+                        json={"nombre": "Universidad Nacional de Cuyo", "sigla": "UNCUYO", "tipo": "publica"})
+        FacultadService.eliminar_facultad(self.fac.id)
+
+        self.assertEqual(self._sugerir("buenos"), [("universidad", "UBA")])
+        self.assertEqual(self._sugerir("cuyo"), [("universidad", "UNCUYO")])
+        self.assertEqual(self._sugerir("utn"), [])
+        self.assertEqual(self._sugerir("mendoza"), [])
+        self.assertEqual(len(autocompletado), 2)
+
+    def test_parametros_invalidos(self):
+        self.assertEqual(self.client.get('/api/v1/autocomplete').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/autocomplete?q=a&entidad=alumno').status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+import os
+from app import create_app, db
+from app.models import Universidad, Facultad, Especialidad
+from app.repositories import BusquedaRepository
+from app.services import UniversidadService, FacultadService, EspecialidadService
+
+
+class BusquedaTestCase(unittest.TestCase):
+
+    def setUp(self):
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        self.uni = UniversidadService.crear_universidad(
+            Universidad(nombre="Universidad Tecnológica Nacional", sigla="UTN", tipo="publica"))
+        self.fac = FacultadService.crear_facultad(Facultad(
+            nombre="Facultad Regional Mendoza", sigla="FRM", abreviatura="FRM", directorio="Dir",
+            codigoPostal="5500", ciudad="Mendoza", domicilio="Calle 1", telefono="1",
+            contacto="c", email="frm@utn.edu.ar", universidad_id=self.uni.id))
+        self.esp = EspecialidadService.crear_especialidad(Especialidad(
+            nombre="Ingeniería en Sistemas de Información", letra="S", observacion="Tecnológica",
+            facultad_id=self.fac.id))
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _buscar(self, q, **params):
+        response = self.client.get('/api/v1/search', query_string={"q": q, **params})
+        self.assertEqual(response.status_code, 200)
+        return [(r["entidad"], r["id"]) for r in response.get_json()["content"]]
+
+    def test_busca_en_las_tres_entidades(self):
+        self.assertEqual(self._buscar("mendoza"), [("facultad", self.fac.id)])
+        self.assertEqual(self._buscar("sistemas"), [("especialidad", self.esp.id)])
+        self.assertEqual(self._buscar("utn"), [("universidad", self.uni.id)])
+
+    def test_prefijos_y_acentos(self):
+        self.assertEqual(self._buscar("ingenieria sist"), [("especialidad", self.esp.id)])
+
+    def test_ranking_prioriza_el_nombre(self):
+        # "tecnológica" es el nombre de la universidad y sólo la observación de la especialidad
+        self.assertEqual(self._buscar("tecnologica"), [("universidad", self.uni.id), ("especialidad", self.esp.id)])
+
+    def test_filtro_por_entidad(self):
+        self.assertEqual(self._buscar("tecnologica", entidad="especialidad"), [("especialidad", self.esp.id)])
+        response = self.client.get('/api/v1/search', query_string={"q": "x", "entidad": "alumno"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_q_obligatorio(self):
+        self.assertEqual(self.client.get('/api/v1/search').status_code, 400)
+        self.assertEqual(self._buscar("%*\""), [])
+
+    def test_actualizar_reindexa(self):
+        self._buscar("sistemas")
+        self.client.put(f'/api/v1/universidad/{self.uni.id}',
+                        json={"nombre": "Universidad de Cuyo", "sigla": "UNCUYO", "tipo": "publica"})
+
+        self.assertEqual(self._buscar("cuyo"), [("universidad", self.uni.id)])
+        self.assertEqual(self._buscar("utn"), [])
+
+    def test_eliminar_quita_del_indice(self):
+        self._buscar("sistemas")
+        EspecialidadService.eliminar_especialidad(self.esp.id)
+
+        self.assertEqual(self._buscar("sistemas"), [])
+
+    def test_reindexar(self):
+        db.session.add(Universidad(nombre="Universidad de Buenos Aires", sigla="UBA", tipo="publica"))
+        db.session.commit()
+        self.assertEqual(BusquedaRepository.buscar("buenos"), [])
+
+        self.assertEqual(BusquedaRepository.reindexar(), 4)
+        self.assertEqual([r["sigla"] for r in BusquedaRepository.buscar("buenos")], ["UBA"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,203 @@
+import unittest
+import os
+import time
+from unittest.mock import patch
+from redis.exceptions import ConnectionError as RedisConnectionError
+from app import create_app, db, entity_cache
+from app.caching import BreakerBackend, MemoryBackend
+from app.models import Especialidad, Facultad, Universidad
+from app.services import EspecialidadService
+from app.utils.circuit_breaker import CircuitBreaker, CircuitoAbierto
+
+
+class BackendCaido(MemoryBackend):
+    """MemoryBackend que, con `caido`, falla como un Redis inalcanzable."""
+
+    def __init__(self):
+        super().__init__()
+        self.caido = False
+        self.llamadas = 0
+        for nombre in ("get", "set", "get_many", "set_many", "exists", "incr", "add", "delete", "incr_delete"):
+            setattr(self, nombre, self._envolver(getattr(self, nombre)))
+
+    def _envolver(self, metodo):
+        def llamar(*args, **kwargs):
+            self.llamadas += 1
+            if self.caido:
+                raise RedisConnectionError("Connection refused")
+            return metodo(*args, **kwargs)
+        return llamar
+
+
+class RedisCaido:
+    """Cliente redis-py sin servidor: todo comando falla por conexión."""
+
+    def __init__(self):
+        self.comandos = 0
+
+    def _fallar(self, *args, **kwargs):
+        self.comandos += 1
+        raise RedisConnectionError("Connection refused")
+
+    get = set = mget = exists = incr = delete = publish = ping = _fallar
+
+    def pipeline(self, transaction=True):
+        self._fallar()
+
+
+class CircuitBreakerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.sano = False
+        self.breaker = CircuitBreaker("prueba", self._sondeo, umbral=3, intervalo=0.01,
+                                      errores=(RedisConnectionError,))
+
+    def tearDown(self):
+        self.breaker.cerrar()
+
+    def _sondeo(self):
+        if not self.sano:
+            raise RedisConnectionError("sigue caído")
+
+    def _fallar(self):
+        raise RedisConnectionError("Connection refused")
+
+    def _esperar_estado(self, estado):
+        limite = time.monotonic() + 2
+        while self.breaker.estado != estado and time.monotonic() < limite:
+            time.sleep(0.01)
+        self.assertEqual(self.breaker.estado, estado)
+
+    def test_abre_tras_fallas_seguidas(self):
+        for _ in range(3):
+            with self.assertRaises(RedisConnectionError):
+                self.breaker.llamar(self._fallar)
+        self.assertTrue(self.breaker.abierto)
+        llamadas = []
+        with self.assertRaises(CircuitoAbierto):
+            self.breaker.llamar(llamadas.append, 1)
+        self.assertEqual(llamadas, [])
+
+    def test_un_exito_reinicia_la_cuenta(self):
+        for _ in range(2):
+            with self.assertRaises(RedisConnectionError):
+                self.breaker.llamar(self._fallar)
+        self.assertEqual(self.breaker.llamar(lambda: "ok"), "ok")
+        with self.assertRaises(RedisConnectionError):
+            self.breaker.llamar(self._fallar)
+        self.assertFalse(self.breaker.abierto)
+
+    def test_errores_no_clasificados_no_cuentan(self):
+        for _ in range(5):
+            with self.assertRaises(ValueError):
+                self.breaker.llamar(int, "x")
+        self.assertFalse(self.breaker.abierto)
+
+    def test_sondeo_cierra_el_circuito(self):
+        cerrado = []
+        self.breaker.al_cerrar.append(lambda: cerrado.append(True))
+        for _ in range(3):
+            with self.assertRaises(RedisConnectionError):
+                self.breaker.llamar(self._fallar)
+        time.sleep(0.05)
+        self.assertTrue(self.breaker.abierto)
+
+        self.sano = True
+        self._esperar_estado(CircuitBreaker.CERRADO)
+        self.assertEqual(cerrado, [True])
+        self.assertEqual(self.breaker.llamar(lambda: "ok"), "ok")
+
+
+class BreakerBackendTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.remoto = BackendCaido()
+        self.breaker = CircuitBreaker("redis", lambda: None, umbral=2, intervalo=60,
+                                      errores=(RedisConnectionError,))
+        self.backend = BreakerBackend(self.remoto, self.breaker)
+
+    def test_fallas_se_degradan_sin_excepcion(self):
+        self.remoto.caido = True
+        self.assertIsNone(self.backend.get("k"))
+        self.assertEqual(self.backend.get_many(["a", "b"]), [None, None])
+        self.assertTrue(self.backend.add("lock", b"1", 5))
+        self.assertFalse(self.backend.exists("lock"))
+
+    def test_abierto_no_llama_al_backend(self):
+        self.remoto.caido = True
+        self.backend.get("a")
+        self.backend.get("b")
+        llamadas = self.remoto.llamadas
+        for _ in range(10):
+            self.backend.get("k")
+            self.backend.set("k", b"v")
+        self.assertEqual(self.remoto.llamadas, llamadas)
+
+    def test_invalidaciones_pendientes_se_reaplican_al_cerrar(self):
+        self.remoto.set("gestion:universidad:1", b"viejo")
+        self.remoto.caido = True
+        self.backend.incr_delete(["gestion:tag:tabla:universidad"], ["gestion:universidad:1"])
+        self.backend.incr("gestion:tag:universidad:1")
+        self.assertTrue(self.breaker.abierto)
+        self.assertEqual(self.backend.pendientes(), 3)
+
+        self.remoto.caido = False
+        self.breaker.cerrar()
+
+        self.assertEqual(self.backend.pendientes(), 0)
+        self.assertIsNone(self.remoto.get("gestion:universidad:1"))
+        self.assertEqual(self.remoto.get("gestion:tag:tabla:universidad"), b"1")
+        self.assertEqual(self.remoto.get("gestion:tag:universidad:1"), b"1")
+
+
+class RedisCaidoTestCase(unittest.TestCase):
+
+    def setUp(self):
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        universidad = Universidad(nombre="UTN", sigla="UTN", tipo="publica")
+        facultad = Facultad(nombre="FRM", abreviatura="FRM", directorio="d", sigla="FRM", codigoPostal="5500",
+                            ciudad="Mendoza", domicilio="x", telefono="1", contacto="c", email="f@utn.edu.ar",
+                            universidad=universidad)
+        self.especialidad = Especialidad(nombre="Sistemas", letra="K", observacion="-", facultad=facultad)
+        db.session.add(self.especialidad)
+        db.session.commit()
+
+        self.redis = RedisCaido()
+        self.app.config.update(ENTITY_CACHE_BACKEND="redis", ENTITY_CACHE_LOCAL_MAXSIZE=0,
+                               REDIS_BREAKER_FALLAS=3, REDIS_BREAKER_SONDEO=60)
+        entity_cache.init_app(self.app, db, self.redis)
+
+    def tearDown(self):
+        entity_cache.breaker.cerrar()
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_buscar_sirve_desde_la_base_sin_reintentos(self):
+        with patch("app.utils.retry.time") as reloj:
+            for _ in range(5):
+                especialidad = EspecialidadService.buscar_especialidad(self.especialidad.id)
+                self.assertEqual(especialidad.nombre, "Sistemas")
+        reloj.sleep.assert_not_called()
+        self.assertTrue(entity_cache.breaker.abierto)
+
+        comandos = self.redis.comandos
+        EspecialidadService.buscar_especialidad(self.especialidad.id)
+        self.assertEqual(self.redis.comandos, comandos)
+
+    def test_vistas_cacheadas_responden_con_el_circuito_abierto(self):
+        client = self.app.test_client()
+        for _ in range(4):
+            response = client.get(f"/api/v1/especialidad/{self.especialidad.id}")
+            self.assertEqual(response.status_code, 200)
+        self.assertFalse(entity_cache.disponible())
+        response = client.get("/api/v1/especialidad")
+        self.assertEqual(response.status_code, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import os
+from app import create_app, db
+from app.models import Universidad
+from app.services import UniversidadService
+from app.utils.pagination import codificar_cursor, decodificar_cursor
+
+
+class CursorPaginationTestCase(unittest.TestCase):
+
+    def setUp(self):
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        for i in range(7):
+            self._crear(i + 1)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _crear(self, n):
+        UniversidadService.crear_universidad(Universidad(nombre=f"Universidad {n}", sigla=f"U{n}", tipo="publica"))
+
+    def _pagina(self, cursor, per_page=3):
+        response = self.client.get('/api/v1/universidad', headers={"X-cursor": cursor, "X-per-page": str(per_page)})
+        self.assertEqual(response.status_code, 200)
+        return response.get_json()
+
+    def test_cursor_ida_y_vuelta(self):
+        self.assertEqual(decodificar_cursor(codificar_cursor(42)), 42)
+        self.assertIsNone(decodificar_cursor("*"))
+
+    def test_cursor_invalido(self):
+        response = self.client.get('/api/v1/universidad', headers={"X-cursor": "no-es-un-cursor"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_recorre_todas_las_paginas(self):
+        siglas = []
+        data = self._pagina("*")
+        siglas += [u["sigla"] for u in data["content"]]
+        while data["pageable"]["next_cursor"]:
+            data = self._pagina(data["pageable"]["next_cursor"])
+            siglas += [u["sigla"] for u in data["content"]]
+
+        self.assertEqual(siglas, [f"U{i + 1}" for i in range(7)])
+        self.assertEqual(data["pageable"]["total_elements"], 7)
+
+    def test_bajas_concurrentes_no_saltean_elementos(self):
+        primera = self._pagina("*")
+        # una baja entre páginas: con OFFSET la página 2 empezaría en U5
+        UniversidadService.eliminar_universidad(primera["content"][0]["id"])
+
+        segunda = self._pagina(primera["pageable"]["next_cursor"])
+
+        self.assertEqual([u["sigla"] for u in segunda["content"]], ["U4", "U5", "U6"])
+
+    def test_modo_paginado_sin_cambios(self):
+        data = self.client.get('/api/v1/universidad', headers={"X-page": "3", "X-per-page": "3"}).get_json()
+        self.assertEqual(data["pageable"]["page"], 3)
+        self.assertNotIn("next_cursor", data["pageable"])
+        self.assertEqual([u["sigla"] for u in data["content"]], ["U7"])
+
+    def test_pagina_vacia_sin_next_cursor(self):
+        data = UniversidadService.listar_universidades(per_page=0, keyset=True)
+        self.assertEqual((data["content"], data["next_cursor"]), ([], None))
+
+    def test_page_y_per_page_menores_a_uno(self):
+        for headers in ({"X-cursor": "*", "X-per-page": "0"}, {"X-per-page": "-1"}, {"X-page": "0"}):
+            response = self.client.get('/api/v1/universidad', headers=headers)
+            self.assertEqual(response.status_code, 400, headers)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,238 @@
+import unittest
+import os
+import time
+import threading
+from app import create_app, db, entity_cache
+from app.caching import MemoryBackend, PickleSerializer, LocalLRU, TieredBackend, LocalInvalidationBus, RedisInvalidationBus
+from app.models import Universidad, Facultad
+from app.services import UniversidadService, FacultadService
+
+
+class EntityCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _crear_universidad(self, nombre="UTN", sigla="UTN"):
+        return UniversidadService.crear_universidad(Universidad(nombre=nombre, sigla=sigla, tipo="publica"))
+
+    def test_backend_en_memoria_en_testing(self):
+        self.assertIsInstance(entity_cache.backend, MemoryBackend)
+
+    def test_clave_con_namespace(self):
+        self.assertEqual(entity_cache.clave(Universidad, 7), "gestion:universidad:7")
+        self.assertEqual(entity_cache.clave(Facultad, 7), "gestion:facultad:7")
+
+    def test_ttl_por_entidad(self):
+        self.assertEqual(entity_cache.ttl(Universidad), self.app.config["ENTITY_CACHE_TTL"]["universidad"])
+
+    def test_buscar_universidad_llena_el_cache(self):
+        uni = self._crear_universidad()
+        UniversidadService.buscar_universidad(uni.id)
+
+        self.assertIsNotNone(entity_cache.backend.get(entity_cache.clave(Universidad, uni.id)))
+
+    def test_hit_devuelve_entidad_adjunta_a_la_sesion(self):
+        uni = self._crear_universidad()
+        FacultadService.crear_facultad(Facultad(
+            nombre='Facultad Regional Mendoza', abreviatura='FRM', directorio='dir', sigla='FRM',
+            codigoPostal='5500', ciudad='Mendoza', domicilio='Calle Falsa 123', telefono='1234',
+            contacto='Juan', email='frm@utn.edu.ar', universidad_id=uni.id))
+        UniversidadService.buscar_universidad(uni.id)
+        db.session.expunge_all()
+
+        encontrada = UniversidadService.buscar_universidad(uni.id)
+
+        self.assertEqual(encontrada.nombre, "UTN")
+        self.assertEqual(len(encontrada.facultades), 1)
+
+    def test_hit_no_pisa_la_entidad_de_la_sesion(self):
+        uni = self._crear_universidad()
+        UniversidadService.buscar_universidad(uni.id)
+        uni.nombre = "UTN sin flush"
+
+        encontrada = UniversidadService.buscar_universidad(uni.id)
+
+        self.assertIs(encontrada, uni)
+        self.assertEqual(encontrada.nombre, "UTN sin flush")
+
+    def test_actualizar_invalida_el_cache(self):
+        uni_id = self._crear_universidad().id
+        UniversidadService.buscar_universidad(uni_id)
+
+        UniversidadService.actualizar_universidad(Universidad(nombre="UTN 2", sigla="UTN2", tipo="publica"), uni_id)
+        db.session.expunge_all()
+
+        self.assertIsNone(entity_cache.backend.get(entity_cache.clave(Universidad, uni_id)))
+        self.assertEqual(UniversidadService.buscar_universidad(uni_id).nombre, "UTN 2")
+
+    def test_single_flight_una_sola_carga_por_clave(self):
+        cargas = []
+
+        def cargar():
+            cargas.append(1)
+            time.sleep(0.2)
+            return Universidad(id=99, nombre="UTN", sigla="UTN", tipo="publica")
+
+        def buscar():
+            with self.app.app_context():
+                resultados.append(entity_cache.buscar(Universidad, 99, cargar).nombre)
+
+        resultados = []
+        hilos = [threading.Thread(target=buscar) for _ in range(20)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        self.assertEqual(len(cargas), 1)
+        self.assertEqual(resultados, ["UTN"] * 20)
+
+    def test_single_flight_espera_al_lock_de_otro_proceso(self):
+        key = entity_cache.clave(Universidad, 5)
+        entity_cache.backend.add(f"{key}:lock", b"otro-worker", 5)
+
+        def otro_worker_llena_la_clave():
+            time.sleep(0.1)
+            entity_cache.backend.set(key, entity_cache.serializer.dumps(
+                {"id": 5, "nombre": "UBA", "sigla": "UBA", "tipo": "publica"}))
+
+        threading.Thread(target=otro_worker_llena_la_clave).start()
+        encontrada = entity_cache.buscar(Universidad, 5, lambda: self.fail("no debía ir a la base"))
+
+        self.assertEqual(encontrada.nombre, "UBA")
+
+    def test_single_flight_no_libera_el_lock_de_otro_worker(self):
+        entity_cache.lock_ttl = 0.05
+        lock_key = f"{entity_cache.clave(Universidad, 7)}:lock"
+
+        def cargar_lento():
+            time.sleep(0.1)
+            # el lock propio expiró y otro worker tomó uno nuevo
+            self.assertTrue(entity_cache.backend.add(lock_key, b"otro-worker", 5))
+            return Universidad(id=7, nombre="UTN", sigla="UTN", tipo="publica")
+
+        entity_cache.buscar(Universidad, 7, cargar_lento)
+
+        self.assertEqual(entity_cache.backend.get(lock_key), b"otro-worker")
+
+    def test_memory_backend_delete_if_equal(self):
+        backend = MemoryBackend()
+        backend.add("lock", b"a", 5)
+        self.assertFalse(backend.delete_if_equal("lock", b"b"))
+        self.assertTrue(backend.delete_if_equal("lock", b"a"))
+        self.assertIsNone(backend.get("lock"))
+
+    def test_memory_backend_expira(self):
+        backend = MemoryBackend()
+        backend.set("k", b"v", ttl=1)
+        self.assertEqual(backend.get("k"), b"v")
+        backend._data["k"] = (b"v", time.monotonic() - 1)
+        self.assertIsNone(backend.get("k"))
+
+    def test_pickle_serializer(self):
+        serializer = PickleSerializer()
+        self.assertEqual(serializer.loads(serializer.dumps({"id": 1})), {"id": 1})
+
+
+class TieredBackendTestCase(unittest.TestCase):
+
+    def setUp(self):
+        # Dos "workers" con su LRU propio, un Redis compartido y un bus común
+        self.remote = MemoryBackend()
+        self.bus = LocalInvalidationBus()
+        self.worker_a = TieredBackend(LocalLRU(10), self.remote, self.bus)
+        self.worker_b = TieredBackend(LocalLRU(10), self.remote, self.bus)
+
+    def test_lru_descarta_el_menos_usado(self):
+        lru = LocalLRU(max_items=2)
+        lru.set("a", b"1")
+        lru.set("b", b"2")
+        lru.get("a")
+        lru.set("c", b"3")
+        self.assertEqual(lru.get("a"), b"1")
+        self.assertIsNone(lru.get("b"))
+        self.assertEqual(len(lru), 2)
+
+    def test_hit_local_no_consulta_el_remoto(self):
+        self.worker_a.set("k", b"v")
+        self.remote.delete("k")
+        self.assertEqual(self.worker_a.get("k"), b"v")
+
+    def test_miss_local_se_llena_desde_el_remoto(self):
+        self.worker_a.set("k", b"v")
+        self.assertEqual(self.worker_b.get("k"), b"v")
+        self.assertEqual(self.worker_b.local.get("k"), b"v")
+
+    def test_invalidacion_llega_a_todos_los_workers(self):
+        self.worker_a.set("k", b"v")
+        self.worker_b.get("k")
+
+        self.worker_a.delete("k")
+        self.bus.publicar(["k"])
+
+        self.assertIsNone(self.worker_b.local.get("k"))
+        self.assertIsNone(self.worker_b.get("k"))
+
+    def test_invalidacion_durante_la_lectura_no_rellena_el_lru(self):
+        self.worker_a.set("k", b"viejo")
+        leer = self.remote.get
+
+        def leer_e_invalidar(key):
+            # El worker B lee el valor viejo y, antes de copiarlo al LRU, A lo reescribe e invalida.
+            value = leer(key)
+            self.worker_a.set("k", b"nuevo")
+            self.bus.publicar(["k"])
+            return value
+
+        self.remote.get = leer_e_invalidar
+        self.assertEqual(self.worker_b.get("k"), b"viejo")
+        self.remote.get = leer
+
+        self.assertIsNone(self.worker_b.local.get("k"))
+        self.assertEqual(self.worker_b.get("k"), b"nuevo")
+
+    def test_reconexion_vacia_el_nivel_local(self):
+        self.worker_a.set("k", b"v")
+        for callback in self.bus.on_reconnect:
+            callback()
+        self.assertEqual(len(self.worker_a.local), 0)
+
+
+class RedisInvalidationBusTestCase(unittest.TestCase):
+
+    class _Cliente:
+        def __init__(self):
+            self.publicados = []
+
+        def publish(self, channel, data):
+            self.publicados.append(data)
+
+    def test_no_entrega_dos_veces_sus_propios_mensajes(self):
+        cliente = self._Cliente()
+        bus = RedisInvalidationBus(cliente, "canal")
+        otro = RedisInvalidationBus(self._Cliente(), "canal")
+        recibidos, recibidos_otro = [], []
+        bus.suscribir(recibidos.append)
+        otro.suscribir(recibidos_otro.append)
+
+        bus.publicar(["k"], entidad="universidad")
+        # el suscriptor de cada proceso recibe lo publicado en el canal
+        bus._recibir(cliente.publicados[0])
+        otro._recibir(cliente.publicados[0])
+
+        self.assertEqual(recibidos, [{"claves": ["k"], "entidad": "universidad"}])
+        self.assertEqual(recibidos_otro, [{"claves": ["k"], "entidad": "universidad"}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -84,11 +84,13 @@ class EspecialidadServiceTestCase(unittest.TestCase):
         self.assertIsNone(EspecialidadService.buscar_especialidad(e.id))
 
     # Retry
-    def test_retry_crear_especialidad(self):
+    def test_retry_solo_en_lecturas(self):
         e = self._crear_especialidades(1)[0]
-        # Verifica que el decorator retry está presente
-        self.assertTrue(hasattr(EspecialidadService.crear_especialidad, "__wrapped__"))
-        # Crear con retry activado
+        # Las lecturas se reintentan; las escrituras no (un alta reintentada podría duplicarse)
+        self.assertTrue(hasattr(EspecialidadService.buscar_especialidad, "__wrapped__"))
+        self.assertTrue(hasattr(EspecialidadService.listar_especialidades, "__wrapped__"))
+        for escritura in ("crear_especialidad", "actualizar_especialidad", "eliminar_especialidad"):
+            self.assertFalse(hasattr(getattr(EspecialidadService, escritura), "__wrapped__"), escritura)
         resultado = EspecialidadService.crear_especialidad(e)
         self.assertIsNotNone(resultado)
 
@@ -0,0 +1,156 @@
+import unittest
+import os
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from app import create_app, especialidad_client
+from app.services import FacultadService
+from app.utils.circuit_breaker import CircuitoAbierto
+from app.utils.retry import ErrorHTTP
+
+ESPECIALIDADES = {i: {"id": i, "nombre": f"Especialidad {i}", "letra": "K"} for i in range(1, 21)}
+
+
+class ServicioEspecialidades(BaseHTTPRequestHandler):
+    """Sustituto local del servicio de especialidades (HTTP/1.1 con keep-alive)."""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.conexiones += 1
+
+    def do_GET(self):
+        servidor = self.server
+        with servidor.lock:
+            servidor.pedidos.append(self.path)
+        time.sleep(servidor.demora)
+        id = self.path.rstrip("/").rsplit("/", 1)[-1]
+        if servidor.caido:
+            self._responder(503, {"error": "no disponible"})
+        elif id.isdigit() and int(id) in ESPECIALIDADES:
+            self._responder(200, ESPECIALIDADES[int(id)])
+        elif id == "especialidades":
+            self._responder(200, [])
+        else:
+            self._responder(404, {"error": "no encontrada"})
+
+    def _responder(self, status, cuerpo):
+        datos = json.dumps(cuerpo).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(datos)))
+        self.end_headers()
+        self.wfile.write(datos)
+
+    def log_message(self, *args):
+        pass
+
+
+class EspecialidadClientTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.servidor = ThreadingHTTPServer(("127.0.0.1", 0), ServicioEspecialidades)
+        self.servidor.daemon_threads = True
+        self.servidor.pedidos, self.servidor.lock = [], threading.Lock()
+        self.servidor.conexiones, self.servidor.demora, self.servidor.caido = 0, 0, False
+        threading.Thread(target=self.servidor.serve_forever, daemon=True).start()
+
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app.config.update(
+            ESPECIALIDAD_SERVICE_URL=f"http://127.0.0.1:{self.servidor.server_port}/api/especialidades",
+            ESPECIALIDAD_CLIENT_BREAKER_FALLAS=3, ESPECIALIDAD_CLIENT_BREAKER_SONDEO=0.05,
+            ESPECIALIDAD_CLIENT_WORKERS=8)
+        especialidad_client.init_app(self.app)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+    def tearDown(self):
+        especialidad_client.breaker.cerrar()
+        especialidad_client.init_app(self.app)
+        self.app_context.pop()
+        self.servidor.shutdown()
+        self.servidor.server_close()
+
+    def test_obtener_y_cache_por_id(self):
+        self.assertEqual(especialidad_client.obtener(3)["nombre"], "Especialidad 3")
+        self.assertEqual(especialidad_client.obtener(3)["nombre"], "Especialidad 3")
+        self.assertEqual(self.servidor.pedidos, ["/api/especialidades/3"])
+
+        especialidad_client.invalidar(3)
+        especialidad_client.obtener(3)
+        self.assertEqual(len(self.servidor.pedidos), 2)
+
+    def test_reusa_la_conexion(self):
+        for id in (1, 2, 3, 4):
+            especialidad_client.obtener(id)
+        self.assertEqual(self.servidor.conexiones, 1)
+
+    def test_404_no_se_cachea_ni_abre_el_circuito(self):
+        for _ in range(5):
+            with self.assertRaises(ErrorHTTP) as error:
+                especialidad_client.obtener(999)
+            self.assertEqual(error.exception.status, 404)
+        self.assertEqual(len(self.servidor.pedidos), 5)
+        self.assertFalse(especialidad_client.breaker.abierto)
+
+    def test_circuito_abre_con_5xx_y_cierra_con_el_sondeo(self):
+        self.servidor.caido = True
+        for _ in range(3):
+            with self.assertRaises(ErrorHTTP):
+                especialidad_client.obtener(1)
+        pedidos = len(self.servidor.pedidos)
+        with self.assertRaises(CircuitoAbierto):
+            especialidad_client.obtener(1)
+        self.assertEqual(len(self.servidor.pedidos) - pedidos, 0)
+
+        self.servidor.caido = False
+        limite = time.monotonic() + 2
+        while especialidad_client.breaker.abierto and time.monotonic() < limite:
+            time.sleep(0.02)
+        self.assertEqual(especialidad_client.obtener(1)["id"], 1)
+        # El sondeo pide una sola especialidad, no la colección entera.
+        self.assertNotIn("/api/especialidades", self.servidor.pedidos)
+        self.assertGreater(self.servidor.pedidos.count("/api/especialidades/1"), 4)
+
+    def test_sondeo_usa_la_url_de_salud(self):
+        self.app.config["ESPECIALIDAD_SERVICE_HEALTH_URL"] = f"http://127.0.0.1:{self.servidor.server_port}/health"
+        especialidad_client.init_app(self.app)
+        self.servidor.caido = True
+        for _ in range(3):
+            with self.assertRaises(ErrorHTTP):
+                especialidad_client.obtener(2)
+        # /health responde 404 en este sustituto: sin 5xx el servicio cuenta como sano.
+        self.servidor.caido = False
+        limite = time.monotonic() + 2
+        while especialidad_client.breaker.abierto and time.monotonic() < limite:
+            time.sleep(0.02)
+        self.assertFalse(especialidad_client.breaker.abierto)
+        self.assertIn("/health", self.servidor.pedidos)
+        self.assertNotIn("/api/especialidades", self.servidor.pedidos)
+
+    def test_obtener_varios_en_paralelo(self):
+        especialidad_client.obtener(1)
+        self.servidor.demora = 0.2
+        inicio = time.monotonic()
+        resultado = especialidad_client.obtener_varios([1, 2, 3, 4, 5, 6, 7, 8, 999, 2])
+        duracion = time.monotonic() - inicio
+
+        self.assertEqual(list(resultado), [1, 2, 3, 4, 5, 6, 7, 8, 999])
+        self.assertEqual(resultado[8]["nombre"], "Especialidad 8")
+        self.assertIsNone(resultado[999])
+        # 8 pedidos de 0.2 s: en serie serían 1.6 s.
+        self.assertLess(duracion, 0.8)
+        self.assertNotIn("/api/especialidades/1", self.servidor.pedidos[1:])
+
+    def test_servicio_de_facultad_usa_el_cliente(self):
+        service = FacultadService()
+        self.assertEqual(service.obtener_especialidad(5)["id"], 5)
+        self.assertEqual(set(service.obtener_especialidades([5, 6])), {5, 6})
+        self.assertEqual(len(self.servidor.pedidos), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+import unittest
+import os
+from sqlalchemy import event
+from app import create_app, db
+from app.mapping import UniversidadMapping, FacultadMapping, EspecialidadMapping
+from app.models import Universidad, Facultad, Especialidad
+
+
+class ExpandTestCase(unittest.TestCase):
+
+    def setUp(self):
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app.config["CACHE_TYPE"] = "NullCache"
+        self.app.config["CACHE_NO_NULL_WARNING"] = True
+        from app import cache
+        cache.init_app(self.app)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _sembrar(self, universidades, facultades, especialidades):
+        inicio = db.session.query(Universidad).count()
+        for u in range(inicio, inicio + universidades):
+            uni = Universidad(nombre=f"Universidad {u}", sigla=f"U{u}", tipo="publica")
+            db.session.add(uni)
+            for f in range(facultades):
+                fac = Facultad(nombre=f"Facultad {u}-{f}", sigla=f"F{u}{f}", abreviatura="F", directorio="Dir",
+                               codigoPostal="5500", ciudad="Mendoza", domicilio="Calle 1", telefono="1",
+                               contacto="c", email="f@utn.edu.ar", universidad=uni)
+                db.session.add(fac)
+                for e in range(especialidades):
+                    db.session.add(Especialidad(nombre=f"Especialidad {e}", letra="E", observacion="-", facultad=fac))
+        db.session.commit()
+        db.session.remove()
+
+    def _get(self, url):
+        consultas = []
+        listener = lambda *args: consultas.append(args[2])
+        event.listen(db.engine, "before_cursor_execute", listener)
+        try:
+            response = self.client.get(url)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", listener)
+        self.assertEqual(response.status_code, 200, response.get_json())
+        return response.get_json(), len(consultas)
+
+    def test_detalle_con_arbol_completo(self):
+        self._sembrar(1, 2, 3)
+        data, _ = self._get('/api/v1/universidad/1?expand=facultades.especialidades')
+
+        self.assertEqual([f["sigla"] for f in data["facultades"]], ["F00", "F01"])
+        self.assertEqual(len(data["facultades"][0]["especialidades"]), 3)
+        self.assertNotIn("universidad", data["facultades"][0])
+
+    def test_cantidad_de_consultas_constante_en_detalle(self):
+        self._sembrar(1, 3, 2)
+        _, pocas = self._get('/api/v1/universidad/1?expand=facultades,facultades.especialidades')
+        for i in range(20):
+            db.session.add(Facultad(nombre=f"Extra {i}", sigla=f"X{i}", abreviatura="F", directorio="Dir",
+                                    codigoPostal="5500", ciudad="Mendoza", domicilio="Calle 1", telefono="1",
+                                    contacto="c", email="f@utn.edu.ar", universidad_id=1,
+                                    especialidades=[Especialidad(nombre="E", letra="E", observacion="-")]))
+        db.session.commit()
+
+        data, muchas = self._get('/api/v1/universidad/1?expand=facultades,facultades.especialidades')
+
+        self.assertEqual(len(data["facultades"]), 23)
+        self.assertEqual(pocas, 3)
+        self.assertEqual(muchas, pocas)
+
+    def test_cantidad_de_consultas_constante_en_listado(self):
+        self._sembrar(2, 2, 2)
+        _, pocas = self._get('/api/v1/universidad?expand=facultades.especialidades')
+        self._sembrar(6, 4, 3)
+        data, muchas = self._get('/api/v1/universidad?expand=facultades.especialidades')
+
+        self.assertEqual(len(data["content"]), 8)
+        self.assertEqual(pocas, 3)
+        self.assertEqual(muchas, pocas)
+
+    def test_many_to_one_con_fields(self):
+        self._sembrar(1, 1, 2)
+        data, consultas = self._get('/api/v1/especialidad?expand=facultad.universidad&fields=nombre')
+
+        item = data["content"][0]
+        self.assertEqual(set(item), {"id", "nombre", "facultad"})
+        self.assertEqual(item["facultad"]["universidad"]["sigla"], "U0")
+        self.assertEqual(consultas, 3)
+
+    def test_sin_expand_no_hay_relaciones(self):
+        self._sembrar(1, 1, 1)
+        data, consultas = self._get('/api/v1/universidad/1')
+        self.assertNotIn("facultades", data)
+        self.assertEqual(consultas, 1)
+
+    def test_schema_sin_expand_no_recorre_relaciones(self):
+        self._sembrar(1, 1, 1)
+        uni = db.session.get(Universidad, 1)
+        fac, esp = uni.facultades[0], uni.facultades[0].especialidades[0]
+
+        self.assertEqual(set(UniversidadMapping().dump(uni)), {"id", "nombre", "sigla", "tipo"})
+        self.assertNotIn("universidad", FacultadMapping().dump(fac))
+        self.assertNotIn("facultad", EspecialidadMapping().dump(esp))
+
+    def test_schema_con_relaciones_no_vuelve_al_padre(self):
+        self._sembrar(1, 1, 1)
+        uni = db.session.get(Universidad, 1)
+
+        data = UniversidadMapping(exclude=()).dump(uni)
+
+        self.assertNotIn("universidad", data["facultades"][0])
+        self.assertNotIn("facultad", data["facultades"][0]["especialidades"][0])
+
+    def test_expand_invalido(self):
+        self.assertEqual(self.client.get('/api/v1/universidad?expand=especialidades').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/facultad/1?expand=facultades').status_code, 400)
+
+
+class ExpandCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_cambio_en_relacion_invalida_la_vista_expandida(self):
+        self.client.post('/api/v1/universidad', json={"nombre": "UTN", "sigla": "UTN", "tipo": "publica"})
+        self.client.get('/api/v1/universidad/1?expand=facultades')
+
+        self.client.post('/api/v1/facultad', json={
+            "nombre": "FRM", "sigla": "FRM", "abreviatura": "FRM", "directorio": "Dir", "codigoPostal": "5500",
+            "ciudad": "Mendoza", "domicilio": "Calle 1", "telefono": "1", "contacto": "c",
+            "email": "frm@utn.edu.ar", "universidad_id": 1})
+
+        data = self.client.get('/api/v1/universidad/1?expand=facultades').get_json()
+        self.assertEqual([f["sigla"] for f in data["facultades"]], ["FRM"])
+
+
+if __name__ == '__main__':
+    unittest.main()
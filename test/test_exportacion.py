@@ -0,0 +1,82 @@
+import csv
+import io
+import json
+import unittest
+import os
+from app import create_app, db
+from app.models import Universidad, Facultad, Especialidad
+from app.services import ExportacionService
+
+
+class ExportacionTestCase(unittest.TestCase):
+
+    def setUp(self):
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app.config['EXPORT_BATCH_SIZE'] = 4
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        uni = Universidad(nombre="UTN", sigla="UTN", tipo="publica")
+        db.session.add(uni)
+        db.session.commit()
+        fac = Facultad(nombre="Regional Mendoza", sigla="FRM", abreviatura="F", directorio="Dir",
+                       codigoPostal="5500", ciudad="Mendoza", domicilio="Calle 1", telefono="1",
+                       contacto="c", email="f@utn.edu.ar", universidad_id=uni.id)
+        db.session.add(fac)
+        db.session.commit()
+        for i in range(10):
+            db.session.add(Especialidad(nombre=f"Especialidad {i}", letra="A" if i % 2 else "B",
+                                        observacion="Sin, comas \"ni\" comillas", facultad_id=fac.id))
+        db.session.commit()
+        db.session.remove()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_ndjson(self):
+        r = self.client.get('/api/v1/especialidad/export')
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.mimetype, "application/x-ndjson")
+        self.assertIn("especialidades.ndjson", r.headers["Content-Disposition"])
+        filas = [json.loads(linea) for linea in r.get_data(as_text=True).splitlines()]
+        self.assertEqual(len(filas), 10)
+        self.assertEqual(filas[0], {"id": 1, "nombre": "Especialidad 0", "letra": "B",
+                                    "observacion": "Sin, comas \"ni\" comillas", "facultad_id": 1})
+        self.assertEqual([f["id"] for f in filas], list(range(1, 11)))
+
+    def test_csv_con_fields_y_filtros(self):
+        r = self.client.get('/api/v1/especialidad/export?format=csv&fields=nombre,observacion',
+                            headers={"X-filters": json.dumps({"letra": "A"})})
+        self.assertEqual(r.mimetype, "text/csv")
+        filas = list(csv.reader(io.StringIO(r.get_data(as_text=True))))
+        self.assertEqual(filas[0], ["id", "nombre", "observacion"])
+        self.assertEqual(len(filas), 6)
+        self.assertEqual(filas[1], ["2", "Especialidad 1", "Sin, comas \"ni\" comillas"])
+
+    def test_respuesta_en_trozos(self):
+        r = self.client.get('/api/v1/especialidad/export')
+        self.assertTrue(r.is_streamed)
+        # 10 filas en lotes de 4: 3 trozos
+        trozos = ExportacionService.exportar(Especialidad, ["id"], "ndjson", lote=4)
+        self.assertEqual([t.count("\n") for t in trozos], [4, 4, 2])
+
+    def test_otras_entidades(self):
+        universidades = self.client.get('/api/v1/universidad/export?format=csv').get_data(as_text=True)
+        self.assertEqual(universidades.splitlines(), ["id,nombre,sigla,tipo", "1,UTN,UTN,publica"])
+        facultad = json.loads(self.client.get('/api/v1/facultad/export').get_data(as_text=True))
+        self.assertEqual(facultad["sigla"], "FRM")
+        self.assertNotIn("especialidades", facultad)
+
+    def test_parametros_invalidos(self):
+        self.assertEqual(self.client.get('/api/v1/especialidad/export?format=xml').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/especialidad/export?fields=facultad').status_code, 400)
+        r = self.client.get('/api/v1/especialidad/export', headers={"X-filters": "{"})
+        self.assertEqual(r.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
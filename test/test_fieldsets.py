@@ -0,0 +1,79 @@
+import unittest
+import os
+from sqlalchemy import event
+from app import create_app, db
+from app.models import Universidad, Facultad
+
+
+class FieldsetsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        uni = Universidad(nombre="UTN", sigla="UTN", tipo="publica")
+        db.session.add(uni)
+        db.session.commit()
+        for i in range(3):
+            db.session.add(Facultad(
+                nombre=f"Facultad {i}", sigla=f"F{i}", abreviatura="F", directorio="Dir",
+                codigoPostal="5500", ciudad="Mendoza", domicilio="Calle 1", telefono="1",
+                contacto="c", email="f@utn.edu.ar", universidad_id=uni.id))
+        db.session.commit()
+        db.session.remove()
+
+        self.consultas = []
+        event.listen(db.engine, "before_cursor_execute", self._registrar)
+
+    def tearDown(self):
+        event.remove(db.engine, "before_cursor_execute", self._registrar)
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _registrar(self, conn, cursor, statement, parameters, context, executemany):
+        self.consultas.append(statement)
+
+    def test_listado_con_fields(self):
+        data = self.client.get('/api/v1/facultad?fields=nombre').get_json()
+
+        self.assertEqual(data["content"][0], {"id": 1, "nombre": "Facultad 0"})
+        self.assertEqual(data["pageable"]["total_elements"], 3)
+        select = self.consultas[-1]
+        self.assertIn("facultades.nombre", select)
+        self.assertNotIn("facultades.email", select)
+
+    def test_header_x_fields(self):
+        data = self.client.get('/api/v1/facultad', headers={"X-fields": "sigla, ciudad"}).get_json()
+        self.assertEqual(set(data["content"][0]), {"id", "sigla", "ciudad"})
+
+    def test_cache_de_vista_varia_por_campos(self):
+        self.client.get('/api/v1/facultad', headers={"X-fields": "nombre"})
+        completo = self.client.get('/api/v1/facultad').get_json()
+        self.assertIn("email", completo["content"][0])
+
+        self.client.get('/api/v1/facultad/1', headers={"X-fields": "nombre"})
+        self.assertIn("email", self.client.get('/api/v1/facultad/1').get_json())
+
+    def test_detalle_con_fields(self):
+        data = self.client.get('/api/v1/universidad/1?fields=sigla').get_json()
+        self.assertEqual(data, {"id": 1, "sigla": "UTN"})
+
+    def test_campo_desconocido(self):
+        response = self.client.get('/api/v1/facultad?fields=nombre,clave')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("clave", response.get_json()["error"])
+        self.assertEqual(self.client.get('/api/v1/universidad/1?fields=facultades').status_code, 400)
+
+    def test_cursor_con_fields(self):
+        data = self.client.get('/api/v1/especialidad?fields=nombre', headers={"X-cursor": "*"}).get_json()
+        self.assertEqual(data["content"], [])
+        data = self.client.get('/api/v1/facultad?fields=nombre', headers={"X-cursor": "*", "X-per-page": "2"}).get_json()
+        self.assertIsNotNone(data["pageable"]["next_cursor"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+import os
+import json
+from app import create_app, db
+from app.filters import compilar_filtros, FiltroInvalido
+from app.filters.compiler import _plan
+from app.models import Universidad, Especialidad
+from app.services import UniversidadService
+
+
+class FilterCompilerTestCase(unittest.TestCase):
+
+    def test_valor_simple_usa_la_operacion_por_defecto(self):
+        self.assertEqual(compilar_filtros(Universidad, {"sigla": "UTN"}),
+                         [{"field": "sigla", "op": "==", "value": "UTN"}])
+        self.assertEqual(compilar_filtros(Especialidad, {"nombre": "sist"}),
+                         [{"field": "nombre", "op": "ilike_escapado", "value": "%sist%"}])
+
+    def test_operaciones(self):
+        filtros = compilar_filtros(Universidad, {
+            "nombre": {"prefix": "Uni"},
+            "id": {"range": [2, None]},
+            "tipo": {"in": ["publica", "privada"]},
+        })
+        self.assertEqual(filtros, [
+            {"field": "nombre", "op": "like_escapado", "value": "Uni%"},
+            {"field": "id", "op": ">=", "value": 2},
+            {"field": "tipo", "op": "in", "value": ["publica", "privada"]},
+        ])
+
+    def test_campo_inexistente(self):
+        with self.assertRaises(FiltroInvalido):
+            compilar_filtros(Universidad, {"observacion": "x"})
+
+    def test_operacion_desconocida(self):
+        with self.assertRaises(FiltroInvalido):
+            compilar_filtros(Universidad, {"nombre": {"regex": ".*"}})
+
+    def test_comodines_escapados(self):
+        self.assertEqual(compilar_filtros(Universidad, {"nombre": {"prefix": "%UTN_\\"}}),
+                         [{"field": "nombre", "op": "like_escapado", "value": "\\%UTN\\_\\\\%"}])
+
+    def test_estricto_rechaza_filtros_no_indexados(self):
+        with self.assertRaises(FiltroInvalido):
+            compilar_filtros(Especialidad, {"observacion": {"eq": "x"}}, estricto=True)
+        with self.assertRaises(FiltroInvalido):
+            compilar_filtros(Universidad, {"nombre": {"ilike": "tec"}}, estricto=True)
+        self.assertEqual(len(compilar_filtros(Especialidad, {"facultad_id": 1}, estricto=False)), 1)
+
+    def test_plan_cacheado_por_forma(self):
+        _plan.cache_clear()
+        compilar_filtros(Universidad, {"sigla": "UTN"})
+        compilar_filtros(Universidad, {"sigla": "UBA"})
+        info = _plan.cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 1))
+
+
+class FilterEndpointTestCase(unittest.TestCase):
+
+    def setUp(self):
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        for i, nombre in enumerate(["Tecnologica", "Tecnica", "Nacional", "Austral"]):
+            UniversidadService.crear_universidad(Universidad(nombre=nombre, sigla=f"U{i + 1}", tipo="publica"))
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _listar(self, filtros):
+        return self.client.get('/api/v1/universidad', headers={"X-filters": json.dumps(filtros)})
+
+    def test_prefix(self):
+        data = self._listar({"nombre": {"prefix": "Tec"}}).get_json()
+        self.assertEqual([u["nombre"] for u in data["content"]], ["Tecnologica", "Tecnica"])
+
+    def test_prefix_con_guion_bajo_es_literal(self):
+        for nombre, sigla in (("UTN_FRM", "U5"), ("UTNXFRM", "U6"), ("UTN%FRM", "U7")):
+            UniversidadService.crear_universidad(Universidad(nombre=nombre, sigla=sigla, tipo="publica"))
+
+        data = self._listar({"nombre": {"prefix": "UTN_"}}).get_json()
+        self.assertEqual([u["nombre"] for u in data["content"]], ["UTN_FRM"])
+        data = self._listar({"nombre": {"ilike": "n%f"}}).get_json()
+        self.assertEqual([u["nombre"] for u in data["content"]], ["UTN%FRM"])
+
+    def test_in_y_range(self):
+        data = self._listar({"sigla": {"in": ["U1", "U3", "U4"]}, "id": {"range": [2, 3]}}).get_json()
+        self.assertEqual([u["sigla"] for u in data["content"]], ["U3"])
+
+    def test_filtro_invalido_devuelve_400(self):
+        response = self._listar({"inexistente": 1})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("inexistente", response.get_json()["error"])
+
+    def test_modo_estricto(self):
+        self.app.config["FILTERS_STRICT"] = True
+        self.assertEqual(self._listar({"nombre": {"ilike": "nac"}}).status_code, 400)
+        self.assertEqual(self._listar({"nombre": {"prefix": "Nac"}}).status_code, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import json
+import unittest
+import os
+from sqlalchemy import event
+from app import create_app, db
+from app.models import Universidad, Facultad, Especialidad
+from app.repositories import BusquedaRepository
+
+CSV_ESPECIALIDADES = (
+    "nombre,letra,observacion,facultad_id\n"
+    "Sistemas,S,Primera,1\n"
+    ",C,Sin nombre,1\n"
+    "Civil,C,Facultad inexistente,99\n"
+    "Quimica,Q,\"Con, coma\",1\n"
+    "Mecanica,M\n"
+    "Electrica,E,Ultima,1\n"
+)
+
+
+class ImportacionTestCase(unittest.TestCase):
+
+    def setUp(self):
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app.config['IMPORT_BATCH_SIZE'] = 2
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        uni = Universidad(nombre="UTN", sigla="UTN", tipo="publica")
+        db.session.add(uni)
+        db.session.commit()
+        db.session.add(Facultad(nombre="Regional Mendoza", sigla="FRM", abreviatura="F", directorio="Dir",
+                                codigoPostal="5500", ciudad="Mendoza", domicilio="Calle 1", telefono="1",
+                                contacto="c", email="f@utn.edu.ar", universidad_id=uni.id))
+        db.session.commit()
+        db.session.remove()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_csv_con_reporte_por_fila(self):
+        r = self.client.post('/api/v1/especialidad/import', data=CSV_ESPECIALIDADES, content_type="text/csv")
+        self.assertEqual(r.status_code, 201)
+        resumen = r.get_json()
+        self.assertEqual(resumen["procesadas"], 6)
+        self.assertEqual(resumen["creadas"], 3)
+        self.assertEqual(resumen["lotes"], 3)
+        errores = {e["fila"]: e["errores"] for e in resumen["errores"]}
+        self.assertEqual(sorted(errores), [2, 3, 5])
+        self.assertIn("nombre", errores[2])
+        self.assertIn("facultad_id", errores[3])
+        self.assertIn("_base", errores[5])
+
+        nombres = [e.nombre for e in db.session.query(Especialidad).order_by(Especialidad.id)]
+        self.assertEqual(nombres, ["Sistemas", "Quimica", "Electrica"])
+        self.assertEqual(db.session.get(Especialidad, 2).observacion, "Con, coma")
+        self.assertEqual([r["nombre"] for r in BusquedaRepository.buscar("quimica")], ["Quimica"])
+
+    def test_ndjson(self):
+        lineas = [json.dumps({"nombre": "UNCuyo", "sigla": "UNCUYO", "tipo": "publica"}),
+                  "",
+                  "no es json",
+                  json.dumps({"nombre": "UM", "sigla": "UM", "tipo": "privada", "id": 7})]
+        r = self.client.post('/api/v1/universidad/import', data="\n".join(lineas),
+                             content_type="application/x-ndjson")
+        resumen = r.get_json()
+        self.assertEqual(resumen["creadas"], 1)
+        self.assertEqual([e["fila"] for e in resumen["errores"]], [3, 4])
+        self.assertIn("id", resumen["errores"][1]["errores"])
+
+    def test_restriccion_unica_rechaza_solo_la_fila(self):
+        lineas = [json.dumps({"nombre": "UNCuyo", "sigla": "UNCUYO", "tipo": "publica"}),
+                  json.dumps({"nombre": "UTN", "sigla": "UTN", "tipo": "publica"})]
+        resumen = self.client.post('/api/v1/universidad/import?format=ndjson', data="\n".join(lineas)).get_json()
+        self.assertEqual(resumen["creadas"], 1)
+        self.assertEqual(resumen["errores"][0]["fila"], 2)
+        self.assertEqual(db.session.query(Universidad).count(), 2)
+
+    def test_commit_por_lote_e_invalida_cache(self):
+        # listado cacheado antes de la importación
+        self.assertEqual(self.client.get('/api/v1/facultad').get_json()["pageable"]["total_elements"], 1)
+        filas = [{"nombre": f"Facultad {i}", "sigla": f"F{i}", "abreviatura": "F", "directorio": "D",
+                  "codigoPostal": "5500", "ciudad": "Mendoza", "domicilio": "x", "telefono": "1",
+                  "contacto": "c", "email": "f@utn.edu.ar", "universidad_id": 1} for i in range(4)]
+        commits = []
+
+        def registrar(conn):
+            commits.append(conn)
+        event.listen(db.engine, "commit", registrar)
+        try:
+            r = self.client.post('/api/v1/facultad/import',
+                                 data="\n".join(json.dumps(f) for f in filas), content_type="application/x-ndjson")
+        finally:
+            event.remove(db.engine, "commit", registrar)
+        self.assertEqual(r.get_json()["creadas"], 4)
+        # un commit por lote de 2, no uno por fila
+        self.assertEqual(len(commits), 2)
+        self.assertEqual(self.client.get('/api/v1/facultad').get_json()["pageable"]["total_elements"], 5)
+
+    def test_formato_invalido(self):
+        self.assertEqual(self.client.post('/api/v1/facultad/import?format=xml', data="").status_code, 400)
+        r = self.client.post('/api/v1/facultad/import', data="", content_type="text/csv")
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.get_json()["procesadas"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import unittest
+import os
+import json
+from sqlalchemy import event
+from app import create_app, db
+from app.models import Universidad
+from app.services import UniversidadService
+
+
+class ListQueriesTestCase(unittest.TestCase):
+
+    def setUp(self):
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app.config["CACHE_TYPE"] = "NullCache"
+        self.app.config["CACHE_NO_NULL_WARNING"] = True
+        from app import cache
+        cache.init_app(self.app)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        for i in range(5):
+            tipo = "privada" if i % 2 else "publica"
+            db.session.add(Universidad(nombre=f"Universidad {i + 1}", sigla=f"U{i + 1}", tipo=tipo))
+        db.session.commit()
+
+        self.consultas = []
+        event.listen(db.engine, "before_cursor_execute", self._contar)
+
+    def tearDown(self):
+        event.remove(db.engine, "before_cursor_execute", self._contar)
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _contar(self, conn, cursor, statement, parameters, context, executemany):
+        self.consultas.append(statement)
+
+    def test_pagina_y_total_en_una_consulta(self):
+        data = self.client.get('/api/v1/universidad', headers={"X-page": "2", "X-per-page": "2"}).get_json()
+
+        self.assertEqual(len(self.consultas), 1)
+        self.assertEqual([u["sigla"] for u in data["content"]], ["U3", "U4"])
+        self.assertEqual(data["pageable"]["total_elements"], 5)
+        self.assertEqual(data["pageable"]["total_pages"], 3)
+
+    def test_total_con_filtros(self):
+        headers = {"X-filters": json.dumps({"tipo": "privada"}), "X-per-page": "1"}
+        data = self.client.get('/api/v1/universidad', headers=headers).get_json()
+
+        self.assertEqual(len(self.consultas), 1)
+        self.assertEqual(data["pageable"]["total_elements"], 2)
+
+    def test_total_en_modo_cursor_no_depende_del_cursor(self):
+        primera = self.client.get('/api/v1/universidad', headers={"X-cursor": "*", "X-per-page": "2"}).get_json()
+        segunda = self.client.get('/api/v1/universidad', headers={
+            "X-cursor": primera["pageable"]["next_cursor"], "X-per-page": "2"}).get_json()
+
+        self.assertEqual(segunda["pageable"]["total_elements"], 5)
+
+    def test_sin_conteo(self):
+        data = self.client.get('/api/v1/universidad', headers={"X-count": "none"}).get_json()
+
+        self.assertEqual(len(self.consultas), 1)
+        self.assertNotIn("count(", self.consultas[0].lower())
+        self.assertIsNone(data["pageable"]["total_elements"])
+        self.assertIsNone(data["pageable"]["total_pages"])
+
+    def test_conteo_estimado_en_sqlite_es_exacto(self):
+        data = self.client.get('/api/v1/universidad', headers={"X-count": "estimated"}).get_json()
+        self.assertEqual(data["pageable"]["total_elements"], 5)
+        self.assertTrue(data["pageable"]["total_elements_exact"])
+
+    def test_conteo_exacto_cacheado(self):
+        self.client.get('/api/v1/universidad')
+        self.consultas.clear()
+
+        data = self.client.get('/api/v1/universidad').get_json()
+
+        self.assertEqual(len(self.consultas), 1)
+        self.assertNotIn("count(", self.consultas[0].lower())
+        self.assertEqual(data["pageable"]["total_elements"], 5)
+        self.assertTrue(data["pageable"]["total_elements_exact"])
+
+    def test_escritura_invalida_el_conteo_cacheado(self):
+        self.client.get('/api/v1/universidad')
+
+        UniversidadService.crear_universidad(Universidad(nombre="Nueva", sigla="N", tipo="publica"))
+
+        data = self.client.get('/api/v1/universidad').get_json()
+        self.assertEqual(data["pageable"]["total_elements"], 6)
+
+    def test_conteo_cacheado_por_filtros(self):
+        self.client.get('/api/v1/universidad')
+
+        headers = {"X-filters": json.dumps({"tipo": "privada"})}
+        data = self.client.get('/api/v1/universidad', headers=headers).get_json()
+
+        self.assertEqual(data["pageable"]["total_elements"], 2)
+
+    def test_sin_conteo_no_es_exacto(self):
+        data = self.client.get('/api/v1/universidad', headers={"X-count": "none"}).get_json()
+        self.assertFalse(data["pageable"]["total_elements_exact"])
+
+    def test_estimacion_no_aplica_fuera_de_postgres(self):
+        from app.repositories.pagination import estimar_total
+        self.assertIsNone(estimar_total(Universidad))
+
+    def test_conteo_invalido(self):
+        response = self.client.get('/api/v1/universidad', headers={"X-count": "aprox"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_pagina_fuera_de_rango_conserva_el_total(self):
+        result = UniversidadService.listar_universidades(page=10, per_page=2)
+
+        self.assertEqual(result["content"], [])
+        self.assertEqual(result["total_elements"], 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
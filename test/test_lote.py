@@ -0,0 +1,147 @@
+import unittest
+import os
+from sqlalchemy import event
+from app import create_app, db, entity_cache
+from app.caching import RedisBackend
+from app.models import Universidad, Facultad, Especialidad
+from app.repositories import BusquedaRepository
+
+
+def facultad(i, universidad_id=1):
+    return {"nombre": f"Facultad {i}", "sigla": f"F{i}", "abreviatura": "F", "directorio": "Dir",
+            "codigoPostal": "5500", "ciudad": "Mendoza", "domicilio": "Calle 1", "telefono": "1",
+            "contacto": "c", "email": "f@utn.edu.ar", "universidad_id": universidad_id}
+
+
+class PipelineFalso:
+    """Registra los comandos encolados; execute() es el único round-trip."""
+
+    def __init__(self, cliente):
+        self.cliente = cliente
+        self.comandos = []
+
+    def incr(self, key):
+        self.comandos.append(("INCR", key))
+
+    def delete(self, *keys):
+        self.comandos.append(("DEL", *keys))
+
+    def execute(self):
+        self.cliente.round_trips.append(self.comandos)
+
+
+class RedisFalso:
+    def __init__(self):
+        self.round_trips = []
+
+    def pipeline(self, transaction=True):
+        return PipelineFalso(self)
+
+
+class LoteTestCase(unittest.TestCase):
+
+    def setUp(self):
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        db.session.add(Universidad(nombre="UTN", sigla="UTN", tipo="publica"))
+        db.session.commit()
+        db.session.remove()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_crear_en_lote(self):
+        r = self.client.post('/api/v1/facultad/_bulk', json=[facultad(i) for i in range(3)])
+        self.assertEqual(r.status_code, 201)
+        self.assertEqual(r.get_json()["ids"], [1, 2, 3])
+        self.assertEqual(db.session.query(Facultad).count(), 3)
+        self.assertEqual([f["id"] for f in BusquedaRepository.buscar("facultad")], [1, 2, 3])
+
+    def test_validacion_rechaza_el_lote_completo(self):
+        items = [facultad(0), {**facultad(1), "sigla": ""}]
+        r = self.client.post('/api/v1/facultad/_bulk', json=items)
+        self.assertEqual(r.status_code, 400)
+        self.assertIn("1", r.get_json())
+        self.assertEqual(db.session.query(Facultad).count(), 0)
+
+    def test_conflicto_no_escribe_nada(self):
+        r = self.client.post('/api/v1/universidad/_bulk', json=[
+            {"nombre": "UNCuyo", "sigla": "UNCUYO", "tipo": "publica"},
+            {"nombre": "UTN", "sigla": "UTN", "tipo": "publica"}])
+        self.assertEqual(r.status_code, 409)
+        self.assertEqual(db.session.query(Universidad).count(), 1)
+
+    def test_actualizar_en_lote(self):
+        self.client.post('/api/v1/facultad/_bulk', json=[facultad(i) for i in range(3)])
+        self.client.get('/api/v1/facultad/2')  # queda en cache
+        cambios = [{**facultad(i), "id": i + 1, "ciudad": "San Rafael"} for i in range(1, 3)]
+
+        actualizaciones = []
+
+        def registrar(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("UPDATE facultades"):
+                actualizaciones.append(executemany)
+        event.listen(db.engine, "before_cursor_execute", registrar)
+        try:
+            r = self.client.put('/api/v1/facultad/_bulk', json=cambios)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", registrar)
+
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(actualizaciones, [True])
+        self.assertEqual(self.client.get('/api/v1/facultad/2').get_json()["ciudad"], "San Rafael")
+        self.assertEqual(self.client.get('/api/v1/facultad/1').get_json()["ciudad"], "Mendoza")
+
+    def test_actualizar_con_ids_inexistentes_no_escribe_nada(self):
+        self.client.post('/api/v1/facultad/_bulk', json=[facultad(0)])
+        r = self.client.put('/api/v1/facultad/_bulk', json=[
+            {**facultad(0), "id": 1, "ciudad": "Otra"}, {**facultad(1), "id": 9}])
+        self.assertEqual(r.status_code, 404)
+        self.assertEqual(r.get_json()["ids"], [9])
+        self.assertEqual(db.session.get(Facultad, 1).ciudad, "Mendoza")
+
+        self.assertEqual(self.client.put('/api/v1/facultad/_bulk', json=[facultad(0)]).status_code, 400)
+
+    def test_eliminar_en_lote_desvincula_hijos(self):
+        self.client.post('/api/v1/facultad/_bulk', json=[facultad(i) for i in range(3)])
+        self.client.post('/api/v1/especialidad/_bulk', json=[
+            {"nombre": "Sistemas", "letra": "S", "observacion": "-", "facultad_id": 1}])
+        self.client.get('/api/v1/facultad/1')
+
+        r = self.client.delete('/api/v1/facultad/_bulk', json=[1, 3, 99])
+        self.assertEqual(r.get_json()["ids"], [1, 3])
+        self.assertEqual(self.client.get('/api/v1/facultad/1').status_code, 404)
+        self.assertEqual(db.session.query(Facultad).count(), 1)
+        self.assertIsNone(db.session.get(Especialidad, 1).facultad_id)
+        self.assertEqual([f["id"] for f in BusquedaRepository.buscar("facultad")], [2])
+
+    def test_cuerpo_invalido(self):
+        self.assertEqual(self.client.post('/api/v1/facultad/_bulk', json={"a": 1}).status_code, 400)
+        self.assertEqual(self.client.delete('/api/v1/facultad/_bulk', json=["x"]).status_code, 400)
+        self.app.config['BULK_MAX_ITEMS'] = 1
+        self.assertEqual(self.client.post('/api/v1/facultad/_bulk', json=[facultad(0), facultad(1)]).status_code, 400)
+
+    def test_invalidacion_en_un_solo_pipeline(self):
+        redis = RedisFalso()
+        entity_cache.backend = RedisBackend(redis)
+        mensajes = []
+        entity_cache.bus.suscribir(mensajes.append)
+
+        entity_cache.invalidar_lote(Facultad, [1, 2], documentos=["gestion:doc:arbol:1"])
+
+        self.assertEqual(len(redis.round_trips), 1)
+        comandos = redis.round_trips[0]
+        self.assertEqual([c[0] for c in comandos], ["INCR"] * 4 + ["DEL"])
+        self.assertIn("gestion:doc:arbol:1:gen", [c[1] for c in comandos])
+        self.assertEqual(len(mensajes), 1)
+        self.assertEqual(mensajes[0]["ids"], [1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from sqlalchemy import create_engine, exc, text
+from app import create_app, db
+from app.config.config import opciones_pool
+from app.metrics import Registro, QueuePoolMedido, instrumentar_pool
+
+
+class RegistroTestCase(unittest.TestCase):
+
+    def test_formato_prometheus(self):
+        registro = Registro()
+        registro.contador("pedidos_total", "Pedidos").inc(bind="primario")
+        registro.gauge("en_uso", "En uso").callback(lambda: 3, bind="primario")
+        histograma = registro.histograma("espera_seconds", "Espera", buckets=(0.1, 1))
+        histograma.observar(0.05, bind="primario")
+        histograma.observar(5, bind="primario")
+
+        salida = registro.exportar()
+        self.assertIn('# TYPE pedidos_total counter\npedidos_total{bind="primario"} 1.0\n', salida)
+        self.assertIn('en_uso{bind="primario"} 3.0\n', salida)
+        self.assertIn('espera_seconds_bucket{bind="primario",le="0.1"} 1.0\n', salida)
+        self.assertIn('espera_seconds_bucket{bind="primario",le="1.0"} 1.0\n', salida)
+        self.assertIn('espera_seconds_bucket{bind="primario",le="+Inf"} 2.0\n', salida)
+        self.assertIn('espera_seconds_count{bind="primario"} 2.0\n', salida)
+        self.assertNotIn("pid=", salida)
+
+    def test_multiproceso_suma_los_workers(self):
+        directorio = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directorio, ignore_errors=True)
+        # Dos "workers": procesos con PROMETHEUS_MULTIPROC_DIR definido antes de importar prometheus_client
+        worker = (
+            "from app.metrics import Registro\n"
+            "registro = Registro()\n"
+            "registro.contador('pedidos_total', 'Pedidos').inc(bind='primario')\n"
+            "registro.gauge('en_uso', 'En uso').callback(lambda: 2, bind='primario')\n"
+            "registro.gauge('abierto', 'Abierto', agregacion='livemax').callback(lambda: 1)\n"
+            "registro.histograma('espera_seconds', 'Espera').observar(0.2, bind='primario')\n"
+            "registro.refrescar()\n"
+        )
+        raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        for _ in range(2):
+            subprocess.run([sys.executable, "-c", worker], check=True, cwd=raiz,
+                           env={**os.environ, "PROMETHEUS_MULTIPROC_DIR": directorio})
+
+        salida = Registro(directorio=directorio).exportar()
+
+        self.assertIn('pedidos_total{bind="primario"} 2.0\n', salida)
+        self.assertIn('en_uso{bind="primario"} 4.0\n', salida)
+        self.assertIn('abierto 1.0\n', salida)
+        self.assertIn('espera_seconds_count{bind="primario"} 2.0\n', salida)
+
+    def test_misma_metrica_con_otro_tipo(self):
+        registro = Registro()
+        registro.contador("x", "x")
+        with self.assertRaises(ValueError):
+            registro.gauge("x", "x")
+
+
+class PoolTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.registro = Registro()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.directorio, 'pool.db')}",
+                                    poolclass=QueuePoolMedido, pool_size=1, max_overflow=0, pool_timeout=0.05)
+        instrumentar_pool(self.engine, "primario", self.registro)
+
+    def tearDown(self):
+        self.engine.dispose()
+        shutil.rmtree(self.directorio, ignore_errors=True)
+
+    def _valor(self, nombre):
+        return self.registro.gauge(nombre, "").valor(bind="primario")
+
+    def test_estado_espera_y_timeouts(self):
+        conn = self.engine.connect()
+        conn.execute(text("SELECT 1"))
+        self.assertEqual(self._valor("db_pool_checked_out"), 1)
+        self.assertEqual(self._valor("db_pool_max_connections"), 1)
+
+        with self.assertRaises(exc.TimeoutError):
+            self.engine.connect()
+        conn.close()
+        self.assertEqual(self._valor("db_pool_checked_out"), 0)
+
+        espera = self.registro.histograma("db_pool_wait_seconds", "")
+        self.assertEqual(espera.total(bind="primario"), 2)
+        self.assertEqual(self.registro.contador("db_pool_timeouts_total", "").valor(bind="primario"), 1)
+        self.assertEqual(self.registro.contador("db_pool_checkouts_total", "").valor(bind="primario"), 1)
+        self.assertEqual(self.registro.contador("db_pool_connections_opened_total", "").valor(bind="primario"), 1)
+
+    def test_sobrevive_a_dispose(self):
+        self.engine.dispose()
+        with self.engine.connect():
+            pass
+        self.assertEqual(self.registro.histograma("db_pool_wait_seconds", "").total(bind="primario"), 1)
+
+
+class ConfiguracionPoolTestCase(unittest.TestCase):
+
+    def test_opciones_por_entorno_y_variables(self):
+        opciones = opciones_pool(pool_size=10, max_overflow=5, pool_timeout=10)
+        self.assertEqual((opciones["pool_size"], opciones["max_overflow"], opciones["pool_timeout"]), (10, 5, 10))
+        self.assertTrue(opciones["pool_pre_ping"])
+        os.environ["DB_POOL_SIZE"] = "3"
+        try:
+            self.assertEqual(opciones_pool(pool_size=10, max_overflow=5)["pool_size"], 3)
+        finally:
+            del os.environ["DB_POOL_SIZE"]
+
+    def test_endpoint_de_metricas(self):
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        app = create_app()
+        with app.app_context():
+            db.create_all()
+            r = app.test_client().get('/api/v1/metrics')
+            self.assertEqual(r.status_code, 200)
+            self.assertTrue(r.content_type.startswith("text/plain"))
+            self.assertIn('db_pool_checkouts_total{bind="primario"}', r.get_data(as_text=True))
+            db.drop_all()
+
+
+if __name__ == '__main__':
+    unittest.main()
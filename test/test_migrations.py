@@ -0,0 +1,61 @@
+import unittest
+import os
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from flask_migrate import upgrade, downgrade
+from sqlalchemy import inspect
+from app import create_app, db
+from app.models import es_de_otro_motor
+
+MIGRATIONS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'migrations')
+
+
+class MigrationsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        upgrade(directory=MIGRATIONS)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        with db.engine.begin() as conn:
+            conn.exec_driver_sql("DROP TABLE IF EXISTS alembic_version")
+        self.app_context.pop()
+
+    def _indices(self, tabla):
+        return {indice["name"] for indice in inspect(db.engine).get_indexes(tabla)}
+
+    def test_crea_indices_de_claves_foraneas_y_filtros(self):
+        self.assertLessEqual({"ix_facultades_universidad_id", "ix_facultades_nombre", "ix_facultades_sigla"},
+                             self._indices("facultades"))
+        self.assertLessEqual({"ix_especialidades_facultad_id", "ix_especialidades_nombre", "ix_especialidades_letra"},
+                             self._indices("especialidades"))
+        self.assertIn("ix_universidades_tipo", self._indices("universidades"))
+
+    def test_migraciones_coinciden_con_los_modelos(self):
+        with db.engine.connect() as conn:
+            # los índices con info={'motor': 'postgresql'} son sólo de PostgreSQL; el de texto tiene DDL propio
+            contexto = MigrationContext.configure(conn, opts={
+                "include_object": lambda obj, nombre, tipo, *_: not (tipo == "index" and es_de_otro_motor(obj, "sqlite"))
+                and not (tipo == "table" and nombre.startswith("busqueda"))})
+            self.assertEqual(compare_metadata(contexto, db.metadata), [])
+
+    def test_indices_propios_de_postgresql(self):
+        indices = {indice.name: indice for tabla in db.metadata.tables.values() for indice in tabla.indexes}
+        for nombre in ("ix_especialidades_nombre_trgm", "ix_universidades_nombre_prefijo", "ix_universidades_sigla_prefijo"):
+            self.assertTrue(es_de_otro_motor(indices[nombre], "sqlite"), nombre)
+            self.assertFalse(es_de_otro_motor(indices[nombre], "postgresql"), nombre)
+        self.assertFalse(es_de_otro_motor(indices["ix_facultades_nombre"], "sqlite"))
+        self.assertNotIn("ix_universidades_nombre_prefijo", self._indices("universidades"))
+
+    def test_downgrade_quita_los_indices(self):
+        downgrade(directory=MIGRATIONS, revision='0001')
+        self.assertEqual(self._indices("especialidades"), set())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import unittest
+import os
+from sqlalchemy import event
+from app import create_app, db, entity_cache
+from app.caching import MemoryBackend, RedisBackend, TieredBackend, LocalLRU, LocalInvalidationBus
+from app.models import Universidad, Facultad
+from app.services import FacultadService
+
+
+class RedisFalso:
+    """Cliente mínimo: guarda en memoria y cuenta los round-trips."""
+
+    def __init__(self):
+        self.datos = {}
+        self.comandos = []
+
+    def mget(self, keys):
+        self.comandos.append("MGET")
+        return [self.datos.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        cliente = self
+
+        class Pipeline:
+            def __init__(self):
+                self.sets = []
+
+            def set(self, key, value, ex=None):
+                self.sets.append((key, value))
+
+            def execute(self):
+                cliente.comandos.append(f"PIPELINE SET x{len(self.sets)}")
+                cliente.datos.update(self.sets)
+        return Pipeline()
+
+
+class MultiGetTestCase(unittest.TestCase):
+
+    def setUp(self):
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        db.session.add(Universidad(nombre="UTN", sigla="UTN", tipo="publica"))
+        db.session.commit()
+        for i in range(5):
+            db.session.add(Facultad(
+                nombre=f"Facultad {i}", sigla=f"F{i}", abreviatura="F", directorio="Dir",
+                codigoPostal="5500", ciudad="Mendoza", domicilio="Calle 1", telefono="1",
+                contacto="c", email="f@utn.edu.ar", universidad_id=1))
+        db.session.commit()
+        db.session.remove()
+
+        self.consultas = []
+        event.listen(db.engine, "before_cursor_execute", self._registrar)
+
+    def tearDown(self):
+        event.remove(db.engine, "before_cursor_execute", self._registrar)
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _registrar(self, conn, cursor, statement, parameters, context, executemany):
+        self.consultas.append(statement)
+
+    def test_orden_pedido_e_inexistentes(self):
+        data = self.client.get('/api/v1/facultad?ids=4,99,2,4').get_json()
+        self.assertEqual([f["id"] for f in data["content"]], [4, 2])
+        self.assertEqual(data["not_found"], [99])
+        self.assertNotIn("pageable", data)
+
+    def test_una_consulta_para_los_misses(self):
+        entity_cache.buscar(Facultad, 1, lambda: db.session.get(Facultad, 1))
+        self.consultas.clear()
+
+        facultades = FacultadService.buscar_facultades([3, 1, 5])
+        self.assertEqual([f.id for f in facultades], [3, 1, 5])
+        self.assertEqual(len(self.consultas), 1)
+        self.assertIn("IN", self.consultas[0])
+
+        # todas en cache: ninguna consulta
+        self.consultas.clear()
+        db.session.remove()
+        self.assertEqual([f.nombre for f in FacultadService.buscar_facultades([5, 3])], ["Facultad 4", "Facultad 2"])
+        self.assertEqual(self.consultas, [])
+
+    def test_actualizacion_invalida(self):
+        self.client.get('/api/v1/facultad?ids=1,2')
+        self.client.put('/api/v1/facultad/2', json={
+            "nombre": "Renombrada", "sigla": "F1", "abreviatura": "F", "directorio": "Dir",
+            "codigoPostal": "5500", "ciudad": "Mendoza", "domicilio": "Calle 1", "telefono": "1",
+            "contacto": "c", "email": "f@utn.edu.ar", "universidad_id": 1})
+        data = self.client.get('/api/v1/facultad?ids=1,2').get_json()
+        self.assertEqual(data["content"][1]["nombre"], "Renombrada")
+
+    def test_fields_y_expand(self):
+        data = self.client.get('/api/v1/facultad?ids=2&fields=nombre&expand=universidad').get_json()
+        self.assertEqual(data["content"], [{"id": 2, "nombre": "Facultad 1",
+                                            "universidad": {"id": 1, "nombre": "UTN", "sigla": "UTN", "tipo": "publica"}}])
+
+    def test_ids_invalidos(self):
+        self.assertEqual(self.client.get('/api/v1/universidad?ids=1,a').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/especialidad?ids=').status_code, 400)
+        self.app.config['MULTIGET_MAX_IDS'] = 2
+        self.assertEqual(self.client.get('/api/v1/facultad?ids=1,2,3').status_code, 400)
+
+    def test_redis_un_mget_y_un_pipeline(self):
+        redis = RedisFalso()
+        entity_cache.backend = RedisBackend(redis)
+        FacultadService.buscar_facultades([1, 2, 3])
+        FacultadService.buscar_facultades([1, 2, 3, 4])
+        self.assertEqual(redis.comandos, ["MGET", "PIPELINE SET x3", "MGET", "PIPELINE SET x1"])
+
+
+class TieredGetManyTestCase(unittest.TestCase):
+
+    def test_get_many_completa_desde_el_remoto(self):
+        remote = MemoryBackend()
+        backend = TieredBackend(LocalLRU(10), remote, LocalInvalidationBus())
+        backend.set("a", b"1")
+        remote.set("b", b"2")
+        self.assertEqual(backend.get_many(["a", "b", "c"]), [b"1", b"2", None])
+        self.assertEqual(backend.local.get("b"), b"2")
+
+        backend.set_many({"c": b"3"}, ttl=10)
+        self.assertEqual(remote.get("c"), b"3")
+        self.assertEqual(backend.local.get("c"), b"3")
+
+
+if __name__ == '__main__':
+    unittest.main()
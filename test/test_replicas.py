@@ -0,0 +1,125 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from app import create_app, db, entity_cache, replicas
+from app.config.config import TestConfig
+from app.models import Universidad
+from app.replicas import RYW_COOKIE
+
+
+class ReplicasTestCase(unittest.TestCase):
+    """Primario en memoria y una "réplica" en un archivo SQLite con otros datos, para ver a dónde va cada lectura."""
+
+    def setUp(self):
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.directorio = tempfile.mkdtemp()
+        uri = f"sqlite:///{os.path.join(self.directorio, 'replica.db')}"
+        with patch.object(TestConfig, "READ_REPLICA_URIS", [uri]):
+            self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.replica = db.engines["replica_0"]
+        db.metadata.create_all(self.replica)
+
+        db.session.add(Universidad(nombre="Primario", sigla="P", tipo="publica"))
+        db.session.commit()
+        with self.replica.begin() as conn:
+            conn.execute(Universidad.__table__.insert(), {"nombre": "Replica", "sigla": "R", "tipo": "publica"})
+        db.session.remove()
+        replicas._escrituras.clear()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        db.metadata.drop_all(self.replica)
+        self.app_context.pop()
+        shutil.rmtree(self.directorio, ignore_errors=True)
+
+    def _nombre(self, **kwargs):
+        return self.client.get('/api/v1/universidad/1', **kwargs).get_json()["nombre"]
+
+    def test_get_lee_de_la_replica(self):
+        self.assertEqual(replicas.claves, ["replica_0"])
+        self.assertEqual(self._nombre(), "Replica")
+
+    def test_consistencia_fuerte_lee_del_primario(self):
+        self.assertEqual(self._nombre(headers={"X-Consistency": "strong"}), "Primario")
+
+    def test_escritura_y_read_your_writes(self):
+        r = self.client.post('/api/v1/universidad', json={"nombre": "Nueva", "sigla": "N", "tipo": "privada"})
+        self.assertEqual(r.status_code, 201)
+        self.assertIn(RYW_COOKIE, r.headers.get("Set-Cookie", ""))
+        db.session.remove()
+        self.assertEqual(db.session.query(Universidad).count(), 2)
+
+        # recién escrito: el listado sale del primario (2 filas, la réplica tiene 1)
+        listado = self.client.get('/api/v1/universidad').get_json()
+        self.assertEqual(listado["pageable"]["total_elements"], 2)
+
+        # la ventana es del cliente que escribió: sin la cookie se lee de la réplica
+        self.client.delete_cookie(RYW_COOKIE)
+        listado = self.client.get('/api/v1/universidad?fields=nombre').get_json()
+        self.assertEqual([u["nombre"] for u in listado["content"]], ["Replica"])
+
+    def test_otros_clientes_siguen_en_la_replica_sin_llenar_el_cache(self):
+        otro = self.app.test_client()
+        self.client.post('/api/v1/universidad', json={"nombre": "Nueva", "sigla": "N", "tipo": "privada"})
+        db.session.remove()
+
+        self.assertEqual(otro.get('/api/v1/universidad/1').get_json()["nombre"], "Replica")
+        # universidades se escribió recién: lo leído de la réplica no se cachea
+        self.assertIsNone(entity_cache.backend.get(entity_cache.clave(Universidad, 1)))
+        db.session.remove()
+        self.assertEqual(otro.get('/api/v1/universidad/1', headers={"X-Consistency": "strong"}).get_json()["nombre"],
+                         "Primario")
+
+        # pasada la ventana de atraso tolerado vuelve a cachear
+        replicas._escrituras.clear()
+        db.session.remove()
+        otro.get('/api/v1/universidad/1')
+        self.assertIsNotNone(entity_cache.backend.get(entity_cache.clave(Universidad, 1)))
+
+    def test_replica_atrasada_o_caida_usa_el_primario(self):
+        with patch.object(replicas, "medir_lag", return_value=30.0):
+            replicas._lags.clear()
+            self.assertEqual(self._nombre(), "Primario")
+        db.session.remove()
+        # el detalle quedó en el cache de vistas: se consulta el listado
+        with patch.object(replicas, "medir_lag", return_value=None):
+            replicas._lags.clear()
+            listado = self.client.get('/api/v1/universidad?fields=sigla').get_json()
+            self.assertEqual([u["sigla"] for u in listado["content"]], ["P"])
+
+    def test_lag_vencido_se_mide_en_segundo_plano(self):
+        replicas._lags["replica_0"] = (0.0, time.monotonic() - 60)
+        medido = threading.Event()
+
+        def medir_lento(clave):
+            time.sleep(0.2)
+            medido.set()
+            return 5.0
+
+        with patch.object(replicas, "medir_lag", side_effect=medir_lento):
+            inicio = time.monotonic()
+            self.assertEqual(replicas.elegir(), "replica_0")
+            self.assertLess(time.monotonic() - inicio, 0.1)
+            self.assertTrue(medido.wait(2))
+            time.sleep(0.05)
+            self.assertIsNone(replicas.elegir())
+
+    def test_lag_se_mide_cada_intervalo(self):
+        with patch.object(replicas, "medir_lag", return_value=0.0) as medir:
+            replicas._lags.clear()
+            for _ in range(3):
+                replicas.elegir()
+            self.assertEqual(medir.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
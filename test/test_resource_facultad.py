@@ -121,6 +121,13 @@ class FacultadResourceTestCase(unittest.TestCase):
         refreshed = Facultad.query.get(self.fac1.id)
         self.assertEqual(refreshed.nombre, "Facultad de Ingeniería Actualizada")
 
+    def test_actualizar_facultad_inexistente(self):
+        payload = {"nombre": "FRM", "sigla": "FRM", "abreviatura": "FRM", "directorio": "Dir",
+                   "codigoPostal": "5500", "ciudad": "Mendoza", "domicilio": "Calle 1", "telefono": "1",
+                   "contacto": "c", "email": "frm@utn.edu.ar", "universidad_id": self.universidad.id}
+        response = self.client.put('/api/v1/facultad/999', json=payload)
+        self.assertEqual(response.status_code, 404)
+
     def test_borrar_facultad(self):
         response = self.client.delete(f'/api/v1/facultad/{self.fac2.id}')
         self.assertEqual(response.status_code, 200)
@@ -75,6 +75,11 @@ class UniversidadResourceTestCase(unittest.TestCase):
         refreshed = Universidad.query.get(self.uni1.id)
         self.assertEqual(refreshed.nombre, "UTN Actualizada")
 
+    def test_actualizar_universidad_inexistente(self):
+        payload = {"nombre": "UBA", "sigla": "UBA", "tipo": "Publica"}
+        response = self.client.put('/api/v1/universidad/999', json=payload)
+        self.assertEqual(response.status_code, 404)
+
     def test_borrar_universidad(self):
         response = self.client.delete(f'/api/v1/universidad/{self.uni2.id}')
         self.assertEqual(response.status_code, 200)
@@ -0,0 +1,93 @@
+import unittest
+import os
+import time
+from unittest.mock import patch
+from flask import g
+from redis.exceptions import TimeoutError as RedisTimeoutError
+from sqlalchemy.exc import IntegrityError, OperationalError
+from app import create_app, metricas
+from app.utils import retry as reintentos
+from app.utils.retry import ErrorHTTP, ErrorTransitorio, es_transitorio, retry
+
+
+class RetryTestCase(unittest.TestCase):
+
+    def setUp(self):
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        self.llamadas = 0
+        # Sin esperas reales: el jitter elige siempre 0.
+        self.jitter = patch("app.utils.retry.random.uniform", side_effect=lambda a, b: a)
+        self.uniform = self.jitter.start()
+
+    def tearDown(self):
+        self.jitter.stop()
+        reintentos.presupuesto.configurar(self.app.config["RETRY_BUDGET_CAPACITY"],
+                                          self.app.config["RETRY_BUDGET_PER_SECOND"])
+        self.app_context.pop()
+
+    def _falla(self, error, veces=None):
+        @retry(max_attempts=3, delay=1.0)
+        def operacion():
+            self.llamadas += 1
+            if veces is None or self.llamadas <= veces:
+                raise error
+            return "ok"
+        return operacion
+
+    def test_clasificacion_de_errores(self):
+        self.assertTrue(es_transitorio(ErrorHTTP(503)))
+        self.assertTrue(es_transitorio(ErrorHTTP(429)))
+        self.assertFalse(es_transitorio(ErrorHTTP(404)))
+        self.assertTrue(es_transitorio(OperationalError("SELECT 1", {}, Exception("server closed the connection"))))
+        self.assertFalse(es_transitorio(IntegrityError("INSERT", {}, Exception("UNIQUE constraint failed"))))
+        self.assertTrue(es_transitorio(RedisTimeoutError("Timeout reading from socket")))
+        self.assertTrue(es_transitorio(ErrorTransitorio()))
+        self.assertFalse(es_transitorio(ValueError("no encontrado")))
+
+    def test_no_reintenta_errores_no_transitorios(self):
+        with self.assertRaises(ValueError):
+            self._falla(ValueError("inválido"))()
+        self.assertEqual(self.llamadas, 1)
+
+    def test_reintenta_transitorios_con_full_jitter(self):
+        self.assertEqual(self._falla(ErrorHTTP(502), veces=2)(), "ok")
+        self.assertEqual(self.llamadas, 3)
+        # Espera al azar entre 0 y delay * 2^(intento - 1), acotada por max_delay.
+        self.assertEqual([llamada.args for llamada in self.uniform.call_args_list], [(0, 1.0), (0, 2.0)])
+
+    def test_agota_los_intentos(self):
+        with self.assertRaises(ErrorHTTP):
+            self._falla(ErrorHTTP(500))()
+        self.assertEqual(self.llamadas, 3)
+
+    def test_respeta_el_deadline_de_la_request(self):
+        with self.app.test_request_context():
+            g.retry_deadline = time.monotonic()
+            with self.assertRaises(ErrorHTTP):
+                self._falla(ErrorHTTP(503))()
+        self.assertEqual(self.llamadas, 1)
+
+    def test_presupuesto_vacio_corta_los_reintentos(self):
+        reintentos.presupuesto.configurar(capacidad=1, por_segundo=0)
+        with self.assertRaises(ErrorHTTP):
+            self._falla(ErrorHTTP(503))()
+        self.assertEqual(self.llamadas, 2)
+        self.assertLess(reintentos.presupuesto.tokens(), 1)
+
+    def test_metricas(self):
+        abandonos = metricas.contador("retry_giveups_total", "")
+        antes = abandonos.valor(funcion="RetryTestCase._falla.<locals>.operacion", motivo="intentos")
+        with self.assertRaises(ErrorHTTP):
+            self._falla(ErrorHTTP(500))()
+        self.assertEqual(abandonos.valor(funcion="RetryTestCase._falla.<locals>.operacion", motivo="intentos"),
+                         antes + 1)
+        texto = metricas.exportar()
+        self.assertIn('retry_attempts_total{funcion="RetryTestCase._falla.<locals>.operacion"}', texto)
+        self.assertIn("retry_budget_tokens", texto)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -71,7 +71,7 @@ class TestFacultadService(unittest.TestCase):
         self.assertEqual(creado.nombre, "Ingeniería")
 
     # --------- TEST OBTENER ESPECIALIDAD (MOCKS) ---------
-    @patch("app.services.facultad_service.requests.get")
+    @patch("app.clients.especialidad_client.requests.Session.get")
     def test_obtener_especialidad_ok(self, mock_get):
         service = FacultadService()
 
@@ -87,7 +87,7 @@ class TestFacultadService(unittest.TestCase):
         self.assertEqual(data["nombre"], "Ingeniería")
         mock_get.assert_called_once()
 
-    @patch("app.services.facultad_service.requests.get")
+    @patch("app.clients.especialidad_client.requests.Session.get")
     def test_obtener_especialidad_retry_success(self, mock_get):
 
         mock_fail = MagicMock()
@@ -106,7 +106,7 @@ class TestFacultadService(unittest.TestCase):
         self.assertEqual(data["nombre"], "Química")
         self.assertEqual(mock_get.call_count, 2)
 
-    @patch("app.services.facultad_service.requests.get")
+    @patch("app.clients.especialidad_client.requests.Session.get")
     def test_obtener_especialidad_retry_fail(self, mock_get):
 
         mock_fail = MagicMock()
@@ -121,6 +121,21 @@ class TestFacultadService(unittest.TestCase):
 
         self.assertEqual(mock_get.call_count, 3)
 
+    @patch("app.clients.especialidad_client.requests.Session.get")
+    def test_obtener_especialidad_404_no_reintenta(self, mock_get):
+
+        mock_not_found = MagicMock()
+        mock_not_found.status_code = 404
+
+        mock_get.return_value = mock_not_found
+
+        service = FacultadService()
+
+        with self.assertRaises(Exception):
+            service.obtener_especialidad(404)
+
+        self.assertEqual(mock_get.call_count, 1)
+
     # --------- TEST PAGINACIÓN + FILTROS ---------
     def test_listar_facultades_paginacion_filtrado(self):
 
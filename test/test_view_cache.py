@@ -0,0 +1,158 @@
+import unittest
+import os
+import json
+from unittest.mock import patch
+from app import create_app, db, cache, entity_cache
+from app.caching import EntityCache, LocalLRU, MemoryBackend, TieredBackend
+from app.models import Universidad, Facultad
+
+
+class ViewCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        self.uni = Universidad(nombre="UTN", sigla="UTN", tipo="publica")
+        db.session.add(self.uni)
+        db.session.commit()
+        self.fac = Facultad(
+            nombre="Facultad de Ingeniería", sigla="FI", abreviatura="FI", directorio="Dir",
+            codigoPostal="5000", ciudad="Córdoba", domicilio="Calle 1", telefono="1",
+            contacto="c", email="fi@utn.edu.ar", universidad_id=self.uni.id)
+        db.session.add(self.fac)
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _modificar_sin_invalidar(self, entity, **valores):
+        # Cambia la base por fuera de los repositorios: el cache no se entera.
+        for campo, valor in valores.items():
+            setattr(entity, campo, valor)
+        db.session.commit()
+        # Como si lo hubiera hecho otro proceso: el próximo pedido no tiene la entidad en su sesión.
+        for objeto in (self.uni, self.fac):
+            db.session.refresh(objeto)
+        db.session.expunge_all()
+
+    def test_respuesta_se_sirve_desde_cache(self):
+        self.client.get(f'/api/v1/universidad/{self.uni.id}')
+        self._modificar_sin_invalidar(self.uni, nombre="Otra")
+
+        data = self.client.get(f'/api/v1/universidad/{self.uni.id}').get_json()
+
+        self.assertEqual(data["nombre"], "UTN")
+
+    def test_put_invalida_la_vista(self):
+        self.client.get(f'/api/v1/universidad/{self.uni.id}')
+
+        response = self.client.put(f'/api/v1/universidad/{self.uni.id}',
+                                   json={"nombre": "UTN FRM", "sigla": "FRM", "tipo": "publica"})
+        self.assertEqual(response.status_code, 200)
+
+        data = self.client.get(f'/api/v1/universidad/{self.uni.id}').get_json()
+        self.assertEqual(data["nombre"], "UTN FRM")
+
+    def test_delete_invalida_la_vista(self):
+        self.client.get(f'/api/v1/facultad/{self.fac.id}')
+
+        self.client.delete(f'/api/v1/facultad/{self.fac.id}')
+
+        self.assertEqual(self.client.get(f'/api/v1/facultad/{self.fac.id}').status_code, 404)
+
+    def test_delete_del_padre_invalida_a_los_hijos(self):
+        filtro = {"X-filters": json.dumps({"universidad_id": self.uni.id})}
+        self.client.get(f'/api/v1/facultad/{self.fac.id}')
+        self.assertEqual(self.client.get('/api/v1/facultad', headers=filtro).get_json()["pageable"]["total_elements"], 1)
+
+        self.client.delete(f'/api/v1/universidad/{self.uni.id}')
+
+        self.assertIsNone(self.client.get(f'/api/v1/facultad/{self.fac.id}').get_json()["universidad_id"])
+        self.assertEqual(self.client.get('/api/v1/facultad', headers=filtro).get_json()["pageable"]["total_elements"], 0)
+
+    def test_get_repetido_no_sale_del_worker(self):
+        remoto = MemoryBackend()
+        entity_cache.backend = TieredBackend(LocalLRU(10), remoto, entity_cache.bus)
+        self.client.get(f'/api/v1/universidad/{self.uni.id}')
+
+        with patch.object(remoto, "get", wraps=remoto.get) as redis_get, \
+                patch.object(cache, "get", wraps=cache.get) as vista_get:
+            response = self.client.get(f'/api/v1/universidad/{self.uni.id}')
+
+        self.assertEqual((response.status_code, response.get_json()["nombre"]), (200, "UTN"))
+        self.assertEqual((redis_get.call_count, vista_get.call_count), (0, 0))
+
+    def test_detalle_con_expand_usa_el_cache_de_vistas(self):
+        self.client.get(f'/api/v1/universidad/{self.uni.id}?expand=facultades')
+        self._modificar_sin_invalidar(self.fac, nombre="Otra")
+
+        data = self.client.get(f'/api/v1/universidad/{self.uni.id}?expand=facultades').get_json()
+
+        self.assertEqual(data["facultades"][0]["nombre"], "Facultad de Ingeniería")
+
+    def test_404_no_se_cachea(self):
+        self.assertEqual(self.client.get('/api/v1/universidad/999').status_code, 404)
+        db.session.add(Universidad(id=999, nombre="UBA", sigla="UBA", tipo="publica"))
+        db.session.commit()
+
+        self.assertEqual(self.client.get('/api/v1/universidad/999').status_code, 200)
+
+    def test_listado_se_sirve_desde_cache(self):
+        self.client.get('/api/v1/universidad')
+        db.session.add(Universidad(nombre="UBA", sigla="UBA", tipo="publica"))
+        db.session.commit()
+
+        data = self.client.get('/api/v1/universidad').get_json()
+
+        self.assertEqual(data["pageable"]["total_elements"], 1)
+
+    def test_alta_sube_la_generacion_de_la_tabla(self):
+        self.client.get('/api/v1/universidad')
+
+        self.client.post('/api/v1/universidad', json={"nombre": "UBA", "sigla": "UBA", "tipo": "publica"})
+
+        data = self.client.get('/api/v1/universidad').get_json()
+        self.assertEqual(data["pageable"]["total_elements"], 2)
+
+    def test_actualizar_invalida_los_listados(self):
+        headers = {"X-filters": json.dumps({"sigla": "UTN"})}
+        self.client.get('/api/v1/universidad', headers=headers)
+
+        self.client.put(f'/api/v1/universidad/{self.uni.id}',
+                        json={"nombre": "UTN FRM", "sigla": "UTN", "tipo": "publica"})
+
+        data = self.client.get('/api/v1/universidad', headers=headers).get_json()
+        self.assertEqual(data["content"][0]["nombre"], "UTN FRM")
+
+    def test_clave_de_listado_varia_por_pagina_y_filtros(self):
+        db.session.add(Universidad(nombre="UBA", sigla="UBA", tipo="privada"))
+        db.session.commit()
+        entity_cache.invalidar_tabla(Universidad)
+
+        pagina_2 = self.client.get('/api/v1/universidad', headers={"X-page": "2", "X-per-page": "1"}).get_json()
+        filtrado = self.client.get('/api/v1/universidad', headers={"X-filters": '{"tipo": "privada"}'}).get_json()
+        # mismo filtro con otro formato: misma entrada
+        filtrado_bis = self.client.get('/api/v1/universidad', headers={"X-filters": '{ "tipo":"privada" }'}).get_json()
+
+        self.assertEqual(pagina_2["content"][0]["sigla"], "UBA")
+        self.assertEqual(filtrado["pageable"]["total_elements"], 1)
+        self.assertEqual(filtrado, filtrado_bis)
+
+    def test_invalidar_sube_la_version_del_tag(self):
+        tag = EntityCache.tag(Facultad, self.fac.id)
+        antes = entity_cache.versiones([tag])[tag]
+
+        entity_cache.invalidar(Facultad, self.fac.id)
+
+        self.assertEqual(entity_cache.versiones([tag])[tag], antes + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()